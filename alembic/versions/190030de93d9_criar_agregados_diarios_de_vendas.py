@@ -0,0 +1,69 @@
+"""Criar agregados diários de vendas (total, por cliente e por produto)
+
+Revision ID: 190030de93d9
+Revises: e2ce49ea49e9
+Create Date: 2026-10-18 09:12:41.503218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# Identificadores da migration
+revision: str = '190030de93d9'
+down_revision: Union[str, Sequence[str], None] = 'e2ce49ea49e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Aplica alterações no schema do banco."""
+    # Agregado diário geral
+    op.create_table(
+        "daily_sales",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("bucket", sa.SmallInteger(), nullable=False),
+        sa.Column("revenue", sa.Float(), server_default=sa.text("0"), nullable=False),
+        sa.Column("order_count", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column("units_sold", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.PrimaryKeyConstraint("day", "bucket"),
+    )
+
+    # Agregado diário por cliente
+    op.create_table(
+        "daily_client_sales",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("client_id", sa.Integer(), nullable=False),
+        sa.Column("bucket", sa.SmallInteger(), nullable=False),
+        sa.Column("revenue", sa.Float(), server_default=sa.text("0"), nullable=False),
+        sa.Column("order_count", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column("units_sold", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.PrimaryKeyConstraint("day", "client_id", "bucket"),
+    )
+
+    # Agregado diário por produto
+    op.create_table(
+        "daily_product_sales",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("product_id", sa.Integer(), nullable=False),
+        sa.Column("bucket", sa.SmallInteger(), nullable=False),
+        sa.Column("revenue", sa.Float(), server_default=sa.text("0"), nullable=False),
+        sa.Column("order_count", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column("units_sold", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.PrimaryKeyConstraint("day", "product_id", "bucket"),
+    )
+
+    # Relatórios filtram por cliente/produto dentro de um intervalo de dias
+    op.create_index("ix_daily_client_sales_client_day", "daily_client_sales", ["client_id", "day"])
+    op.create_index("ix_daily_product_sales_product_day", "daily_product_sales", ["product_id", "day"])
+
+
+def downgrade() -> None:
+    """Reverte alterações aplicadas no upgrade."""
+    op.drop_index("ix_daily_product_sales_product_day", table_name="daily_product_sales")
+    op.drop_index("ix_daily_client_sales_client_day", table_name="daily_client_sales")
+    op.drop_table("daily_product_sales")
+    op.drop_table("daily_client_sales")
+    op.drop_table("daily_sales")
@@ -0,0 +1,50 @@
+"""Recalcular o resumo de pedidos por cliente incluindo os pedidos arquivados
+
+Revision ID: 49f590da39ff
+Revises: b3a410f7f175
+Create Date: 2026-10-18 20:11:46.930582
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# Identificadores da migration
+revision: str = '49f590da39ff'
+down_revision: Union[str, Sequence[str], None] = 'b3a410f7f175'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+STATUSES = ["pending", "confirmed", "processing", "shipped", "delivered", "cancelled"]
+
+
+def upgrade() -> None:
+    """Aplica alterações no schema do banco."""
+    # c41e7a09d2b6 carregou o resumo só com orders; o arquivamento mantém no
+    # resumo os pedidos arquivados, que voltam a ser somados aqui
+    counts = ", ".join(f"count(*) FILTER (WHERE status = '{status}')" for status in STATUSES)
+    columns = ", ".join(f"{status}_count" for status in STATUSES)
+    op.execute("LOCK TABLE client_order_stats IN EXCLUSIVE MODE")
+    op.execute("DELETE FROM client_order_stats")
+    op.execute(f"""
+        INSERT INTO client_order_stats (client_id, order_count, lifetime_spend, {columns}, last_order_at)
+        SELECT client_id,
+               count(*),
+               coalesce(sum(total) FILTER (WHERE status <> 'cancelled'), 0),
+               {counts},
+               max(created_at)
+        FROM (
+            SELECT client_id, status, total, created_at FROM orders
+            UNION ALL
+            SELECT client_id, status, total, created_at FROM archived_orders
+        ) AS source
+        WHERE client_id IN (SELECT id FROM clients)
+        GROUP BY client_id
+    """)
+
+
+def downgrade() -> None:
+    """Reverte alterações aplicadas no upgrade."""
+    # Só recalcula dados derivados: não há alteração de schema a desfazer
+    pass
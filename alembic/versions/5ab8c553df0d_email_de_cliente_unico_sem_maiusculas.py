@@ -0,0 +1,41 @@
+"""Tornar o email de cliente único sem diferenciar maiúsculas
+
+Revision ID: 5ab8c553df0d
+Revises: 6634a48bc470
+Create Date: 2026-10-18 15:10:26.358940
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# Identificadores da migration
+revision: str = '5ab8c553df0d'
+down_revision: Union[str, Sequence[str], None] = '6634a48bc470'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Aplica alterações no schema do banco."""
+    # create_client já compara emails com lower(); a importação em massa
+    # usa este índice como alvo do ON CONFLICT
+    duplicates = op.get_bind().execute(sa.text(
+        "SELECT lower(email) FROM clients GROUP BY lower(email) HAVING count(*) > 1 LIMIT 10"
+    )).scalars().all()
+    if duplicates:
+        raise RuntimeError(
+            "Existem clientes com o mesmo email (ignorando maiúsculas); "
+            "unifique-os antes da migration: " + ", ".join(duplicates)
+        )
+
+    op.drop_index('ix_clients_email_lower', table_name='clients')
+    op.create_index('ix_clients_email_lower', 'clients', [sa.text('lower(email)')], unique=True)
+
+
+def downgrade() -> None:
+    """Reverte alterações aplicadas no upgrade."""
+    op.drop_index('ix_clients_email_lower', table_name='clients')
+    op.create_index('ix_clients_email_lower', 'clients', [sa.text('lower(email)')])
@@ -0,0 +1,56 @@
+"""Índices de busca de clientes por prefixo e trecho (nome, email, telefone)
+
+Revision ID: 6634a48bc470
+Revises: f5c930ead8a3
+Create Date: 2026-10-18 14:37:12.905561
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# Identificadores da migration
+revision: str = '6634a48bc470'
+down_revision: Union[str, Sequence[str], None] = 'f5c930ead8a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (nome do índice, expressão indexada). A busca só considera clientes ativos,
+# por isso todos os índices são parciais em active.
+PREFIX_INDEXES = [
+    ('ix_clients_name_prefix', 'lower(name) text_pattern_ops'),
+    ('ix_clients_email_prefix', 'lower(email) text_pattern_ops'),
+    ('ix_clients_phone_prefix', 'phone text_pattern_ops'),
+]
+TRIGRAM_INDEXES = [
+    ('ix_clients_name_trgm', 'lower(name) gin_trgm_ops'),
+    ('ix_clients_email_trgm', 'lower(email) gin_trgm_ops'),
+    ('ix_clients_phone_trgm', 'phone gin_trgm_ops'),
+]
+
+
+def upgrade() -> None:
+    """Aplica alterações no schema do banco."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Prefixo (LIKE 'abc%'): B-tree com text_pattern_ops, independente da collation
+    for name, expression in PREFIX_INDEXES:
+        op.create_index(name, 'clients', [sa.text(expression)], postgresql_where=sa.text('active'))
+
+    # Trecho (LIKE '%abc%'): GIN de trigramas
+    for name, expression in TRIGRAM_INDEXES:
+        op.create_index(
+            name,
+            'clients',
+            [sa.text(expression)],
+            postgresql_using='gin',
+            postgresql_where=sa.text('active'),
+        )
+
+
+def downgrade() -> None:
+    """Reverte alterações aplicadas no upgrade."""
+    for name, _ in TRIGRAM_INDEXES + PREFIX_INDEXES:
+        op.drop_index(name, table_name='clients')
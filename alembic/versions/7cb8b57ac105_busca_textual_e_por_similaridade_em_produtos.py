@@ -0,0 +1,63 @@
+"""Busca textual (tsvector) e por similaridade (pg_trgm) em produtos
+
+Revision ID: 7cb8b57ac105
+Revises: 9cd79d4d2964
+Create Date: 2026-10-18 13:25:03.847112
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# Identificadores da migration
+revision: str = '7cb8b57ac105'
+down_revision: Union[str, Sequence[str], None] = '9cd79d4d2964'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Nome pesa mais que a descrição no ranking
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('portuguese', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('portuguese', coalesce(description, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    """Aplica alterações no schema do banco."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Coluna gerada: mantida pelo próprio banco a cada INSERT/UPDATE
+    op.add_column(
+        'products',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR, persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        'ix_products_search_vector',
+        'products',
+        ['search_vector'],
+        postgresql_using='gin',
+    )
+    # Tolerância a erros de digitação no nome (operadores %, %> e <%)
+    op.create_index(
+        'ix_products_name_trgm',
+        'products',
+        ['name'],
+        postgresql_using='gin',
+        postgresql_ops={'name': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Reverte alterações aplicadas no upgrade."""
+    op.drop_index('ix_products_name_trgm', table_name='products')
+    op.drop_index('ix_products_search_vector', table_name='products')
+    op.drop_column('products', 'search_vector')
+    # A extensão pg_trgm é mantida: outros objetos podem depender dela
@@ -0,0 +1,106 @@
+"""Separar os agregados diários de vendas por dono (owner_id)
+
+Revision ID: 82e37339dd4e
+Revises: e8b3f51a6c27
+Create Date: 2026-10-18 17:05:18.240517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# Identificadores da migration
+revision: str = '82e37339dd4e'
+down_revision: Union[str, Sequence[str], None] = 'e8b3f51a6c27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Mesmo valor de app.core.models.sales_rollup.ROLLUP_BUCKETS
+ROLLUP_BUCKETS = 16
+
+# Colunas de agrupamento de cada agregado, sem o dono
+TABLE_KEYS = {
+    "daily_sales": ["day", "bucket"],
+    "daily_client_sales": ["day", "client_id", "bucket"],
+    "daily_product_sales": ["day", "product_id", "bucket"],
+}
+
+
+def _fill(by_owner: bool) -> None:
+    # Recalcula os agregados a partir dos pedidos não cancelados
+    owner = "o.owner_id, " if by_owner else ""
+    owner_filter = "AND o.owner_id IS NOT NULL" if by_owner else ""
+    prefix = "owner_id, " if by_owner else ""
+    order_values = (
+        f"{owner}o.created_at::date AS day, o.client_id, o.id % {ROLLUP_BUCKETS} AS bucket, "
+        "o.total, coalesce(u.units, 0) AS units"
+    )
+    orders = f"""
+        SELECT {order_values}
+        FROM orders AS o
+        LEFT JOIN (
+            SELECT order_id, sum(quantity) AS units FROM order_items GROUP BY order_id
+        ) AS u ON u.order_id = o.id
+        WHERE o.status <> 'cancelled' {owner_filter}
+    """
+    for table in ("daily_sales", "daily_client_sales"):
+        columns = prefix + ", ".join(TABLE_KEYS[table])
+        op.execute(f"""
+            INSERT INTO {table} ({columns}, revenue, order_count, units_sold)
+            SELECT {columns}, sum(total), count(*), sum(units)
+            FROM ({orders}) AS source
+            GROUP BY {columns}
+        """)
+
+    op.execute(f"""
+        INSERT INTO daily_product_sales ({prefix}day, product_id, bucket, revenue, order_count, units_sold)
+        SELECT {owner}o.created_at::date, i.product_id, o.id % {ROLLUP_BUCKETS},
+               sum(i.subtotal), count(DISTINCT i.order_id), sum(i.quantity)
+        FROM order_items AS i
+        JOIN orders AS o ON o.id = i.order_id
+        WHERE o.status <> 'cancelled' {owner_filter}
+        GROUP BY {owner}o.created_at::date, i.product_id, o.id % {ROLLUP_BUCKETS}
+    """)
+
+
+def upgrade() -> None:
+    """Aplica alterações no schema do banco."""
+    # Os agregados são derivados de orders: são esvaziados e recalculados por dono.
+    # Pedidos arquivados voltam a ser somados em b3a410f7f175, depois que
+    # archived_orders passa a guardar total e quantidades (ded8aae0647f)
+    for table, keys in TABLE_KEYS.items():
+        op.execute(f"DELETE FROM {table}")
+        op.add_column(table, sa.Column("owner_id", sa.Integer(), nullable=False))
+        op.drop_constraint(f"{table}_pkey", table, type_="primary")
+        op.create_primary_key(f"{table}_pkey", table, ["owner_id", *keys])
+
+    # Relatórios filtram por dono e cliente/produto dentro de um intervalo de dias
+    op.drop_index("ix_daily_client_sales_client_day", table_name="daily_client_sales")
+    op.drop_index("ix_daily_product_sales_product_day", table_name="daily_product_sales")
+    op.create_index(
+        "ix_daily_client_sales_owner_client_day", "daily_client_sales", ["owner_id", "client_id", "day"]
+    )
+    op.create_index(
+        "ix_daily_product_sales_owner_product_day", "daily_product_sales", ["owner_id", "product_id", "day"]
+    )
+
+    _fill(by_owner=True)
+
+
+def downgrade() -> None:
+    """Reverte alterações aplicadas no upgrade."""
+    op.drop_index("ix_daily_product_sales_owner_product_day", table_name="daily_product_sales")
+    op.drop_index("ix_daily_client_sales_owner_client_day", table_name="daily_client_sales")
+
+    for table, keys in TABLE_KEYS.items():
+        op.execute(f"DELETE FROM {table}")
+        op.drop_constraint(f"{table}_pkey", table, type_="primary")
+        op.drop_column(table, "owner_id")
+        op.create_primary_key(f"{table}_pkey", table, keys)
+
+    op.create_index("ix_daily_client_sales_client_day", "daily_client_sales", ["client_id", "day"])
+    op.create_index("ix_daily_product_sales_product_day", "daily_product_sales", ["product_id", "day"])
+
+    _fill(by_owner=False)
@@ -0,0 +1,58 @@
+"""Adicionar clients.user_id e owner_id desnormalizado em orders
+
+Revision ID: 9755c12179de
+Revises: a9015f9b1271
+Create Date: 2026-10-18 10:41:09.772315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# Identificadores da migration
+revision: str = '9755c12179de'
+down_revision: Union[str, Sequence[str], None] = 'a9015f9b1271'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Aplica alterações no schema do banco."""
+    # Usuário responsável pelo cliente (já usado por create_client e create_order)
+    op.add_column('clients', sa.Column('user_id', sa.Integer(), nullable=True))
+    op.create_foreign_key('clients_user_id_fkey', 'clients', 'users', ['user_id'], ['id'])
+    op.create_index('ix_clients_user_id', 'clients', ['user_id'])
+
+    # Dono do pedido copiado do cliente: filtros de dono sem JOIN com clients
+    op.add_column('orders', sa.Column('owner_id', sa.Integer(), nullable=True))
+    op.create_foreign_key('orders_owner_id_fkey', 'orders', 'users', ['owner_id'], ['id'])
+
+    # Preenche pedidos existentes a partir do cliente
+    op.execute(
+        """
+        UPDATE orders AS o
+        SET owner_id = c.user_id
+        FROM clients AS c
+        WHERE c.id = o.client_id
+          AND o.owner_id IS DISTINCT FROM c.user_id
+        """
+    )
+
+    # Mesma ordem da paginação por cursor: ORDER BY created_at DESC, id DESC
+    op.create_index(
+        'ix_orders_owner_created_id',
+        'orders',
+        ['owner_id', sa.text('created_at DESC'), sa.text('id DESC')],
+    )
+
+
+def downgrade() -> None:
+    """Reverte alterações aplicadas no upgrade."""
+    op.drop_index('ix_orders_owner_created_id', table_name='orders')
+    op.drop_constraint('orders_owner_id_fkey', 'orders', type_='foreignkey')
+    op.drop_column('orders', 'owner_id')
+    op.drop_index('ix_clients_user_id', table_name='clients')
+    op.drop_constraint('clients_user_id_fkey', 'clients', type_='foreignkey')
+    op.drop_column('clients', 'user_id')
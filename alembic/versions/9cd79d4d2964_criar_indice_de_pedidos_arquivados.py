@@ -0,0 +1,45 @@
+"""Criar índice de pedidos arquivados (archived_orders)
+
+Revision ID: 9cd79d4d2964
+Revises: daefe031bc7a
+Create Date: 2026-10-18 12:48:15.620937
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# Identificadores da migration
+revision: str = '9cd79d4d2964'
+down_revision: Union[str, Sequence[str], None] = 'daefe031bc7a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Aplica alterações no schema do banco."""
+    # Uma linha por pedido arquivado, apontando para o arquivo que o contém.
+    # Sem FKs: usuários e clientes podem ser removidos depois do arquivamento.
+    op.create_table(
+        "archived_orders",
+        sa.Column("order_id", sa.Integer(), nullable=False),
+        sa.Column("owner_id", sa.Integer(), nullable=True),
+        sa.Column("client_id", sa.Integer(), nullable=False),
+        sa.Column("created_at", postgresql.TIMESTAMP(), nullable=False),
+        sa.Column("file", sa.String(length=255), nullable=False),
+        sa.Column(
+            "archived_at",
+            postgresql.TIMESTAMP(),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.PrimaryKeyConstraint("order_id"),
+    )
+
+
+def downgrade() -> None:
+    """Reverte alterações aplicadas no upgrade."""
+    op.drop_table("archived_orders")
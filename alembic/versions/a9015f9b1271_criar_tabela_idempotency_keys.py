@@ -0,0 +1,53 @@
+"""Criar tabela idempotency_keys para requisições idempotentes
+
+Revision ID: a9015f9b1271
+Revises: 190030de93d9
+Create Date: 2026-10-18 10:03:27.118402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# Identificadores da migration
+revision: str = 'a9015f9b1271'
+down_revision: Union[str, Sequence[str], None] = '190030de93d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Aplica alterações no schema do banco."""
+    op.create_table(
+        "idempotency_keys",
+        sa.Column(
+            "user_id",
+            sa.Integer(),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),  # Chaves somem com o usuário
+            nullable=False,
+        ),
+        sa.Column("key", sa.String(length=255), nullable=False),
+        sa.Column("request_hash", sa.String(length=64), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("status_code", sa.Integer(), nullable=True),
+        sa.Column("response_body", postgresql.JSONB(), nullable=True),
+        sa.Column(
+            "created_at",
+            postgresql.TIMESTAMP(),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("expires_at", postgresql.TIMESTAMP(), nullable=False),
+        sa.PrimaryKeyConstraint("user_id", "key"),
+    )
+    # Usado pela limpeza periódica de chaves expiradas
+    op.create_index("ix_idempotency_keys_expires_at", "idempotency_keys", ["expires_at"])
+
+
+def downgrade() -> None:
+    """Reverte alterações aplicadas no upgrade."""
+    op.drop_index("ix_idempotency_keys_expires_at", table_name="idempotency_keys")
+    op.drop_table("idempotency_keys")
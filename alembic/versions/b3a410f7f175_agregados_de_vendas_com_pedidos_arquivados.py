@@ -0,0 +1,82 @@
+"""Recalcular os agregados de vendas incluindo os pedidos arquivados
+
+Revision ID: b3a410f7f175
+Revises: ded8aae0647f
+Create Date: 2026-10-18 19:58:31.207644
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# Identificadores da migration
+revision: str = 'b3a410f7f175'
+down_revision: Union[str, Sequence[str], None] = 'ded8aae0647f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Mesmo valor de app.core.models.sales_rollup.ROLLUP_BUCKETS
+ROLLUP_BUCKETS = 16
+
+# Pedidos não cancelados com dono: os de orders e os de archived_orders
+ORDERS = f"""
+    SELECT o.owner_id, o.created_at::date AS day, o.client_id, o.id % {ROLLUP_BUCKETS} AS bucket,
+           o.total, coalesce(u.units, 0) AS units
+    FROM orders AS o
+    LEFT JOIN (
+        SELECT order_id, sum(quantity) AS units FROM order_items GROUP BY order_id
+    ) AS u ON u.order_id = o.id
+    WHERE o.status <> 'cancelled' AND o.owner_id IS NOT NULL
+    UNION ALL
+    SELECT owner_id, created_at::date, client_id, order_id % {ROLLUP_BUCKETS}, total, units
+    FROM archived_orders
+    WHERE status <> 'cancelled' AND owner_id IS NOT NULL
+"""
+
+# Quantidade e subtotal por pedido e produto, das mesmas duas origens
+ORDER_PRODUCTS = f"""
+    SELECT o.owner_id, o.created_at::date AS day, i.product_id, o.id % {ROLLUP_BUCKETS} AS bucket,
+           i.order_id, i.quantity, i.subtotal
+    FROM order_items AS i
+    JOIN orders AS o ON o.id = i.order_id
+    WHERE o.status <> 'cancelled' AND o.owner_id IS NOT NULL
+    UNION ALL
+    SELECT a.owner_id, a.created_at::date, p.key::integer, a.order_id % {ROLLUP_BUCKETS},
+           a.order_id, (p.value ->> 0)::integer, (p.value ->> 1)::float
+    FROM archived_orders AS a, jsonb_each(a.products) AS p
+    WHERE a.status <> 'cancelled' AND a.owner_id IS NOT NULL
+"""
+
+
+def upgrade() -> None:
+    """Aplica alterações no schema do banco."""
+    # 82e37339dd4e recalculou os agregados só com orders; o arquivamento mantém
+    # nos agregados os pedidos arquivados, que voltam a ser somados aqui
+    op.execute("LOCK TABLE daily_sales, daily_client_sales, daily_product_sales IN EXCLUSIVE MODE")
+    for table in ("daily_sales", "daily_client_sales", "daily_product_sales"):
+        op.execute(f"DELETE FROM {table}")
+
+    for table, keys in (
+        ("daily_sales", "owner_id, day, bucket"),
+        ("daily_client_sales", "owner_id, day, client_id, bucket"),
+    ):
+        op.execute(f"""
+            INSERT INTO {table} ({keys}, revenue, order_count, units_sold)
+            SELECT {keys}, sum(total), count(*), sum(units)
+            FROM ({ORDERS}) AS source
+            GROUP BY {keys}
+        """)
+
+    op.execute(f"""
+        INSERT INTO daily_product_sales (owner_id, day, product_id, bucket, revenue, order_count, units_sold)
+        SELECT owner_id, day, product_id, bucket, sum(subtotal), count(DISTINCT order_id), sum(quantity)
+        FROM ({ORDER_PRODUCTS}) AS source
+        GROUP BY owner_id, day, product_id, bucket
+    """)
+
+
+def downgrade() -> None:
+    """Reverte alterações aplicadas no upgrade."""
+    # Só recalcula dados derivados: não há alteração de schema a desfazer
+    pass
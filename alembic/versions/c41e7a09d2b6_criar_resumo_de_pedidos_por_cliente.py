@@ -0,0 +1,60 @@
+"""Criar resumo de pedidos por cliente (client_order_stats)
+
+Revision ID: c41e7a09d2b6
+Revises: 5ab8c553df0d
+Create Date: 2026-10-18 14:21:07.384125
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# Identificadores da migration
+revision: str = 'c41e7a09d2b6'
+down_revision: Union[str, Sequence[str], None] = '5ab8c553df0d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+STATUSES = ["pending", "confirmed", "processing", "shipped", "delivered", "cancelled"]
+
+
+def upgrade() -> None:
+    """Aplica alterações no schema do banco."""
+    # Uma linha por cliente com pedidos, mantida pelo OrderService
+    op.create_table(
+        "client_order_stats",
+        sa.Column("client_id", sa.Integer(), nullable=False),
+        sa.Column("order_count", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column("lifetime_spend", sa.Float(), server_default=sa.text("0"), nullable=False),
+        sa.Column("last_order_at", postgresql.TIMESTAMP(), nullable=True),
+        *(
+            sa.Column(f"{status}_count", sa.Integer(), server_default=sa.text("0"), nullable=False)
+            for status in STATUSES
+        ),
+        sa.ForeignKeyConstraint(["client_id"], ["clients.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("client_id"),
+    )
+
+    # Carga inicial a partir dos pedidos existentes. Pedidos arquivados são
+    # somados em 49f590da39ff, depois que archived_orders passa a guardar
+    # status e total (ded8aae0647f)
+    counts = ", ".join(f"count(*) FILTER (WHERE status = '{status}')" for status in STATUSES)
+    columns = ", ".join(f"{status}_count" for status in STATUSES)
+    op.execute(f"""
+        INSERT INTO client_order_stats (client_id, order_count, lifetime_spend, {columns}, last_order_at)
+        SELECT client_id,
+               count(*),
+               coalesce(sum(total) FILTER (WHERE status <> 'cancelled'), 0),
+               {counts},
+               max(created_at)
+        FROM orders
+        GROUP BY client_id
+    """)
+
+
+def downgrade() -> None:
+    """Reverte alterações aplicadas no upgrade."""
+    op.drop_table("client_order_stats")
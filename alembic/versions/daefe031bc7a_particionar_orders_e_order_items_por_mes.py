@@ -0,0 +1,215 @@
+"""Particionar orders e order_items por mês de criação do pedido
+
+Revision ID: daefe031bc7a
+Revises: f561351cbf93
+Create Date: 2026-10-18 12:02:37.118406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# Identificadores da migration
+revision: str = 'daefe031bc7a'
+down_revision: Union[str, Sequence[str], None] = 'f561351cbf93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Mesma definição de app/services/partition_service.py, copiada para que a
+# migration não dependa do código da aplicação
+ENSURE_PARTITIONS_FUNCTION = """
+CREATE OR REPLACE FUNCTION ensure_order_partitions(from_date date, to_date date)
+RETURNS integer AS $$
+DECLARE
+    month_start date := date_trunc('month', from_date)::date;
+    month_end date;
+    suffix text;
+    created integer := 0;
+BEGIN
+    WHILE month_start <= to_date LOOP
+        month_end := (month_start + interval '1 month')::date;
+        suffix := to_char(month_start, 'YYYYMM');
+        IF to_regclass('orders_' || suffix) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF orders FOR VALUES FROM (%L) TO (%L)',
+                'orders_' || suffix, month_start, month_end
+            );
+            created := created + 1;
+        END IF;
+        IF to_regclass('order_items_' || suffix) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF order_items FOR VALUES FROM (%L) TO (%L)',
+                'order_items_' || suffix, month_start, month_end
+            );
+        END IF;
+        month_start := month_end;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+# Partições criadas à frente do mês atual durante a migration
+MONTHS_AHEAD = 3
+
+
+def _create_order_indexes() -> None:
+    # Índices definidos na tabela-mãe são criados em cada partição
+    op.create_index(
+        'ix_orders_owner_created_id',
+        'orders',
+        ['owner_id', sa.text('created_at DESC'), sa.text('id DESC')],
+    )
+    op.create_index(
+        'ix_orders_owner_status_created_id',
+        'orders',
+        ['owner_id', 'status', sa.text('created_at DESC'), sa.text('id DESC')],
+    )
+    op.create_index(
+        'ix_orders_client_created_id',
+        'orders',
+        ['client_id', sa.text('created_at DESC'), sa.text('id DESC')],
+    )
+    op.create_index('ix_orders_created_at', 'orders', ['created_at'])
+    op.create_index('ix_order_items_order_id', 'order_items', ['order_id'])
+    op.create_index('ix_order_items_product_id', 'order_items', ['product_id'])
+
+
+def upgrade() -> None:
+    """Aplica alterações no schema do banco."""
+    # As tabelas atuais viram cópias temporárias; os índices delas somem no DROP
+    op.rename_table('order_items', 'order_items_legacy')
+    op.rename_table('orders', 'orders_legacy')
+
+    # Tabelas-mãe particionadas por intervalo mensal. Chaves e índices são
+    # criados depois da cópia, que assim roda sem manutenção de índices.
+    op.execute("""
+        CREATE TABLE orders (
+            id integer NOT NULL DEFAULT nextval('orders_id_seq'::regclass),
+            client_id integer NOT NULL,
+            owner_id integer,
+            status varchar(20) NOT NULL,
+            updated_at timestamp without time zone DEFAULT now(),
+            total double precision NOT NULL,
+            created_at timestamp without time zone NOT NULL DEFAULT now()
+        ) PARTITION BY RANGE (created_at)
+    """)
+    # Itens ficam na partição do mês do pedido (order_created_at = orders.created_at)
+    op.execute("""
+        CREATE TABLE order_items (
+            id integer NOT NULL DEFAULT nextval('order_items_id_seq'::regclass),
+            order_id integer NOT NULL,
+            order_created_at timestamp without time zone NOT NULL,
+            product_id integer NOT NULL,
+            quantity integer NOT NULL,
+            unit_price double precision NOT NULL,
+            subtotal double precision NOT NULL
+        ) PARTITION BY RANGE (order_created_at)
+    """)
+    # Partição padrão: recebe linhas de meses ainda sem partição em vez de
+    # rejeitar o INSERT. Deve ficar vazia; ensure_order_partitions cria os meses à frente.
+    op.execute("CREATE TABLE orders_default PARTITION OF orders DEFAULT")
+    op.execute("CREATE TABLE order_items_default PARTITION OF order_items DEFAULT")
+
+    op.execute(ENSURE_PARTITIONS_FUNCTION)
+    op.execute(f"""
+        SELECT ensure_order_partitions(
+            coalesce((SELECT min(coalesce(created_at, updated_at)) FROM orders_legacy), now())::date,
+            (current_date + make_interval(months => {MONTHS_AHEAD}))::date
+        )
+    """)
+
+    op.execute("""
+        INSERT INTO orders (id, client_id, owner_id, status, updated_at, total, created_at)
+        SELECT id, client_id, owner_id, status, updated_at, total,
+               coalesce(created_at, updated_at, now())
+        FROM orders_legacy
+    """)
+    op.execute("""
+        INSERT INTO order_items (id, order_id, order_created_at, product_id, quantity, unit_price, subtotal)
+        SELECT i.id, i.order_id, o.created_at, i.product_id, i.quantity, i.unit_price, i.subtotal
+        FROM order_items_legacy AS i
+        JOIN orders AS o ON o.id = i.order_id
+    """)
+
+    # As sequências passam para as novas tabelas antes de remover as antigas
+    op.execute("ALTER SEQUENCE orders_id_seq OWNED BY orders.id")
+    op.execute("ALTER SEQUENCE order_items_id_seq OWNED BY order_items.id")
+    op.drop_table('order_items_legacy')
+    op.drop_table('orders_legacy')
+
+    # A chave primária de uma tabela particionada inclui a coluna de particionamento
+    op.create_primary_key('orders_pkey', 'orders', ['id', 'created_at'])
+    op.create_primary_key('order_items_pkey', 'order_items', ['id', 'order_created_at'])
+    op.create_foreign_key('orders_client_id_fkey', 'orders', 'clients', ['client_id'], ['id'])
+    op.create_foreign_key('orders_owner_id_fkey', 'orders', 'users', ['owner_id'], ['id'])
+    op.create_foreign_key(
+        'order_items_order_fkey',
+        'order_items',
+        'orders',
+        ['order_id', 'order_created_at'],
+        ['id', 'created_at'],
+        ondelete='CASCADE',
+    )
+    op.create_foreign_key('order_items_product_id_fkey', 'order_items', 'products', ['product_id'], ['id'])
+
+    _create_order_indexes()
+    # Busca por id sem a data: um índice por partição
+    op.create_index('ix_orders_id', 'orders', ['id'])
+
+    op.execute("ANALYZE orders, order_items")
+
+
+def downgrade() -> None:
+    """Reverte alterações aplicadas no upgrade."""
+    op.rename_table('order_items', 'order_items_partitioned')
+    op.rename_table('orders', 'orders_partitioned')
+
+    op.execute("""
+        CREATE TABLE orders (
+            id integer NOT NULL DEFAULT nextval('orders_id_seq'::regclass),
+            client_id integer NOT NULL,
+            owner_id integer,
+            status varchar(20) NOT NULL,
+            updated_at timestamp without time zone DEFAULT now(),
+            total double precision NOT NULL,
+            created_at timestamp without time zone DEFAULT now()
+        )
+    """)
+    op.execute("""
+        CREATE TABLE order_items (
+            id integer NOT NULL DEFAULT nextval('order_items_id_seq'::regclass),
+            order_id integer NOT NULL,
+            product_id integer NOT NULL,
+            quantity integer NOT NULL,
+            unit_price double precision NOT NULL,
+            subtotal double precision NOT NULL
+        )
+    """)
+    op.execute("""
+        INSERT INTO orders (id, client_id, owner_id, status, updated_at, total, created_at)
+        SELECT id, client_id, owner_id, status, updated_at, total, created_at
+        FROM orders_partitioned
+    """)
+    op.execute("""
+        INSERT INTO order_items (id, order_id, product_id, quantity, unit_price, subtotal)
+        SELECT id, order_id, product_id, quantity, unit_price, subtotal
+        FROM order_items_partitioned
+    """)
+
+    op.execute("ALTER SEQUENCE orders_id_seq OWNED BY orders.id")
+    op.execute("ALTER SEQUENCE order_items_id_seq OWNED BY order_items.id")
+    # Remove as tabelas-mãe junto com todas as partições
+    op.execute("DROP TABLE order_items_partitioned, orders_partitioned CASCADE")
+    op.execute("DROP FUNCTION ensure_order_partitions(date, date)")
+
+    op.create_primary_key('orders_pkey', 'orders', ['id'])
+    op.create_primary_key('order_items_pkey', 'order_items', ['id'])
+    op.create_foreign_key('orders_client_id_fkey', 'orders', 'clients', ['client_id'], ['id'])
+    op.create_foreign_key('orders_owner_id_fkey', 'orders', 'users', ['owner_id'], ['id'])
+    op.create_foreign_key('order_items_order_id_fkey', 'order_items', 'orders', ['order_id'], ['id'])
+    op.create_foreign_key('order_items_product_id_fkey', 'order_items', 'products', ['product_id'], ['id'])
+
+    _create_order_indexes()
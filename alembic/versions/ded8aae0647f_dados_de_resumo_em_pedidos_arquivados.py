@@ -0,0 +1,91 @@
+"""Guardar status, total e quantidades dos pedidos arquivados
+
+Revision ID: ded8aae0647f
+Revises: 82e37339dd4e
+Create Date: 2026-10-18 19:42:10.518204
+
+"""
+import json
+import os
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.core.config import settings
+
+
+# Identificadores da migration
+revision: str = 'ded8aae0647f'
+down_revision: Union[str, Sequence[str], None] = '82e37339dd4e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = ["status", "total", "units", "products"]
+
+
+def _backfill() -> None:
+    # Pedidos arquivados antes desta migration: os dados vêm dos arquivos Parquet
+    bind = op.get_bind()
+    files = bind.execute(sa.text("SELECT DISTINCT file FROM archived_orders")).scalars().all()
+    if not files:
+        return
+
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError(
+            "Há pedidos arquivados: instale o pacote pyarrow para preencher "
+            "status, total e quantidades a partir dos arquivos"
+        )
+
+    statement = sa.text("""
+        UPDATE archived_orders
+        SET status = :status, total = :total, units = :units, products = CAST(:products AS jsonb)
+        WHERE order_id = :order_id
+    """)
+    for file in files:
+        table = pq.read_table(
+            os.path.join(settings.order_archive_dir, file),
+            columns=["id", "status", "total", "items"]
+        )
+        rows = []
+        for record in table.to_pylist():
+            products = {}
+            for item in record["items"]:
+                quantity, subtotal = products.get(str(item["product_id"]), (0, 0.0))
+                products[str(item["product_id"])] = (quantity + item["quantity"], subtotal + item["subtotal"])
+            rows.append({
+                "order_id": record["id"],
+                "status": record["status"],
+                "total": record["total"],
+                "units": sum(item["quantity"] for item in record["items"]),
+                "products": json.dumps({key: list(value) for key, value in products.items()}),
+            })
+        if rows:
+            bind.execute(statement, rows)
+
+
+def upgrade() -> None:
+    """Aplica alterações no schema do banco."""
+    # O que client_order_stats e os agregados de vendas precisam para incluir
+    # os pedidos arquivados em uma reconstrução, sem ler os arquivos
+    op.add_column("archived_orders", sa.Column("status", sa.String(length=20), nullable=True))
+    op.add_column("archived_orders", sa.Column("total", sa.Float(), nullable=True))
+    op.add_column("archived_orders", sa.Column("units", sa.Integer(), nullable=True))
+    op.add_column(
+        "archived_orders",
+        sa.Column("products", postgresql.JSONB(astext_type=sa.Text()), nullable=True)
+    )
+
+    _backfill()
+
+    for column in COLUMNS:
+        op.alter_column("archived_orders", column, nullable=False)
+
+
+def downgrade() -> None:
+    """Reverte alterações aplicadas no upgrade."""
+    for column in reversed(COLUMNS):
+        op.drop_column("archived_orders", column)
@@ -0,0 +1,60 @@
+"""Índices compostos e parciais para as consultas dos serviços
+
+Revision ID: f561351cbf93
+Revises: 9755c12179de
+Create Date: 2026-10-18 11:20:54.390127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# Identificadores da migration
+revision: str = 'f561351cbf93'
+down_revision: Union[str, Sequence[str], None] = '9755c12179de'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Aplica alterações no schema do banco."""
+    # Índices simples previstos na migration inicial; bancos criados por
+    # create_all (scripts/migrate.py) não os têm, por isso IF NOT EXISTS
+    op.create_index('ix_orders_created_at', 'orders', ['created_at'], if_not_exists=True)
+    op.create_index('ix_order_items_order_id', 'order_items', ['order_id'], if_not_exists=True)
+    op.create_index('ix_order_items_product_id', 'order_items', ['product_id'], if_not_exists=True)
+    op.create_index('ix_products_name', 'products', ['name'], if_not_exists=True)
+
+    # get_orders com client_id: filtro + ORDER BY created_at DESC, id DESC no mesmo índice
+    op.create_index(
+        'ix_orders_client_created_id',
+        'orders',
+        ['client_id', sa.text('created_at DESC'), sa.text('id DESC')],
+    )
+    # get_orders e transições em lote com filtro de status
+    op.create_index(
+        'ix_orders_owner_status_created_id',
+        'orders',
+        ['owner_id', 'status', sa.text('created_at DESC'), sa.text('id DESC')],
+    )
+
+    # Verificação de email duplicado sem diferenciar maiúsculas
+    op.create_index('ix_clients_email_lower', 'clients', [sa.text('lower(email)')])
+    # get_clients lista apenas clientes ativos, paginando por id
+    op.create_index(
+        'ix_clients_active_id',
+        'clients',
+        ['id'],
+        postgresql_where=sa.text('active'),
+    )
+
+
+def downgrade() -> None:
+    """Reverte alterações aplicadas no upgrade."""
+    op.drop_index('ix_clients_active_id', table_name='clients')
+    op.drop_index('ix_clients_email_lower', table_name='clients')
+    op.drop_index('ix_orders_owner_status_created_id', table_name='orders')
+    op.drop_index('ix_orders_client_created_id', table_name='orders')
+    # Os índices simples pertencem à migration inicial e são mantidos
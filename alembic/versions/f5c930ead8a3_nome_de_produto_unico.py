@@ -0,0 +1,40 @@
+"""Tornar products.name único (importação com ON CONFLICT (name))
+
+Revision ID: f5c930ead8a3
+Revises: 7cb8b57ac105
+Create Date: 2026-10-18 13:58:40.219775
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# Identificadores da migration
+revision: str = 'f5c930ead8a3'
+down_revision: Union[str, Sequence[str], None] = '7cb8b57ac105'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Aplica alterações no schema do banco."""
+    # create_product já rejeita nomes repetidos, mas sem garantia no banco
+    duplicates = op.get_bind().execute(sa.text(
+        "SELECT name FROM products GROUP BY name HAVING count(*) > 1 LIMIT 10"
+    )).scalars().all()
+    if duplicates:
+        raise RuntimeError(
+            "Existem produtos com nomes repetidos; renomeie-os antes da migration: "
+            + ", ".join(duplicates)
+        )
+
+    op.drop_index('ix_products_name', table_name='products')
+    op.create_index('ix_products_name', 'products', ['name'], unique=True)
+
+
+def downgrade() -> None:
+    """Reverte alterações aplicadas no upgrade."""
+    op.drop_index('ix_products_name', table_name='products')
+    op.create_index('ix_products_name', 'products', ['name'])
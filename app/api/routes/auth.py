@@ -1,8 +1,21 @@
+from datetime import datetime
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app.core.database import get_db
+from app.core.dependencies import oauth2_scheme
 from app.core.models.user import User
-from app.core.security import verify_password, create_access_token
+from app.core.password_hashing import PasswordHashingOverloaded, verify_and_update_password
+from app.core.security import (
+    ACCESS_TOKEN,
+    REFRESH_TOKEN,
+    create_access_token,
+    create_refresh_token,
+    verify_token,
+)
+from app.core.token_revocation import is_token_revoked, revoke_tokens
+from app.schemas.token import LogoutRequest, RefreshRequest, TokenPair
 from fastapi.security import OAuth2PasswordRequestForm
 
 # Cria um router FastAPI para endpoints de autenticação
@@ -11,8 +24,43 @@ router = APIRouter(
     tags=["auth"]
 )
 
-@router.post("/login")
-def login(
+
+def _find_user(db: Session, email: str):
+    return db.query(User).filter(User.email == email).first()
+
+
+def _save_password_hash(db: Session, user: User, password_hash: str) -> None:
+    user.password_hash = password_hash
+    db.commit()
+
+
+def _token_pair(user_id: int) -> dict:
+    # Gera tokens JWT contendo o ID do usuário como "sub"
+    return {
+        "access_token": create_access_token(data={"sub": str(user_id)}),
+        "refresh_token": create_refresh_token(data={"sub": str(user_id)}),
+        "token_type": "bearer"
+    }
+
+
+def _revocation(payload: dict) -> tuple:
+    # (jti, user_id, expira em) de um token decodificado, para revoke_tokens
+    return payload["jti"], int(payload["sub"]), datetime.utcfromtimestamp(payload["exp"])
+
+
+def _decode(token: Optional[str], token_type: str) -> Optional[dict]:
+    # Payload de um token válido do tipo esperado e revogável (com jti e sub)
+    payload = verify_token(token) if token else None
+    if payload is None or payload.get("jti") is None or payload.get("sub") is None:
+        return None
+    # Tokens de acesso antigos não têm "type"
+    if payload.get("type", ACCESS_TOKEN) != token_type:
+        return None
+    return payload
+
+
+@router.post("/login", response_model=TokenPair)
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),  # Recebe username e password via form-urlencoded
     db: Session = Depends(get_db),                     # Injeção de dependência do banco de dados
 ):
@@ -20,25 +68,100 @@ def login(
     Endpoint para autenticação de usuários.
     
     Recebe email (username) e senha, verifica se as credenciais estão corretas
-    e retorna um JWT Bearer token válido para acesso aos endpoints protegidos.
+    e retorna um JWT Bearer token válido para acesso aos endpoints protegidos,
+    com um refresh token para renová-lo em /auth/refresh.
+    Retorna 503 se o serviço de hash de senhas estiver sobrecarregado.
     """
-    # Busca usuário pelo email fornecido no form
-    db_user = db.query(User).filter(User.email == form_data.username).first()
+    # Busca usuário pelo email fornecido no form (consulta síncrona fora do event loop)
+    db_user = await run_in_threadpool(_find_user, db, form_data.username)
 
-    # Valida se usuário existe e senha está correta
-    if not db_user or not verify_password(form_data.password, db_user.password_hash):
+    # Valida se usuário existe e senha está correta; o bcrypt roda no pool de hash
+    valid, new_hash = False, None
+    if db_user:
+        try:
+            valid, new_hash = await verify_and_update_password(form_data.password, db_user.password_hash)
+        except PasswordHashingOverloaded as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(e),
+                headers={"Retry-After": "1"}
+            )
+
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Credenciais inválidas",  # Mensagem amigável sem expor detalhes de segurança
         )
 
-    # Gera token JWT contendo o ID do usuário como "sub"
-    access_token = create_access_token(
-        data={"sub": str(db_user.id)}
-    )
+    # Lido antes do commit da regravação, que expira o objeto: acessar db_user.id
+    # depois faria um SELECT bloqueante no event loop
+    user_id = db_user.id
 
-    # Retorna token e tipo Bearer
-    return {
-        "access_token": access_token,
-        "token_type": "bearer"
-    }
+    # Hash com custo diferente do configurado: regravado com o custo atual
+    if new_hash:
+        await run_in_threadpool(_save_password_hash, db, db_user, new_hash)
+
+    # Retorna tokens de acesso e de renovação, tipo Bearer
+    return _token_pair(user_id)
+
+
+@router.post("/refresh", response_model=TokenPair)
+def refresh(body: RefreshRequest, db: Session = Depends(get_db)):
+    """
+    Troca um refresh token válido por um novo par de tokens, sem senha.
+
+    O refresh token usado é revogado (rotação): cada um vale uma única vez.
+    """
+    payload = _decode(body.refresh_token, REFRESH_TOKEN)
+    if payload is None or is_token_revoked(db, payload["jti"]):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token inválido, expirado ou revogado",
+        )
+
+    user_id = int(payload["sub"])
+    if db.get(User, user_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Usuário não encontrado",
+        )
+
+    # Duas renovações simultâneas com o mesmo token: só a que revogar primeiro recebe tokens
+    if payload["jti"] not in revoke_tokens(db, [_revocation(payload)]):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token inválido, expirado ou revogado",
+        )
+    return _token_pair(user_id)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(
+    body: Optional[LogoutRequest] = None,
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+):
+    """
+    Revoga o token de acesso da requisição e, se informado, o refresh token
+    do mesmo usuário. Tokens revogados são recusados por todos os workers em
+    até token_revocation_sync_seconds.
+    """
+    payload = _decode(token, ACCESS_TOKEN)
+    if payload is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token inválido ou expirado",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    revoked = [_revocation(payload)]
+    if body and body.refresh_token:
+        refresh_payload = _decode(body.refresh_token, REFRESH_TOKEN)
+        if refresh_payload is None or refresh_payload["sub"] != payload["sub"]:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Refresh token inválido",
+            )
+        revoked.append(_revocation(refresh_payload))
+
+    revoke_tokens(db, revoked)
@@ -1,13 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import tempfile
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.core.dependencies import get_current_user  # Dependência para autenticação do usuário
 
 from app.core.database import get_db
-from app.schemas.client import ClientCreate, ClientUpdate, ClientRead
+from app.schemas.imports import ImportFormat, ImportResult
+from app.schemas.client import (
+    ClientCreate,
+    ClientUpdate,
+    ClientRead,
+    ClientImportMode,
+    ClientOrderSummary,
+    ClientLookupRequest,
+    ClientLookupResponse,
+    ClientSearchField,
+    ClientSearchMode,
+)
+from app.services.exceptions import BusinessRuleException
+from app.services.client_import_service import import_clients
+from app.services.client_stats_service import get_client_order_summary
 from app.services.client_service import (
     get_client,
     get_clients,
+    get_clients_page,
+    lookup_clients,
+    search_clients,
     create_client,
     update_client,
     delete_client,
@@ -20,24 +39,135 @@ router = APIRouter(
     tags=["clients"]
 )
 
+# Limite de IDs em GET /clients?ids=...; listas maiores vão por POST /clients/lookup
+MAX_QUERY_IDS = 200
+
 # ---------------------- ENDPOINTS ----------------------
 
 @router.get("/", response_model=List[ClientRead])
 def read_clients(
+    response: Response,
     skip: int = Query(0, ge=0, description="Número de registros para pular"),
     limit: int = Query(100, ge=1, le=200, description="Limite de registros por página"),
+    cursor: Optional[str] = Query(None, description="Cursor da próxima página (header X-Next-Cursor)"),
+    ids: Optional[List[int]] = Query(None, description="Busca estes IDs (ids=1&ids=2), na ordem informada"),
     db: Session = Depends(get_db)
 ):
     """
     Lista clientes ativos com paginação.
     
-    - **skip**: número de registros a pular (para paginação)
+    - **skip**: número de registros a pular (prefira o cursor)
     - **limit**: número máximo de registros retornados
+    - **cursor**: continua a partir da página anterior; o próximo vem no header **X-Next-Cursor**
+    - **ids**: retorna apenas esses clientes (ativos ou não), na ordem pedida;
+      os não encontrados vão no header **X-Missing-Ids**
     """
+    if ids:
+        if len(ids) > MAX_QUERY_IDS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Informe no máximo {MAX_QUERY_IDS} IDs; use POST /clients/lookup"
+            )
+        clients, missing = lookup_clients(db, ids)
+        if missing:
+            response.headers["X-Missing-Ids"] = ",".join(str(client_id) for client_id in missing)
+        return clients
+
+    if cursor or not skip:
+        try:
+            clients, next_cursor = get_clients_page(db, cursor=cursor, limit=limit)
+        except BusinessRuleException as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return clients
+
     clients = get_clients(db, skip=skip, limit=limit)
     return clients
 
 
+@router.get("/search", response_model=List[ClientRead])
+def search_many_clients(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=100, description="Texto buscado"),
+    mode: ClientSearchMode = Query(ClientSearchMode.CONTAINS, description="prefix ou contains"),
+    fields: Optional[List[ClientSearchField]] = Query(None, description="Campos pesquisados (padrão: todos)"),
+    limit: int = Query(50, ge=1, le=200, description="Limite de registros por página"),
+    cursor: Optional[str] = Query(None, description="Cursor da próxima página (header X-Next-Cursor)"),
+    db: Session = Depends(get_db)
+):
+    """
+    Busca clientes ativos por nome, email ou telefone, sem diferenciar maiúsculas.
+    
+    - **mode=prefix**: campos que começam com q
+    - **mode=contains**: campos que contêm q (mínimo de 3 caracteres)
+    - **X-Next-Cursor**: header com o cursor da próxima página (ausente na última)
+    """
+    try:
+        clients, next_cursor = search_clients(
+            db,
+            q,
+            mode=mode.value,
+            fields=[field.value for field in fields] if fields else None,
+            cursor=cursor,
+            limit=limit
+        )
+    except BusinessRuleException as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return clients
+
+
+@router.post("/lookup", response_model=ClientLookupResponse)
+def lookup_many_clients(lookup: ClientLookupRequest, db: Session = Depends(get_db)):
+    """
+    Busca vários clientes pelo ID de uma vez, na ordem pedida.
+    
+    IDs inexistentes aparecem em **missing**.
+    """
+    clients, missing = lookup_clients(db, lookup.ids)
+    return {"items": clients, "missing": missing}
+
+
+# Corpo da importação fica em memória até este tamanho e depois vai para disco
+IMPORT_SPOOL_BYTES = 8 * 1024 * 1024
+
+
+@router.post("/import", response_model=ImportResult)
+async def import_client_list(
+    request: Request,
+    format: ImportFormat = Query(ImportFormat.CSV, description="Formato do corpo: csv ou ndjson"),
+    mode: ClientImportMode = Query(ClientImportMode.MERGE, description="merge atualiza emails existentes; skip os ignora"),
+    chunk_size: Optional[int] = Query(None, ge=100, le=50000, description="Linhas gravadas por transação"),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Importa clientes em massa (corpo CSV com cabeçalho ou NDJSON) para o usuário autenticado.
+
+    Clientes são identificados pelo email, sem diferenciar maiúsculas. Com
+    **mode=merge** os existentes do usuário são atualizados (a última linha de
+    cada email vence); com **mode=skip** emails já cadastrados são ignorados.
+    A gravação é feita em lotes com commit próprio: um lote que falha é relatado
+    em error_details e os demais seguem.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_BYTES) as body:
+        async for chunk in request.stream():
+            body.write(chunk)
+        body.seek(0)
+        return await run_in_threadpool(
+            import_clients, db, body, format.value, current_user.id, mode.value, chunk_size
+        )
+
+
 @router.get("/{client_id}", response_model=ClientRead)
 def read_client(client_id: int, db: Session = Depends(get_db)):
     """
@@ -54,6 +184,28 @@ def read_client(client_id: int, db: Session = Depends(get_db)):
     return db_client
 
 
+@router.get("/{client_id}/summary", response_model=ClientOrderSummary)
+def read_client_summary(
+    client_id: int,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Retorna o resumo de pedidos de um cliente do usuário autenticado: total
+    gasto (sem pedidos cancelados), quantidade de pedidos, data do último pedido
+    e contagem por status.
+
+    Retorna 404 se o cliente não existir ou pertencer a outro usuário.
+    """
+    summary = get_client_order_summary(db, client_id, current_user.id)
+    if summary is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Cliente não encontrado"
+        )
+    return summary
+
+
 @router.post("/", response_model=ClientRead, status_code=status.HTTP_201_CREATED)
 def create_new_client(
     client: ClientCreate,
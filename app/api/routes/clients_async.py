@@ -0,0 +1,238 @@
+# app/api/routes/clients_async.py
+# Variantes async (AsyncSession/asyncpg) das rotas de clientes, usadas no lugar
+# das síncronas quando settings.database_stack == "async"
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.core.dependencies import get_current_user_async
+
+from app.core.database import get_async_db
+from app.schemas.client import (
+    ClientCreate,
+    ClientUpdate,
+    ClientRead,
+    ClientOrderSummary,
+    ClientLookupRequest,
+    ClientLookupResponse,
+    ClientSearchField,
+    ClientSearchMode,
+)
+from app.services.exceptions import BusinessRuleException
+from app.services.client_stats_service import get_client_order_summary_async
+from app.services.client_service import (
+    get_client_async,
+    get_clients_async,
+    get_clients_page_async,
+    lookup_clients_async,
+    search_clients_async,
+    create_client,
+    update_client,
+    delete_client,
+    deactivate_client
+)
+from app.api.routes.clients import MAX_QUERY_IDS
+
+router = APIRouter(
+    prefix="/clients",
+    tags=["clients"]
+)
+
+# ---------------------- ENDPOINTS ----------------------
+
+@router.get("/", response_model=List[ClientRead])
+async def read_clients(
+    response: Response,
+    skip: int = Query(0, ge=0, description="Número de registros para pular"),
+    limit: int = Query(100, ge=1, le=200, description="Limite de registros por página"),
+    cursor: Optional[str] = Query(None, description="Cursor da próxima página (header X-Next-Cursor)"),
+    ids: Optional[List[int]] = Query(None, description="Busca estes IDs (ids=1&ids=2), na ordem informada"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Lista clientes ativos com paginação.
+
+    - **skip**: número de registros a pular (prefira o cursor)
+    - **limit**: número máximo de registros retornados
+    - **cursor**: continua a partir da página anterior; o próximo vem no header **X-Next-Cursor**
+    - **ids**: retorna apenas esses clientes (ativos ou não), na ordem pedida;
+      os não encontrados vão no header **X-Missing-Ids**
+    """
+    if ids:
+        if len(ids) > MAX_QUERY_IDS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Informe no máximo {MAX_QUERY_IDS} IDs; use POST /clients/lookup"
+            )
+        clients, missing = await lookup_clients_async(db, ids)
+        if missing:
+            response.headers["X-Missing-Ids"] = ",".join(str(client_id) for client_id in missing)
+        return clients
+
+    if cursor or not skip:
+        try:
+            clients, next_cursor = await get_clients_page_async(db, cursor=cursor, limit=limit)
+        except BusinessRuleException as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return clients
+
+    return await get_clients_async(db, skip=skip, limit=limit)
+
+
+@router.get("/search", response_model=List[ClientRead])
+async def search_many_clients(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=100, description="Texto buscado"),
+    mode: ClientSearchMode = Query(ClientSearchMode.CONTAINS, description="prefix ou contains"),
+    fields: Optional[List[ClientSearchField]] = Query(None, description="Campos pesquisados (padrão: todos)"),
+    limit: int = Query(50, ge=1, le=200, description="Limite de registros por página"),
+    cursor: Optional[str] = Query(None, description="Cursor da próxima página (header X-Next-Cursor)"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Busca clientes ativos por nome, email ou telefone, sem diferenciar maiúsculas.
+
+    - **mode=prefix**: campos que começam com q
+    - **mode=contains**: campos que contêm q (mínimo de 3 caracteres)
+    - **X-Next-Cursor**: header com o cursor da próxima página (ausente na última)
+    """
+    try:
+        clients, next_cursor = await search_clients_async(
+            db,
+            q,
+            mode=mode.value,
+            fields=[field.value for field in fields] if fields else None,
+            cursor=cursor,
+            limit=limit
+        )
+    except BusinessRuleException as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return clients
+
+
+@router.post("/lookup", response_model=ClientLookupResponse)
+async def lookup_many_clients(lookup: ClientLookupRequest, db: AsyncSession = Depends(get_async_db)):
+    """
+    Busca vários clientes pelo ID de uma vez, na ordem pedida.
+
+    IDs inexistentes aparecem em **missing**.
+    """
+    clients, missing = await lookup_clients_async(db, lookup.ids)
+    return {"items": clients, "missing": missing}
+
+
+@router.get("/{client_id}", response_model=ClientRead)
+async def read_client(client_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Retorna um cliente específico pelo ID.
+
+    Retorna 404 se o cliente não for encontrado.
+    """
+    db_client = await get_client_async(db, client_id)
+    if db_client is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Cliente não encontrado"
+        )
+    return db_client
+
+
+@router.get("/{client_id}/summary", response_model=ClientOrderSummary)
+async def read_client_summary(
+    client_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user_async)
+):
+    """
+    Retorna o resumo de pedidos de um cliente do usuário autenticado: total
+    gasto (sem pedidos cancelados), quantidade de pedidos, data do último pedido
+    e contagem por status.
+
+    Retorna 404 se o cliente não existir ou pertencer a outro usuário.
+    """
+    summary = await get_client_order_summary_async(db, client_id, current_user.id)
+    if summary is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Cliente não encontrado"
+        )
+    return summary
+
+
+# Escritas: a mesma lógica das rotas síncronas, na sessão interna da AsyncSession
+
+@router.post("/", response_model=ClientRead, status_code=status.HTTP_201_CREATED)
+async def create_new_client(
+    client: ClientCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user_async),  # Garante que apenas usuário autenticado pode criar
+):
+    """
+    Cria um novo cliente associado ao usuário autenticado.
+
+    - **client**: dados do cliente (nome, email, telefone, endereço)
+    - **current_user**: usado para associar o cliente ao usuário que criou
+    """
+    return await db.run_sync(create_client, client, current_user.id)
+
+
+@router.put("/{client_id}", response_model=ClientRead)
+async def update_existing_client(
+    client_id: int,
+    client_update: ClientUpdate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Atualiza os dados de um cliente existente.
+
+    Retorna 404 se o cliente não for encontrado.
+    """
+    updated_client = await db.run_sync(update_client, client_id, client_update)
+    if updated_client is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Cliente não encontrado"
+        )
+    return updated_client
+
+
+@router.delete("/{client_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_existing_client(client_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Remove um cliente do sistema (deleção física).
+
+    Retorna 404 se o cliente não existir.
+    DELETE 204 não retorna corpo.
+    """
+    success = await db.run_sync(delete_client, client_id)
+    if not success:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Cliente não encontrado"
+        )
+
+
+@router.patch("/{client_id}/deactivate", response_model=ClientRead)
+async def deactivate_existing_client(client_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Desativa um cliente (soft delete), apenas marcando active=False.
+
+    Retorna 404 se o cliente não existir.
+    """
+    deactivated_client = await db.run_sync(deactivate_client, client_id)
+    if deactivated_client is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Cliente não encontrado"
+        )
+    return deactivated_client
@@ -1,5 +1,9 @@
 from fastapi import APIRouter
 from app.core.logger_config import logger  # Usa logger global
+from app.core.dependencies import auth_cache_stats
+from app.core.password_hashing import password_hashing_stats
+from app.core.token_revocation import revocation_stats
+from app.services.product_service import product_cache_stats
 
 # Criar router específico para rotas relacionadas à saúde da API
 router = APIRouter()
@@ -12,4 +16,24 @@ def health_check():
     Pode ser usado para monitoramento ou verificação rápida.
     """
     logger.info("Endpoint /health acessado")
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok"}
+
+# Endpoint GET /health/caches
+@router.get("/health/caches")
+def cache_stats():
+    """
+    Retorna tamanho, acertos e falhas dos caches em memória deste processo.
+    """
+    return {
+        "products": product_cache_stats(),
+        "auth": auth_cache_stats(),
+        "token_revocation": revocation_stats(),
+    }
+
+# Endpoint GET /health/password-hashing
+@router.get("/health/password-hashing")
+def password_hashing_health():
+    """
+    Retorna ocupação, recusas (503) e tempos de fila e de cálculo do pool de hash de senhas.
+    """
+    return password_hashing_stats()
@@ -1,13 +1,34 @@
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.encoders import jsonable_encoder
 from fastapi import status
-from app.core.database import get_db
+from fastapi.responses import JSONResponse, StreamingResponse
+from app.core.database import get_db, SessionLocal
 from app.api.deps import get_current_user
-from app.schemas.order import OrderCreate, OrderUpdate, Order, OrderWithItems
+from app.schemas.order import (
+    OrderCreate,
+    OrderUpdate,
+    Order,
+    OrderWithItems,
+    OrderBatchCreate,
+    OrderBatchResponse,
+    CountMode,
+    OrderStatusBatchUpdate,
+    OrderStatusBatchResponse,
+    ExportFormat,
+)
 from app.services.order_service import OrderService
-from app.services.exceptions import NotFoundException, BusinessRuleException
+from app.services.order_export import csv_chunks, ndjson_chunks
+from app.services.idempotency_service import run_idempotent, request_fingerprint
+from app.services.exceptions import (
+    NotFoundException,
+    BusinessRuleException,
+    StockContentionException,
+    IdempotencyKeyReuseException,
+    IdempotencyInProgressException,
+)
 from app.core.models import User
 
 router = APIRouter(
@@ -18,8 +39,11 @@ router = APIRouter(
 
 @router.get("/", response_model=List[Order])
 def read_orders(
-    skip: int = Query(0, ge=0, description="Número de registros para pular"),
+    response: Response,
+    skip: int = Query(0, ge=0, description="Número de registros para pular (prefira o cursor)"),
     limit: int = Query(100, ge=1, le=200, description="Limite de registros por página"),
+    cursor: Optional[str] = Query(None, description="Cursor da próxima página (header X-Next-Cursor)"),
+    count: Optional[CountMode] = Query(None, description="Contagem total: exact ou estimate"),
     client_id: Optional[int] = Query(None, description="Filtrar por ID do cliente"),
     status_filter: Optional[str] = Query(None, description="Filtrar por status do pedido"),
     start_date: Optional[datetime] = Query(None, description="Data inicial"),
@@ -28,26 +52,134 @@ def read_orders(
     current_user: User = Depends(get_current_user)
 ):
     """
-    Retorna uma lista de pedidos com filtros e paginação.
+    Retorna uma lista de pedidos com filtros e paginação por cursor.
+
+    - **X-Next-Cursor**: header com o cursor da próxima página (ausente na última)
+    - **X-Total-Count**: enviado apenas com count=exact
+    - **X-Total-Count-Estimate**: enviado apenas com count=estimate
     """
     try:
-        orders, total = OrderService.get_orders(
+        orders, next_cursor, total = OrderService.get_orders_page(
             db=db,
             current_user_id=current_user.id,
             client_id=client_id,
             status=status_filter,
             start_date=start_date,
             end_date=end_date,
+            cursor=cursor,
             skip=skip,
-            limit=limit
+            limit=limit,
+            count_mode=count.value if count else None
+        )
+    except BusinessRuleException as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
         )
-        return orders
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erro ao buscar pedidos: {str(e)}"
         )
 
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if total is not None:
+        header = "X-Total-Count" if count == CountMode.EXACT else "X-Total-Count-Estimate"
+        response.headers[header] = str(total)
+    return orders
+
+
+@router.get("/export")
+def export_orders(
+    format: ExportFormat = Query(ExportFormat.NDJSON, description="Formato: ndjson ou csv"),
+    include_items: bool = Query(False, description="Incluir os itens de cada pedido"),
+    client_id: Optional[int] = Query(None, description="Filtrar por ID do cliente"),
+    status_filter: Optional[str] = Query(None, description="Filtrar por status do pedido"),
+    start_date: Optional[datetime] = Query(None, description="Data inicial"),
+    end_date: Optional[datetime] = Query(None, description="Data final"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Exporta os pedidos filtrados em NDJSON ou CSV, em streaming.
+
+    As linhas são lidas com cursor no servidor e enviadas aos poucos, então o
+    uso de memória não cresce com o tamanho da exportação.
+    """
+    user_id = current_user.id
+
+    def generate():
+        # Sessão própria: a exportação continua depois que a rota retorna
+        db = SessionLocal()
+        try:
+            records = OrderService.iter_orders_export(
+                db=db,
+                current_user_id=user_id,
+                client_id=client_id,
+                status=status_filter,
+                start_date=start_date,
+                end_date=end_date,
+                include_items=include_items
+            )
+            if format == ExportFormat.CSV:
+                yield from csv_chunks(records, include_items=include_items)
+            else:
+                yield from ndjson_chunks(records)
+        finally:
+            db.close()
+
+    media_type = "text/csv" if format == ExportFormat.CSV else "application/x-ndjson"
+    return StreamingResponse(
+        generate(),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename=orders.{format.value}"}
+    )
+
+
+@router.get("/with-items", response_model=List[OrderWithItems])
+def read_orders_with_items(
+    response: Response,
+    limit: int = Query(50, ge=1, le=200, description="Limite de registros por página"),
+    cursor: Optional[str] = Query(None, description="Cursor da próxima página (header X-Next-Cursor)"),
+    client_id: Optional[int] = Query(None, description="Filtrar por ID do cliente"),
+    status_filter: Optional[str] = Query(None, description="Filtrar por status do pedido"),
+    start_date: Optional[datetime] = Query(None, description="Data inicial"),
+    end_date: Optional[datetime] = Query(None, description="Data final"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Retorna pedidos com seus itens, com os mesmos filtros da listagem.
+
+    Os itens de todos os pedidos da página são carregados em uma única consulta.
+    """
+    try:
+        orders, next_cursor, _ = OrderService.get_orders_page(
+            db=db,
+            current_user_id=current_user.id,
+            client_id=client_id,
+            status=status_filter,
+            start_date=start_date,
+            end_date=end_date,
+            cursor=cursor,
+            limit=limit,
+            schema=OrderWithItems
+        )
+    except BusinessRuleException as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao buscar pedidos: {str(e)}"
+        )
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return orders
+
 
 @router.get("/{order_id}", response_model=OrderWithItems)
 def read_order(
@@ -57,9 +189,12 @@ def read_order(
 ):
     """
     Retorna um pedido específico pelo ID com seus itens.
+    Pedidos já arquivados são lidos do arquivo de pedidos antigos.
     """
     try:
-        order = OrderService.get_order_by_id(db, order_id, current_user.id)
+        order = OrderService.get_order_by_id(
+            db, order_id, current_user.id, schema=OrderWithItems, include_archived=True
+        )
         return order
     except NotFoundException as e:
         raise HTTPException(
@@ -76,20 +211,57 @@ def read_order(
 @router.post("/", response_model=Order, status_code=status.HTTP_201_CREATED)
 def create_new_order(
     order: OrderCreate,
+    idempotency_key: Optional[str] = Header(
+        None,
+        alias="Idempotency-Key",
+        max_length=255,
+        description="Chave para repetir a requisição sem criar outro pedido"
+    ),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Cria um novo pedido.
+
+    Com o header **Idempotency-Key**, repetições com a mesma chave devolvem a
+    resposta da primeira execução (header Idempotent-Replayed: true).
     """
     try:
-        new_order = OrderService.create_order(db, order, current_user.id)
-        return new_order
+        if idempotency_key is None:
+            new_order = OrderService.create_order(db, order, current_user.id)
+            return new_order
+
+        def operation():
+            new_order = OrderService.create_order(db, order, current_user.id, commit=False)
+            return (
+                status.HTTP_201_CREATED,
+                jsonable_encoder(Order.model_validate(new_order))
+            )
+
+        status_code, body, replayed = run_idempotent(
+            db,
+            current_user.id,
+            idempotency_key,
+            request_fingerprint(order),
+            operation
+        )
+        headers = {"Idempotent-Replayed": "true"} if replayed else None
+        return JSONResponse(status_code=status_code, content=body, headers=headers)
     except NotFoundException as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    except (StockContentionException, IdempotencyInProgressException) as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    except IdempotencyKeyReuseException as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
     except BusinessRuleException as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -102,6 +274,80 @@ def create_new_order(
         )
 
 
+@router.post("/batch", response_model=OrderBatchResponse)
+def create_orders_batch(
+    batch: OrderBatchCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Cria vários pedidos em uma única requisição.
+
+    Retorna o resultado de cada pedido (sucesso ou erro) na ordem do lote.
+    """
+    try:
+        results = OrderService.create_orders_batch(db, batch.orders, current_user.id)
+    except StockContentionException as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao criar pedidos em lote: {str(e)}"
+        )
+
+    created = sum(1 for result in results if result["success"])
+    return {
+        "created": created,
+        "failed": len(results) - created,
+        "results": results
+    }
+
+
+@router.patch("/status:batch", response_model=OrderStatusBatchResponse)
+def update_orders_status_batch(
+    batch: OrderStatusBatchUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Aplica uma transição de status a vários pedidos de uma vez.
+
+    Os pedidos são escolhidos por **order_ids** ou por **filters**. Pedidos fora
+    de um status de origem válido são listados em **rejected** com o motivo e
+    contados em **rejected_count**; com **filters**, a lista traz só os primeiros.
+    """
+    filters = batch.filters
+    try:
+        return OrderService.update_orders_status_batch(
+            db=db,
+            new_status=batch.status.value,
+            current_user_id=current_user.id,
+            order_ids=batch.order_ids,
+            client_id=filters.client_id if filters else None,
+            status=filters.status.value if filters and filters.status else None,
+            start_date=filters.start_date if filters else None,
+            end_date=filters.end_date if filters else None
+        )
+    except StockContentionException as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    except BusinessRuleException as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao atualizar status em lote: {str(e)}"
+        )
+
+
 @router.patch("/{order_id}/status", response_model=Order)
 def update_order_status(
     order_id: int,
@@ -122,6 +368,11 @@ def update_order_status(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    except StockContentionException as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
     except BusinessRuleException as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -155,6 +406,11 @@ def delete_existing_order(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    except StockContentionException as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
     except BusinessRuleException as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -0,0 +1,384 @@
+# app/api/routes/orders_async.py
+# Variantes async (AsyncSession/asyncpg) das rotas de pedidos, usadas no lugar
+# das síncronas quando settings.database_stack == "async". A exportação
+# (GET /orders/export) continua síncrona: percorre um cursor no servidor com yield_per.
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import datetime
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi import status
+from fastapi.responses import JSONResponse
+from app.core.database import get_async_db, SessionLocal
+from app.api.deps import get_current_user_async
+from app.schemas.order import (
+    OrderCreate,
+    OrderUpdate,
+    Order,
+    OrderWithItems,
+    OrderBatchCreate,
+    OrderBatchResponse,
+    CountMode,
+    OrderStatusBatchUpdate,
+    OrderStatusBatchResponse,
+)
+from app.services.order_service import OrderService
+from app.services.idempotency_service import run_idempotent, request_fingerprint
+from app.services.exceptions import (
+    NotFoundException,
+    BusinessRuleException,
+    StockContentionException,
+    IdempotencyKeyReuseException,
+    IdempotencyInProgressException,
+)
+from app.core.models import User
+
+router = APIRouter(
+    prefix="/orders",
+    tags=["orders"]
+)
+
+
+@router.get("/", response_model=List[Order])
+async def read_orders(
+    response: Response,
+    skip: int = Query(0, ge=0, description="Número de registros para pular (prefira o cursor)"),
+    limit: int = Query(100, ge=1, le=200, description="Limite de registros por página"),
+    cursor: Optional[str] = Query(None, description="Cursor da próxima página (header X-Next-Cursor)"),
+    count: Optional[CountMode] = Query(None, description="Contagem total: exact ou estimate"),
+    client_id: Optional[int] = Query(None, description="Filtrar por ID do cliente"),
+    status_filter: Optional[str] = Query(None, description="Filtrar por status do pedido"),
+    start_date: Optional[datetime] = Query(None, description="Data inicial"),
+    end_date: Optional[datetime] = Query(None, description="Data final"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """
+    Retorna uma lista de pedidos com filtros e paginação por cursor.
+
+    - **X-Next-Cursor**: header com o cursor da próxima página (ausente na última)
+    - **X-Total-Count**: enviado apenas com count=exact
+    - **X-Total-Count-Estimate**: enviado apenas com count=estimate
+    """
+    try:
+        orders, next_cursor, total = await OrderService.get_orders_page_async(
+            db=db,
+            current_user_id=current_user.id,
+            client_id=client_id,
+            status=status_filter,
+            start_date=start_date,
+            end_date=end_date,
+            cursor=cursor,
+            skip=skip,
+            limit=limit,
+            count_mode=count.value if count else None
+        )
+    except BusinessRuleException as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao buscar pedidos: {str(e)}"
+        )
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if total is not None:
+        header = "X-Total-Count" if count == CountMode.EXACT else "X-Total-Count-Estimate"
+        response.headers[header] = str(total)
+    return orders
+
+
+@router.get("/with-items", response_model=List[OrderWithItems])
+async def read_orders_with_items(
+    response: Response,
+    limit: int = Query(50, ge=1, le=200, description="Limite de registros por página"),
+    cursor: Optional[str] = Query(None, description="Cursor da próxima página (header X-Next-Cursor)"),
+    client_id: Optional[int] = Query(None, description="Filtrar por ID do cliente"),
+    status_filter: Optional[str] = Query(None, description="Filtrar por status do pedido"),
+    start_date: Optional[datetime] = Query(None, description="Data inicial"),
+    end_date: Optional[datetime] = Query(None, description="Data final"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """
+    Retorna pedidos com seus itens, com os mesmos filtros da listagem.
+
+    Os itens de todos os pedidos da página são carregados em uma única consulta.
+    """
+    try:
+        orders, next_cursor, _ = await OrderService.get_orders_page_async(
+            db=db,
+            current_user_id=current_user.id,
+            client_id=client_id,
+            status=status_filter,
+            start_date=start_date,
+            end_date=end_date,
+            cursor=cursor,
+            limit=limit,
+            schema=OrderWithItems
+        )
+    except BusinessRuleException as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao buscar pedidos: {str(e)}"
+        )
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return orders
+
+
+@router.get("/{order_id}", response_model=OrderWithItems)
+async def read_order(
+    order_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """
+    Retorna um pedido específico pelo ID com seus itens.
+    Pedidos já arquivados são lidos do arquivo de pedidos antigos.
+    """
+    try:
+        return await OrderService.get_order_by_id_async(
+            db, order_id, current_user.id, schema=OrderWithItems, include_archived=True
+        )
+    except NotFoundException as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao buscar pedido: {str(e)}"
+        )
+
+
+def _create_order_idempotent(order: OrderCreate, user_id: int, idempotency_key: str):
+    # run_idempotent espera duplicatas em andamento bloqueando a thread: roda no
+    # threadpool, com sessão síncrona, para não parar o event loop
+    db = SessionLocal()
+    try:
+        def operation():
+            new_order = OrderService.create_order(db, order, user_id, commit=False)
+            return (
+                status.HTTP_201_CREATED,
+                jsonable_encoder(Order.model_validate(new_order))
+            )
+
+        return run_idempotent(
+            db,
+            user_id,
+            idempotency_key,
+            request_fingerprint(order),
+            operation
+        )
+    finally:
+        db.close()
+
+
+@router.post("/", response_model=Order, status_code=status.HTTP_201_CREATED)
+async def create_new_order(
+    order: OrderCreate,
+    idempotency_key: Optional[str] = Header(
+        None,
+        alias="Idempotency-Key",
+        max_length=255,
+        description="Chave para repetir a requisição sem criar outro pedido"
+    ),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """
+    Cria um novo pedido.
+
+    Com o header **Idempotency-Key**, repetições com a mesma chave devolvem a
+    resposta da primeira execução (header Idempotent-Replayed: true).
+    """
+    try:
+        if idempotency_key is None:
+            return await OrderService.create_order_async(db, order, current_user.id)
+
+        status_code, body, replayed = await run_in_threadpool(
+            _create_order_idempotent, order, current_user.id, idempotency_key
+        )
+        headers = {"Idempotent-Replayed": "true"} if replayed else None
+        return JSONResponse(status_code=status_code, content=body, headers=headers)
+    except NotFoundException as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except (StockContentionException, IdempotencyInProgressException) as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    except IdempotencyKeyReuseException as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
+    except BusinessRuleException as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao criar pedido: {str(e)}"
+        )
+
+
+@router.post("/batch", response_model=OrderBatchResponse)
+async def create_orders_batch(
+    batch: OrderBatchCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """
+    Cria vários pedidos em uma única requisição.
+
+    Retorna o resultado de cada pedido (sucesso ou erro) na ordem do lote.
+    """
+    try:
+        results = await OrderService.create_orders_batch_async(db, batch.orders, current_user.id)
+    except StockContentionException as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao criar pedidos em lote: {str(e)}"
+        )
+
+    created = sum(1 for result in results if result["success"])
+    return {
+        "created": created,
+        "failed": len(results) - created,
+        "results": results
+    }
+
+
+@router.patch("/status:batch", response_model=OrderStatusBatchResponse)
+async def update_orders_status_batch(
+    batch: OrderStatusBatchUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """
+    Aplica uma transição de status a vários pedidos de uma vez.
+
+    Os pedidos são escolhidos por **order_ids** ou por **filters**. Pedidos fora
+    de um status de origem válido são listados em **rejected** com o motivo e
+    contados em **rejected_count**; com **filters**, a lista traz só os primeiros.
+    """
+    filters = batch.filters
+    try:
+        return await OrderService.update_orders_status_batch_async(
+            db=db,
+            new_status=batch.status.value,
+            current_user_id=current_user.id,
+            order_ids=batch.order_ids,
+            client_id=filters.client_id if filters else None,
+            status=filters.status.value if filters and filters.status else None,
+            start_date=filters.start_date if filters else None,
+            end_date=filters.end_date if filters else None
+        )
+    except StockContentionException as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    except BusinessRuleException as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao atualizar status em lote: {str(e)}"
+        )
+
+
+@router.patch("/{order_id}/status", response_model=Order)
+async def update_order_status(
+    order_id: int,
+    order_update: OrderUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """
+    Atualiza o status de um pedido existente.
+    """
+    try:
+        return await OrderService.update_order_status_async(
+            db, order_id, order_update, current_user.id
+        )
+    except NotFoundException as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except StockContentionException as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    except BusinessRuleException as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao atualizar status: {str(e)}"
+        )
+
+
+@router.delete("/{order_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_existing_order(
+    order_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """
+    Remove um pedido do sistema (apenas se estiver pendente).
+    """
+    try:
+        await OrderService.delete_order_async(db, order_id, current_user.id)
+    except NotFoundException as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except StockContentionException as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    except BusinessRuleException as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao excluir pedido: {str(e)}"
+        )
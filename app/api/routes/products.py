@@ -1,12 +1,29 @@
 # app/api/routes/products.py
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import tempfile
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.core.database import get_db
-from app.schemas.product import ProductCreate, ProductUpdate, ProductRead
+from app.schemas.imports import ImportFormat, ImportResult
+from app.schemas.product import (
+    ProductCreate,
+    ProductUpdate,
+    ProductRead,
+    ProductSearchResult,
+    ProductLookupRequest,
+    ProductLookupResponse,
+    StockAdjustRequest,
+    StockAdjustResponse,
+)
+from app.services.exceptions import BusinessRuleException, StockContentionException
+from app.services.product_import_service import import_products
+from app.services.stock_service import apply_stock_adjustments
 from app.services.product_service import (
     get_product,
     get_products,
+    lookup_products,
+    search_products,
     create_product,
     update_product,
     delete_product
@@ -17,19 +34,76 @@ router = APIRouter(
 )
 
 
+# Limite de IDs em GET /products?ids=...; listas maiores vão por POST /products/lookup
+MAX_QUERY_IDS = 200
+
+
 @router.get("/", response_model=List[ProductRead])
 def read_products(
+    response: Response,
     skip: int = Query(0, ge=0, description="Número de registros para pular"),
     limit: int = Query(100, ge=1, le=200, description="Limite de registros por página"),
+    ids: Optional[List[int]] = Query(None, description="Busca estes IDs (ids=1&ids=2), na ordem informada"),
     db: Session = Depends(get_db)
 ):
     """
     Retorna uma lista de produtos com paginação.
+
+    Com **ids**, retorna apenas esses produtos, na ordem pedida, e lista os
+    não encontrados no header **X-Missing-Ids**.
     """
+    if ids:
+        if len(ids) > MAX_QUERY_IDS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Informe no máximo {MAX_QUERY_IDS} IDs; use POST /products/lookup"
+            )
+        products, missing = lookup_products(db, ids)
+        if missing:
+            response.headers["X-Missing-Ids"] = ",".join(str(product_id) for product_id in missing)
+        return products
+
     products = get_products(db, skip=skip, limit=limit)
     return products
 
 
+@router.post("/lookup", response_model=ProductLookupResponse)
+def lookup_catalog(lookup: ProductLookupRequest, db: Session = Depends(get_db)):
+    """
+    Busca vários produtos pelo ID de uma vez, na ordem pedida.
+    IDs inexistentes aparecem em **missing**.
+    """
+    products, missing = lookup_products(db, lookup.ids)
+    return {"items": products, "missing": missing}
+
+
+@router.get("/search", response_model=List[ProductSearchResult])
+def search_catalog(
+    response: Response,
+    q: str = Query(..., min_length=2, max_length=100, description="Texto buscado no nome e na descrição"),
+    limit: int = Query(20, ge=1, le=100, description="Limite de resultados por página"),
+    cursor: Optional[str] = Query(None, description="Cursor da próxima página (header X-Next-Cursor)"),
+    db: Session = Depends(get_db)
+):
+    """
+    Busca produtos por texto, tolerando erros de digitação no nome.
+    Resultados em ordem de relevância (campo rank).
+
+    - **X-Next-Cursor**: header com o cursor da próxima página (ausente na última)
+    """
+    try:
+        products, next_cursor = search_products(db, q, limit=limit, cursor=cursor)
+    except BusinessRuleException as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return products
+
+
 @router.get("/{product_id}", response_model=ProductRead)
 def read_product(product_id: int, db: Session = Depends(get_db)):
     """
@@ -44,6 +118,60 @@ def read_product(product_id: int, db: Session = Depends(get_db)):
     return db_product
 
 
+# Corpo da importação fica em memória até este tamanho e depois vai para disco
+IMPORT_SPOOL_BYTES = 8 * 1024 * 1024
+
+
+@router.post("/import", response_model=ImportResult)
+async def import_catalog(
+    request: Request,
+    format: ImportFormat = Query(ImportFormat.CSV, description="Formato do corpo: csv ou ndjson"),
+    db: Session = Depends(get_db)
+):
+    """
+    Importa produtos em massa (corpo CSV com cabeçalho ou NDJSON).
+
+    Produtos são identificados pelo nome: novos são criados e existentes
+    atualizados. Campos ausentes mantêm o valor atual. Linhas inválidas são
+    ignoradas e relatadas em error_details (até 100).
+    """
+    with tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_BYTES) as body:
+        async for chunk in request.stream():
+            body.write(chunk)
+        body.seek(0)
+        return await run_in_threadpool(import_products, db, body, format.value)
+
+
+@router.post("/stock:adjust", response_model=StockAdjustResponse)
+def adjust_products_stock(batch: StockAdjustRequest, db: Session = Depends(get_db)):
+    """
+    Soma deltas ao estoque de vários produtos em uma única operação.
+
+    Ajustes concorrentes nunca se sobrescrevem. Sem **allow_negative**, produtos
+    que ficariam negativos não são alterados e aparecem em **rejected**.
+    """
+    try:
+        result = apply_stock_adjustments(
+            db,
+            [(item.product_id, item.delta) for item in batch.adjustments],
+            allow_negative=batch.allow_negative
+        )
+    except StockContentionException as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+
+    return {
+        "stock": [
+            {"product_id": product_id, "stock": stock}
+            for product_id, stock in sorted(result["stock"].items())
+        ],
+        "rejected": result["rejected"],
+        "missing": result["missing"],
+    }
+
+
 @router.post("/", response_model=ProductRead, status_code=status.HTTP_201_CREATED)
 def create_new_product(product: ProductCreate, db: Session = Depends(get_db)):
     """
@@ -0,0 +1,151 @@
+# app/api/routes/products_async.py
+# Variantes async (AsyncSession/asyncpg) das rotas de produtos, usadas no lugar
+# das síncronas quando settings.database_stack == "async"
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.core.database import get_async_db
+from app.schemas.product import (
+    ProductCreate,
+    ProductUpdate,
+    ProductRead,
+    ProductSearchResult,
+    ProductLookupRequest,
+    ProductLookupResponse,
+)
+from app.services.exceptions import BusinessRuleException
+from app.services.product_service import (
+    get_product_async,
+    get_products_async,
+    lookup_products_async,
+    search_products_async,
+    create_product,
+    update_product,
+    delete_product
+)
+from app.api.routes.products import MAX_QUERY_IDS
+
+router = APIRouter(
+    prefix="/products",
+    tags=["products"]
+)
+
+
+@router.get("/", response_model=List[ProductRead])
+async def read_products(
+    response: Response,
+    skip: int = Query(0, ge=0, description="Número de registros para pular"),
+    limit: int = Query(100, ge=1, le=200, description="Limite de registros por página"),
+    ids: Optional[List[int]] = Query(None, description="Busca estes IDs (ids=1&ids=2), na ordem informada"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Retorna uma lista de produtos com paginação.
+
+    Com **ids**, retorna apenas esses produtos, na ordem pedida, e lista os
+    não encontrados no header **X-Missing-Ids**.
+    """
+    if ids:
+        if len(ids) > MAX_QUERY_IDS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Informe no máximo {MAX_QUERY_IDS} IDs; use POST /products/lookup"
+            )
+        products, missing = await lookup_products_async(db, ids)
+        if missing:
+            response.headers["X-Missing-Ids"] = ",".join(str(product_id) for product_id in missing)
+        return products
+
+    return await get_products_async(db, skip=skip, limit=limit)
+
+
+@router.post("/lookup", response_model=ProductLookupResponse)
+async def lookup_catalog(lookup: ProductLookupRequest, db: AsyncSession = Depends(get_async_db)):
+    """
+    Busca vários produtos pelo ID de uma vez, na ordem pedida.
+    IDs inexistentes aparecem em **missing**.
+    """
+    products, missing = await lookup_products_async(db, lookup.ids)
+    return {"items": products, "missing": missing}
+
+
+@router.get("/search", response_model=List[ProductSearchResult])
+async def search_catalog(
+    response: Response,
+    q: str = Query(..., min_length=2, max_length=100, description="Texto buscado no nome e na descrição"),
+    limit: int = Query(20, ge=1, le=100, description="Limite de resultados por página"),
+    cursor: Optional[str] = Query(None, description="Cursor da próxima página (header X-Next-Cursor)"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Busca produtos por texto, tolerando erros de digitação no nome.
+    Resultados em ordem de relevância (campo rank).
+
+    - **X-Next-Cursor**: header com o cursor da próxima página (ausente na última)
+    """
+    try:
+        products, next_cursor = await search_products_async(db, q, limit=limit, cursor=cursor)
+    except BusinessRuleException as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return products
+
+
+@router.get("/{product_id}", response_model=ProductRead)
+async def read_product(product_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Retorna um produto específico pelo ID.
+    """
+    db_product = await get_product_async(db, product_id)
+    if db_product is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Produto não encontrado"
+        )
+    return db_product
+
+
+# Escritas: a mesma lógica das rotas síncronas, na sessão interna da AsyncSession
+
+@router.post("/", response_model=ProductRead, status_code=status.HTTP_201_CREATED)
+async def create_new_product(product: ProductCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Cria um novo produto.
+    """
+    return await db.run_sync(create_product, product)
+
+
+@router.put("/{product_id}", response_model=ProductRead)
+async def update_existing_product(
+    product_id: int,
+    product_update: ProductUpdate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Atualiza os dados de um produto existente.
+    """
+    updated_product = await db.run_sync(update_product, product_id, product_update)
+    if updated_product is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Produto não encontrado"
+        )
+    return updated_product
+
+
+@router.delete("/{product_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_existing_product(product_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Remove um produto do sistema.
+    """
+    success = await db.run_sync(delete_product, product_id)
+    if not success:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Produto não encontrado"
+        )
@@ -0,0 +1,76 @@
+from datetime import date
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from app.core.database import get_db
+from app.api.deps import get_current_user
+from app.core.models import User
+from app.schemas.report import DailySalesRead, ClientSalesRead, ProductSalesRead
+from app.services.sales_report_service import (
+    get_daily_sales,
+    get_client_sales,
+    get_product_sales,
+)
+
+# Relatórios servidos a partir dos agregados diários de vendas
+router = APIRouter(
+    prefix="/reports",
+    tags=["reports"]
+)
+
+
+def _validate_range(start_date: date, end_date: date) -> None:
+    if end_date < start_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Data final deve ser maior ou igual à data inicial"
+        )
+
+
+@router.get("/sales/daily", response_model=List[DailySalesRead])
+def read_daily_sales(
+    start_date: date = Query(..., description="Data inicial"),
+    end_date: date = Query(..., description="Data final"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Retorna receita, quantidade de pedidos e unidades vendidas por dia,
+    considerando apenas os pedidos do usuário autenticado.
+    """
+    _validate_range(start_date, end_date)
+    return get_daily_sales(db, current_user.id, start_date, end_date)
+
+
+@router.get("/sales/clients", response_model=List[ClientSalesRead])
+def read_client_sales(
+    start_date: date = Query(..., description="Data inicial"),
+    end_date: date = Query(..., description="Data final"),
+    client_id: Optional[int] = Query(None, description="Filtrar por ID do cliente"),
+    limit: int = Query(100, ge=1, le=1000, description="Limite de clientes retornados"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Retorna as vendas por cliente do usuário autenticado no intervalo, do
+    maior para o menor faturamento.
+    """
+    _validate_range(start_date, end_date)
+    return get_client_sales(db, current_user.id, start_date, end_date, client_id=client_id, limit=limit)
+
+
+@router.get("/sales/products", response_model=List[ProductSalesRead])
+def read_product_sales(
+    start_date: date = Query(..., description="Data inicial"),
+    end_date: date = Query(..., description="Data final"),
+    product_id: Optional[int] = Query(None, description="Filtrar por ID do produto"),
+    limit: int = Query(100, ge=1, le=1000, description="Limite de produtos retornados"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Retorna as vendas por produto nos pedidos do usuário autenticado no
+    intervalo, do maior para o menor faturamento.
+    """
+    _validate_range(start_date, end_date)
+    return get_product_sales(db, current_user.id, start_date, end_date, product_id=product_id, limit=limit)
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.schemas.user import UserCreate,UserRead
-from app.core.security import get_password_hash
+from app.core.password_hashing import PasswordHashingOverloaded, hash_password
 from app.core.models.user import User
 from app.core.dependencies import get_current_user
 
@@ -11,15 +12,33 @@ router = APIRouter(
     tags= ["users"]
 )
 
+
+def _email_exists(db: Session, email: str) -> bool:
+    return db.query(User).filter(User.email == email).first() is not None
+
+
+def _save_user(db: Session, new_user: User) -> User:
+    db.add(new_user)
+    db.commit()
+    db.refresh(new_user)
+    return new_user
+
+
 @router.post("/", response_model=UserRead)
-def create_user(user: UserCreate,db: Session = Depends(get_db)):
+async def create_user(user: UserCreate,db: Session = Depends(get_db)):
     # verifica se o email já existe
-    existing_user = db.query(User).filter(User.email == user.email).first()
-    if existing_user:
+    if await run_in_threadpool(_email_exists, db, user.email):
         raise HTTPException(status_code=400, detail= "Email já cadastrado")
     
-    # Cria usuário com senha hash
-    hashed_password = get_password_hash(user.password)
+    # Cria usuário com senha hash (bcrypt no pool de hash; 503 se sobrecarregado)
+    try:
+        hashed_password = await hash_password(user.password)
+    except PasswordHashingOverloaded as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"}
+        )
     new_user = User(
         username=user.username,
         email=user.email,
@@ -27,14 +46,10 @@ def create_user(user: UserCreate,db: Session = Depends(get_db)):
         password_hash=hashed_password
     )
 
-
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-    return new_user
+    return await run_in_threadpool(_save_user, db, new_user)
 
 @router.get("/me", response_model=UserRead)
 def read_current_user(
     current_user: User = Depends(get_current_user)
 ):
-    return current_user
\ No newline at end of file
+    return current_user
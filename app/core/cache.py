@@ -0,0 +1,94 @@
+# Cache LRU em memória com expiração por tempo, compartilhado pelos serviços
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Cache LRU limitado a maxsize entradas, com expiração (ttl em segundos).
+
+    Seguro para uso entre threads. Todas as operações são O(1) (get_many é
+    O(n) nas chaves pedidas). Mantém contadores de acertos e falhas.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: Hashable, now: float) -> Any:
+        # Deve ser chamado com o lock adquirido
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return _MISSING
+        value, expires_at = entry
+        if expires_at <= now:
+            del self._data[key]
+            self.misses += 1
+            return _MISSING
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            value = self._get(key, time.monotonic())
+        return default if value is _MISSING else value
+
+    def get_many(self, keys: Iterable[Hashable]) -> Dict[Hashable, Any]:
+        """Retorna {chave: valor} apenas para as chaves presentes e válidas."""
+        now = time.monotonic()
+        found = {}
+        with self._lock:
+            for key in keys:
+                value = self._get(key, now)
+                if value is not _MISSING:
+                    found[key] = value
+        return found
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Grava um valor; ttl sobrescreve o tempo de expiração padrão."""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def update(self, key: Hashable, function: Callable[[Any], Any]) -> None:
+        """
+        Substitui um valor presente e válido por function(valor), mantendo a
+        expiração. Chaves ausentes continuam ausentes; não conta acerto nem falha.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                self._data[key] = (function(entry[0]), entry[1])
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def __len__(self) -> int:
+        return len(self._data)
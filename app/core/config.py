@@ -18,6 +18,72 @@ class Settings(BaseSettings):
     secret_key: str = os.environ.get("SECRET_KEY", secrets.token_urlsafe(32))
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 60
+    refresh_token_expire_days: int = 30
+
+    # Pilha de acesso ao banco das rotas de leitura e escrita de produtos,
+    # clientes e pedidos: "sync" (psycopg2, rotas no threadpool) ou "async"
+    # (asyncpg, rotas no event loop). O pool assíncrono é compartilhado por
+    # todas as requisições do worker.
+    database_stack: str = "sync"
+    database_async_pool_size: int = 20
+    database_async_max_overflow: int = 10
+
+    # Revogação de tokens: filtro de Bloom por processo, relido de revoked_tokens
+    # a cada token_revocation_sync_seconds e recriado (sem os expirados) a cada
+    # token_revocation_rebuild_seconds
+    token_revocation_capacity: int = 100000
+    token_revocation_error_rate: float = 0.001
+    token_revocation_sync_seconds: int = 5
+    token_revocation_rebuild_seconds: int = 3600
+
+    # Cache de tokens validados e de usuários autenticados (por processo)
+    auth_token_cache_size: int = 10000
+    auth_user_cache_size: int = 10000
+    auth_cache_ttl_seconds: int = 60
+
+    # Hash de senhas: custo do bcrypt (alterações são aplicadas no próximo login
+    # de cada usuário), threads dedicadas e requisições em espera antes do 503
+    password_bcrypt_rounds: int = 12
+    password_hash_workers: int = 2
+    password_hash_queue_limit: int = 32
+
+    # Rate limiting das rotas de autenticação e escrita (app/core/rate_limit.py).
+    # backend "memory" limita cada worker; "redis" compartilha os limites.
+    rate_limit_enabled: bool = True
+    rate_limit_backend: str = "memory"
+    rate_limit_redis_url: str = "redis://localhost:6379/0"
+    rate_limit_memory_size: int = 100000
+    # Só habilitar atrás de um proxy que sobrescreve o X-Forwarded-For
+    rate_limit_trust_forwarded_for: bool = False
+
+    # Tempo máximo de espera pelo bloqueio de linhas de produto ao reservar estoque
+    stock_lock_timeout_ms: int = 2000
+
+    # Idempotência do POST /orders (header Idempotency-Key)
+    idempotency_ttl_hours: int = 24
+    idempotency_cache_size: int = 10000
+    idempotency_cache_ttl_seconds: int = 300
+    idempotency_wait_seconds: float = 10.0
+    # Validade de uma chave em processamento, renovada enquanto a requisição roda:
+    # se o worker morrer antes de concluir, a chave é liberada depois deste prazo
+    idempotency_lease_seconds: int = 30
+
+    # Partições mensais de orders/order_items criadas à frente do mês atual
+    order_partitions_months_ahead: int = 3
+
+    # Cache do catálogo de produtos (por processo; outros workers veem
+    # alterações em até product_cache_ttl_seconds)
+    product_cache_size: int = 50000
+    product_cache_pages: int = 512
+    product_cache_ttl_seconds: int = 60
+
+    # Linhas gravadas por transação na importação em massa de clientes
+    client_import_chunk_size: int = 5000
+
+    # Arquivamento de pedidos entregues/cancelados antigos em Parquet
+    order_archive_dir: str = os.path.normpath(os.path.join(BASE_DIR, "..", "..", "archive", "orders"))
+    order_archive_retention_days: int = 365
+    order_archive_batch_size: int = 5000
 
     class Config:
         env_file = os.path.join(BASE_DIR, ".env")
@@ -1,30 +1,78 @@
+import time
+from typing import Optional, Tuple
+
 from fastapi import Depends, HTTPException,status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
 
-from app.core.database import get_db
-from app.core.security import verify_token
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import get_async_db, get_db
+from app.core.security import REFRESH_TOKEN, verify_token
+from app.core.token_revocation import is_token_revoked, is_token_revoked_async
 from app.core.models.user import User
+from app.schemas.user import UserRead
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+# Caches por processo: token já validado -> (id do usuário, jti), e id -> dados do usuário.
+# Tokens expiram do cache junto com o próprio token.
+_tokens = TTLCache(settings.auth_token_cache_size, settings.auth_cache_ttl_seconds)
+_principals = TTLCache(settings.auth_user_cache_size, settings.auth_cache_ttl_seconds)
+
+_PENDING_INVALIDATIONS = "pending_user_invalidations"
+
+
+def _pop_pending(session: Session) -> None:
+    for user_id in session.info.pop(_PENDING_INVALIDATIONS, ()):
+        _principals.pop(user_id)
+
+
+def invalidate_user(user_id: int, db: Optional[Session] = None) -> None:
+    """
+    Remove o usuário do cache de autenticação. Com db, repete a remoção após o
+    commit da sessão, descartando valores relidos por outras requisições antes dele.
+    """
+    _principals.pop(user_id)
+    if db is not None:
+        pending = db.info.setdefault(_PENDING_INVALIDATIONS, set())
+        if not pending:
+            event.listen(db, "after_commit", _pop_pending, once=True)
+        pending.add(user_id)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _user_changed(mapper, connection, target: User) -> None:
+    # Qualquer alteração de usuário pelo ORM invalida o cache deste processo
+    invalidate_user(target.id, object_session(target))
+
+
+def auth_cache_stats() -> dict:
+    """Tamanho, acertos e falhas dos caches de autenticação."""
+    return {"tokens": _tokens.stats(), "users": _principals.stats()}
+
+
+def _token_claims(token: str) -> Tuple[int, Optional[str]]:
+    # Decodifica o token de acesso (ou usa o resultado em cache) e retorna (id do usuário, jti)
+    claims = _tokens.get(token)
+    if claims is not None:
+        return claims
 
-def get_current_user(
-        token: str = Depends(oauth2_scheme),
-        db: Session = Depends(get_db)
-) -> User:
-    
     payload = verify_token(token)
 
-    if payload is None:
+    # Refresh tokens só servem para /auth/refresh
+    if payload is None or payload.get("type") == REFRESH_TOKEN:
         raise HTTPException(
             status_code = status.HTTP_401_UNAUTHORIZED,
             detail="Token inválido ou expirado",
             headers= {"WWW-Authenticate":"Bearer"},
-          
+
         )
-    
+
     user_id = payload.get("sub")
 
     if user_id is None:
@@ -33,11 +81,86 @@ def get_current_user(
             detail= "Token sem identificação do usuário",
 
         )
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    claims = (int(user_id), payload.get("jti"))
+
+    ttl = settings.auth_cache_ttl_seconds
+    if payload.get("exp") is not None:
+        ttl = min(ttl, payload["exp"] - time.time())
+    if ttl > 0:
+        _tokens.set(token, claims, ttl=ttl)
+    return claims
+
+
+def peek_token_user_id(token: str) -> Optional[int]:
+    """
+    Id do usuário de um token válido, ou None. Usa o mesmo cache de tokens de
+    get_current_user e não consulta o banco (usado pelo rate limiting).
+    """
+    try:
+        return _token_claims(token)[0]
+    except HTTPException:
+        return None
 
+
+def _revoked() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Token revogado",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _cache_principal(user_id: int, user: Optional[User]) -> UserRead:
+    # Converte o usuário lido do banco em UserRead e guarda no cache
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail= "Usuário não encontrado",
         )
-    return user
\ No newline at end of file
+    principal = UserRead.model_validate(user)
+    _principals.set(user_id, principal)
+    return principal
+
+
+def get_current_user(
+        token: str = Depends(oauth2_scheme),
+        db: Session = Depends(get_db)
+) -> UserRead:
+    """
+    Usuário autenticado pelo token Bearer, como UserRead.
+
+    Token e usuário vêm dos caches quando possível: em um acerto a requisição
+    não decodifica o JWT nem consulta o banco. A revogação (jti) é conferida no
+    filtro em memória de app.core.token_revocation.
+    """
+    user_id, jti = _token_claims(token)
+
+    # Tokens emitidos antes do jti não são revogáveis e expiram sozinhos
+    if jti is not None and is_token_revoked(db, jti):
+        raise _revoked()
+
+    principal = _principals.get(user_id)
+    if principal is not None:
+        return principal
+
+    user = db.query(User).filter(User.id == user_id).first()
+    return _cache_principal(user_id, user)
+
+
+async def get_current_user_async(
+        token: str = Depends(oauth2_scheme),
+        db: AsyncSession = Depends(get_async_db)
+) -> UserRead:
+    """get_current_user para rotas async: mesmos caches, consultas pela AsyncSession."""
+    user_id, jti = _token_claims(token)
+
+    if jti is not None and await is_token_revoked_async(db, jti):
+        raise _revoked()
+
+    principal = _principals.get(user_id)
+    if principal is not None:
+        return principal
+
+    user = await db.get(User, user_id)
+    return _cache_principal(user_id, user)
+
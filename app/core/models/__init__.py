@@ -3,4 +3,9 @@ from app.core.models.product import Product
 from app.core.models.order import Order
 from app.core.models.client import Client
 from app.core.models.order import OrderStatus
-from app.core.models.order_item import OrderItem
\ No newline at end of file
+from app.core.models.order_item import OrderItem
+from app.core.models.sales_rollup import DailySales, DailyClientSales, DailyProductSales
+from app.core.models.idempotency_key import IdempotencyKey
+from app.core.models.archived_order import ArchivedOrder
+from app.core.models.client_order_stats import ClientOrderStats
+from app.core.models.revoked_token import RevokedToken
@@ -0,0 +1,24 @@
+# Define modelo ArchivedOrder: índice dos pedidos movidos para os arquivos Parquet
+from datetime import datetime
+from typing import Optional
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, Integer, Float, DateTime, func
+from sqlalchemy.dialects.postgresql import JSONB
+from app.core.models.base import Base
+
+
+class ArchivedOrder(Base):
+    __tablename__ = 'archived_orders'
+
+    order_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    owner_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    client_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    # Dados de que os resumos derivados precisam (client_order_stats e agregados
+    # de vendas), para que uma reconstrução não dependa dos arquivos Parquet
+    status: Mapped[str] = mapped_column(String(20), nullable=False)
+    total: Mapped[float] = mapped_column(Float, nullable=False)
+    units: Mapped[int] = mapped_column(Integer, nullable=False) # soma das quantidades dos itens
+    products: Mapped[dict] = mapped_column(JSONB, nullable=False) # {product_id: [quantidade, subtotal]}
+    file: Mapped[str] = mapped_column(String(255), nullable=False) # relativo a order_archive_dir ou absoluto (fora dele)
+    archived_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
@@ -2,7 +2,7 @@
 from datetime import datetime
 from typing import Optional
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import String, Integer, DateTime, Boolean, func
+from sqlalchemy import String, Integer, DateTime, Boolean, ForeignKey, Index, func
 from app.core.models.base import Base
 
 
@@ -15,4 +15,26 @@ class Client(Base):
     phone: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
     address: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
-    active: Mapped[bool] = mapped_column(Boolean, default=True)
\ No newline at end of file
+    active: Mapped[bool] = mapped_column(Boolean, default=True)
+    user_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey('users.id'), nullable=True, index=True)
+
+
+# Email único sem diferenciar maiúsculas e listagem paginada de clientes ativos
+Index('ix_clients_email_lower', func.lower(Client.email), unique=True)
+Index('ix_clients_active_id', Client.id, postgresql_where=Client.active)
+
+
+# Busca por prefixo (LIKE 'abc%', text_pattern_ops) e por trecho (LIKE '%abc%',
+# trigramas), somente entre clientes ativos
+Index('ix_clients_name_prefix', func.lower(Client.name).label('name_lower'),
+      postgresql_ops={'name_lower': 'text_pattern_ops'}, postgresql_where=Client.active)
+Index('ix_clients_email_prefix', func.lower(Client.email).label('email_lower'),
+      postgresql_ops={'email_lower': 'text_pattern_ops'}, postgresql_where=Client.active)
+Index('ix_clients_phone_prefix', Client.phone,
+      postgresql_ops={'phone': 'text_pattern_ops'}, postgresql_where=Client.active)
+Index('ix_clients_name_trgm', func.lower(Client.name).label('name_lower'), postgresql_using='gin',
+      postgresql_ops={'name_lower': 'gin_trgm_ops'}, postgresql_where=Client.active)
+Index('ix_clients_email_trgm', func.lower(Client.email).label('email_lower'), postgresql_using='gin',
+      postgresql_ops={'email_lower': 'gin_trgm_ops'}, postgresql_where=Client.active)
+Index('ix_clients_phone_trgm', Client.phone, postgresql_using='gin',
+      postgresql_ops={'phone': 'gin_trgm_ops'}, postgresql_where=Client.active)
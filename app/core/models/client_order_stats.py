@@ -0,0 +1,22 @@
+# Define o resumo de pedidos por cliente mantido incrementalmente pelo OrderService
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey
+from app.core.models.base import Base
+from app.core.models.order import OrderStatus
+
+# Coluna de contagem de cada status do pedido
+STATUS_COUNT_COLUMNS = {status.value: f"{status.value}_count" for status in OrderStatus}
+
+
+class ClientOrderStats(Base):
+    __tablename__ = 'client_order_stats'
+
+    client_id = Column(Integer, ForeignKey('clients.id', ondelete='CASCADE'), primary_key=True)
+    order_count = Column(Integer, nullable=False, default=0) # Todos os pedidos, inclusive cancelados
+    lifetime_spend = Column(Float, nullable=False, default=0.0) # Total dos pedidos não cancelados
+    last_order_at = Column(DateTime, nullable=True) # Criação do pedido mais recente
+    pending_count = Column(Integer, nullable=False, default=0)
+    confirmed_count = Column(Integer, nullable=False, default=0)
+    processing_count = Column(Integer, nullable=False, default=0)
+    shipped_count = Column(Integer, nullable=False, default=0)
+    delivered_count = Column(Integer, nullable=False, default=0)
+    cancelled_count = Column(Integer, nullable=False, default=0)
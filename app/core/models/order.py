@@ -1,5 +1,5 @@
 from app.core.models.base import Base
-from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, func, String
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, func, String, Index
 from sqlalchemy.orm import relationship
 import enum
 
@@ -15,12 +15,30 @@ class OrderStatus(enum.Enum):
 class Order(Base):
     __tablename__ = 'orders'
 
-    id = Column(Integer, primary_key=True)
+    # Tabela particionada por mês em created_at: a chave primária inclui a
+    # coluna de particionamento, e UPDATE/DELETE do ORM atingem uma só partição
+    id = Column(Integer, primary_key=True, autoincrement=True)
     client_id = Column(Integer, ForeignKey('clients.id'), nullable=False)
+    owner_id = Column(Integer, ForeignKey('users.id'), nullable=True)  # cópia de clients.user_id
     status = Column(String(20), nullable=False, default=OrderStatus.PENDING.value)
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     total = Column(Float, nullable=False, default=0.0)
-    created_at = Column(DateTime, server_default=func.now())
+    created_at = Column(DateTime, primary_key=True, server_default=func.now())
+
+    __table_args__ = (
+        # Listagem por dono em ordem de criação (paginação por cursor)
+        Index("ix_orders_owner_created_id", "owner_id", created_at.desc(), id.desc()),
+        Index("ix_orders_owner_status_created_id", "owner_id", "status", created_at.desc(), id.desc()),
+        Index("ix_orders_client_created_id", "client_id", created_at.desc(), id.desc()),
+        Index("ix_orders_created_at", "created_at"),
+        # get_order_by_id e filtros por id sem a data de criação
+        Index("ix_orders_id", "id"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+    # eager_defaults: created_at volta no RETURNING do INSERT, necessário para
+    # gravar order_items.order_created_at sem outra consulta
+    __mapper_args__ = {"eager_defaults": True}
 
     client = relationship("Client", backref="orders")
     items = relationship("OrderItem", back_populates="order", cascade="all, delete-orphan")
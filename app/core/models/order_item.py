@@ -1,17 +1,29 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, Float, ForeignKey
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, ForeignKeyConstraint
 from sqlalchemy.orm import relationship
 from app.core.models.base import Base
 
 class OrderItem(Base):
     __tablename__ = 'order_items'
 
-    id = Column(Integer, primary_key=True)
-    order_id = Column(Integer, ForeignKey('orders.id'), nullable=False)
-    product_id = Column(Integer, ForeignKey('products.id'), nullable=False)
+    # Particionada como orders, pela data de criação do pedido: os itens ficam
+    # na partição do mesmo mês que o pedido
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    order_id = Column(Integer, nullable=False, index=True)
+    order_created_at = Column(DateTime, primary_key=True)
+    product_id = Column(Integer, ForeignKey('products.id'), nullable=False, index=True)
     quantity = Column(Integer, nullable=False, default=1)
     unit_price = Column(Float, nullable=False)  # preço unitário no momento da compra
     subtotal = Column(Float, nullable=False)    # quantity x unit_price
 
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["order_id", "order_created_at"],
+            ["orders.id", "orders.created_at"],
+            ondelete="CASCADE",
+        ),
+        {"postgresql_partition_by": "RANGE (order_created_at)"},
+    )
+
     order = relationship("Order", back_populates="items")
     product = relationship("Product")
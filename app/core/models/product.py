@@ -1,13 +1,35 @@
 # Define modelo Product com colunas da tabela 'products'
 from app.core.models.base import Base
-from sqlalchemy import Column, Integer, String, DateTime,func,Boolean,Float
+from sqlalchemy import Column, Integer, String, DateTime,func,Boolean,Float,Computed,Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
 
 class Product(Base):
     __tablename__ = 'products'
 
     id = Column(Integer, primary_key=True, index=True) # ID único do produto
-    name = Column(String(100), nullable=False) # Nome do produto
+    name = Column(String(100), nullable=False, index=True, unique=True) # Nome do produto (único)
     description = Column(String(255), nullable=True) # Descrição opcional
     price =Column(Float,nullable=False) # Preço do produto
     stock = Column(Integer, default=0) # Quantidade em estoque
-    created_at = Column(DateTime, server_default=func.now()) # Data de criação
\ No newline at end of file
+    created_at = Column(DateTime, server_default=func.now()) # Data de criação
+    # Vetor de busca textual gerado pelo banco (nome com peso A, descrição com peso B);
+    # deferred: não é carregado junto com o produto
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('portuguese', coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('portuguese', coalesce(description, '')), 'B')",
+            persisted=True
+        )
+    ))
+
+    __table_args__ = (
+        Index("ix_products_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_products_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"}
+        ),
+    )
@@ -0,0 +1,14 @@
+# Define modelo RevokedToken: tokens JWT revogados (logout ou rotação do refresh token)
+from datetime import datetime
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, Integer, DateTime, ForeignKey, func
+from app.core.models.base import Base
+
+
+class RevokedToken(Base):
+    __tablename__ = 'revoked_tokens'
+
+    jti: Mapped[str] = mapped_column(String(64), primary_key=True) # claim jti do token
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey('users.id', ondelete="CASCADE"), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True) # exp do token
+    revoked_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False, index=True)
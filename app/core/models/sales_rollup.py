@@ -0,0 +1,43 @@
+# Define os agregados diários de vendas mantidos incrementalmente pelo OrderService
+from sqlalchemy import Column, Integer, Float, Date, SmallInteger
+from app.core.models.base import Base
+
+# Agregados por dono (orders.owner_id): cada usuário só vê as próprias vendas.
+# Cada dia é dividido em faixas (order_id % ROLLUP_BUCKETS) para que pedidos
+# simultâneos não disputem sempre a mesma linha do agregado
+ROLLUP_BUCKETS = 16
+
+
+class DailySales(Base):
+    __tablename__ = 'daily_sales'
+
+    owner_id = Column(Integer, primary_key=True) # Dono dos pedidos (users.id)
+    day = Column(Date, primary_key=True) # Dia do pedido
+    bucket = Column(SmallInteger, primary_key=True) # Faixa do agregado
+    revenue = Column(Float, nullable=False, default=0.0) # Receita (pedidos não cancelados)
+    order_count = Column(Integer, nullable=False, default=0) # Quantidade de pedidos
+    units_sold = Column(Integer, nullable=False, default=0) # Unidades vendidas
+
+
+class DailyClientSales(Base):
+    __tablename__ = 'daily_client_sales'
+
+    owner_id = Column(Integer, primary_key=True)
+    day = Column(Date, primary_key=True)
+    client_id = Column(Integer, primary_key=True)
+    bucket = Column(SmallInteger, primary_key=True)
+    revenue = Column(Float, nullable=False, default=0.0)
+    order_count = Column(Integer, nullable=False, default=0)
+    units_sold = Column(Integer, nullable=False, default=0)
+
+
+class DailyProductSales(Base):
+    __tablename__ = 'daily_product_sales'
+
+    owner_id = Column(Integer, primary_key=True)
+    day = Column(Date, primary_key=True)
+    product_id = Column(Integer, primary_key=True)
+    bucket = Column(SmallInteger, primary_key=True)
+    revenue = Column(Float, nullable=False, default=0.0)
+    order_count = Column(Integer, nullable=False, default=0)
+    units_sold = Column(Integer, nullable=False, default=0)
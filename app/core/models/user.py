@@ -3,12 +3,9 @@ from datetime import datetime
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy import String, Integer, DateTime, func
 from app.core.models.base import Base
-from passlib.context import CryptContext
+from app.core.password_hashing import pwd_context
 from typing import Optional
 
-# Configuração do hash de senha
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 class User(Base):
     """
     Modelo User representando a tabela 'users'.
@@ -0,0 +1,125 @@
+# Hash de senhas (bcrypt) em um pool de threads próprio e limitado
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Tuple, TypeVar
+
+from passlib.context import CryptContext
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+# Custo fixo: hashes com outro número de rounds são refeitos no próximo login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.password_bcrypt_rounds,
+    bcrypt__min_rounds=settings.password_bcrypt_rounds,
+    bcrypt__max_rounds=settings.password_bcrypt_rounds,
+)
+
+# O bcrypt libera o GIL durante o cálculo: threads bastam para usar vários núcleos
+_executor = ThreadPoolExecutor(
+    max_workers=settings.password_hash_workers,
+    thread_name_prefix="password-hash"
+)
+
+
+class PasswordHashingOverloaded(Exception):
+    """Fila do pool de hash cheia: a requisição deve ser recusada (503)."""
+
+
+class _Metrics:
+    """Contadores do pool; tempos em segundos."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+        self.hash_time_total = 0.0
+        self.hash_time_max = 0.0
+
+    def acquire(self) -> bool:
+        # Reserva uma vaga (em execução ou na fila); False se o limite foi atingido
+        limit = settings.password_hash_workers + settings.password_hash_queue_limit
+        with self._lock:
+            if self.in_flight >= limit:
+                self.rejected += 1
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def record(self, queue_wait: float, hash_time: float) -> None:
+        with self._lock:
+            self.completed += 1
+            self.queue_wait_total += queue_wait
+            self.queue_wait_max = max(self.queue_wait_max, queue_wait)
+            self.hash_time_total += hash_time
+            self.hash_time_max = max(self.hash_time_max, hash_time)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            completed = self.completed or 1
+            return {
+                "workers": settings.password_hash_workers,
+                "queue_limit": settings.password_hash_queue_limit,
+                "rounds": settings.password_bcrypt_rounds,
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "queue_wait_avg_ms": round(self.queue_wait_total / completed * 1000, 2),
+                "queue_wait_max_ms": round(self.queue_wait_max * 1000, 2),
+                "hash_time_avg_ms": round(self.hash_time_total / completed * 1000, 2),
+                "hash_time_max_ms": round(self.hash_time_max * 1000, 2),
+            }
+
+
+_metrics = _Metrics()
+
+
+async def _run(function: Callable[..., T], *args) -> T:
+    # Executa no pool de hash, recusando de imediato quando a fila está cheia
+    if not _metrics.acquire():
+        raise PasswordHashingOverloaded("Muitas requisições de autenticação, tente novamente")
+
+    submitted = time.perf_counter()
+
+    def timed() -> T:
+        started = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            _metrics.record(started - submitted, time.perf_counter() - started)
+
+    # Vaga liberada quando o job termina ou é cancelado ainda na fila (requisição
+    # cancelada): um job cancelado na fila nunca executa timed()
+    future = _executor.submit(timed)
+    future.add_done_callback(lambda _: _metrics.release())
+    return await asyncio.wrap_future(future)
+
+
+async def hash_password(password: str) -> str:
+    """Gera o hash bcrypt da senha no pool de hash."""
+    return await _run(pwd_context.hash, password)
+
+
+async def verify_and_update_password(password: str, password_hash: str) -> Tuple[bool, Optional[str]]:
+    """
+    Confere a senha no pool de hash. Retorna (válida, novo hash): o novo hash
+    vem preenchido quando a senha confere e o hash atual usa outro custo.
+    """
+    return await _run(pwd_context.verify_and_update, password, password_hash)
+
+
+def password_hashing_stats() -> dict:
+    """Ocupação do pool de hash, recusas e tempos de fila e de cálculo."""
+    return _metrics.snapshot()
@@ -0,0 +1,218 @@
+# Rate limiting por token bucket (por IP ou por usuário), aplicado antes das rotas
+import math
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.dependencies import peek_token_user_id
+from app.core.logger_config import logger
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:  # dependência opcional: só o backend compartilhado precisa dela
+    redis_asyncio = None
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """
+    Limite de uma rota: per_minute requisições por minuto em média, com rajadas
+    de até burst. key="ip" conta por endereço de origem; key="user" conta por
+    usuário autenticado (requisições sem token válido contam pelo IP).
+    """
+    name: str
+    method: str
+    path: str
+    key: str
+    per_minute: float
+    burst: int
+
+    @property
+    def rate(self) -> float:
+        # Fichas devolvidas ao balde por segundo
+        return self.per_minute / 60.0
+
+
+# Rotas de autenticação (cada tentativa custa um bcrypt) e de escrita
+DEFAULT_RULES = [
+    RateLimitRule("login-ip", "POST", "/auth/login", "ip", per_minute=10, burst=10),
+    RateLimitRule("refresh-ip", "POST", "/auth/refresh", "ip", per_minute=30, burst=10),
+    RateLimitRule("signup-ip", "POST", "/users", "ip", per_minute=5, burst=5),
+    RateLimitRule("orders-user", "POST", "/orders", "user", per_minute=60, burst=30),
+    RateLimitRule("orders-ip", "POST", "/orders", "ip", per_minute=300, burst=100),
+    RateLimitRule("order-batches-user", "POST", "/orders/batch", "user", per_minute=10, burst=5),
+    RateLimitRule("stock-adjust-user", "POST", "/products/stock:adjust", "user", per_minute=120, burst=60),
+    RateLimitRule("product-import-user", "POST", "/products/import", "user", per_minute=5, burst=2),
+    RateLimitRule("client-import-user", "POST", "/clients/import", "user", per_minute=5, burst=2),
+]
+
+
+# Balde consultado em uma requisição: (chave, fichas por segundo, rajada)
+Bucket = Tuple[str, float, int]
+
+
+class RateLimitBackend(ABC):
+    """
+    Armazena os baldes. take consome uma ficha de cada balde informado, só se
+    todos tiverem ficha (tudo ou nada): retorna (permitido, segundos até a próxima).
+    """
+
+    @abstractmethod
+    async def take(self, buckets: Sequence[Bucket]) -> Tuple[bool, float]:
+        ...
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """
+    Baldes na memória do processo (O(1) por balde). Cada balde expira
+    quando estaria cheio de novo, e o total é limitado a maxsize (LRU): um
+    balde descartado equivale a um balde cheio. Com vários workers, cada um
+    aplica o limite sozinho.
+    """
+
+    def __init__(self, maxsize: int):
+        self._buckets = TTLCache(maxsize, ttl=60)
+
+    async def take(self, buckets: Sequence[Bucket]) -> Tuple[bool, float]:
+        # Sem await entre a leitura e a gravação: atômico no event loop
+        now = time.monotonic()
+        levels = []
+        wait = 0.0
+        for key, rate, burst in buckets:
+            tokens, updated = self._buckets.get(key, (float(burst), now))
+            tokens = min(float(burst), tokens + (now - updated) * rate)
+            levels.append(tokens)
+            if tokens < 1:
+                wait = max(wait, (1 - tokens) / rate)
+
+        allowed = wait == 0.0
+        for (key, rate, burst), tokens in zip(buckets, levels):
+            if allowed:
+                tokens -= 1
+            self._buckets.set(key, (tokens, now), ttl=(burst - tokens) / rate)
+        return allowed, wait
+
+
+# Mesmo algoritmo no Redis, atômico e com o relógio do servidor compartilhado.
+# KEYS: os baldes; ARGV: rate e burst de cada balde, na mesma ordem
+TOKEN_BUCKET_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local levels = {}
+local wait = 0
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[2 * i - 1])
+    local burst = tonumber(ARGV[2 * i])
+    local bucket = redis.call('HMGET', key, 'tokens', 'updated')
+    local tokens = tonumber(bucket[1]) or burst
+    local updated = tonumber(bucket[2]) or now
+    tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+    levels[i] = tokens
+    if tokens < 1 then
+        wait = math.max(wait, (1 - tokens) / rate)
+    end
+end
+local allowed = 0
+if wait == 0 then
+    allowed = 1
+end
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[2 * i - 1])
+    local burst = tonumber(ARGV[2 * i])
+    local tokens = levels[i] - allowed
+    redis.call('HSET', key, 'tokens', tostring(tokens), 'updated', tostring(now))
+    redis.call('PEXPIRE', key, math.ceil((burst - tokens) / rate * 1000) + 1000)
+end
+return {allowed, tostring(wait)}
+"""
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """Baldes no Redis, compartilhados por todos os workers."""
+
+    def __init__(self, url: str):
+        if redis_asyncio is None:
+            raise RuntimeError("Rate limiting com Redis indisponível: instale o pacote redis")
+        self._client = redis_asyncio.from_url(url)
+        self._script = self._client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    async def take(self, buckets: Sequence[Bucket]) -> Tuple[bool, float]:
+        allowed, wait = await self._script(
+            keys=[f"ratelimit:{key}" for key, _, _ in buckets],
+            args=[value for _, rate, burst in buckets for value in (rate, burst)]
+        )
+        return bool(allowed), float(wait)
+
+
+def create_backend() -> RateLimitBackend:
+    """Backend escolhido em settings.rate_limit_backend (memory ou redis)."""
+    if settings.rate_limit_backend == "redis":
+        return RedisRateLimitBackend(settings.rate_limit_redis_url)
+    return MemoryRateLimitBackend(settings.rate_limit_memory_size)
+
+
+class RateLimitMiddleware:
+    """
+    Middleware ASGI: recusa com 429 (e Retry-After) as requisições acima do
+    limite antes de chegarem à rota, sem consultar o banco nem rodar o bcrypt.
+    O usuário vem do cache de tokens de get_current_user.
+    """
+
+    def __init__(self, app: ASGIApp, rules: List[RateLimitRule], backend: Optional[RateLimitBackend] = None):
+        self.app = app
+        self.backend = backend or create_backend()
+        self.rules = {}
+        for rule in rules:
+            self.rules.setdefault((rule.method, rule.path.rstrip("/")), []).append(rule)
+
+    def _client_ip(self, scope: Scope, headers: dict) -> str:
+        if settings.rate_limit_trust_forwarded_for and b"x-forwarded-for" in headers:
+            return headers[b"x-forwarded-for"].decode("latin-1").split(",")[0].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    def _user_id(self, headers: dict) -> Optional[int]:
+        scheme, _, token = headers.get(b"authorization", b"").decode("latin-1").partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return None
+        return peek_token_user_id(token.strip())
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        rules = self.rules.get((scope["method"], scope["path"].rstrip("/")))
+        if rules:
+            headers = dict(scope["headers"])
+            buckets = []
+            for rule in rules:
+                user_id = self._user_id(headers) if rule.key == "user" else None
+                subject = f"user:{user_id}" if user_id is not None else f"ip:{self._client_ip(scope, headers)}"
+                buckets.append((f"{rule.name}:{subject}", rule.rate, rule.burst))
+
+            # Todas as regras da rota em uma chamada: uma requisição recusada por
+            # uma regra não gasta fichas das outras
+            try:
+                allowed, retry_after = await self.backend.take(buckets)
+            except Exception as exc:
+                # Falha do backend compartilhado não derruba a API: a requisição segue
+                logger.warning(f"Rate limiting indisponível: {exc}")
+                allowed = True
+
+            if not allowed:
+                response = JSONResponse(
+                    {"detail": "Muitas requisições, tente novamente em instantes"},
+                    status_code=429,
+                    headers={"Retry-After": str(math.ceil(retry_after))}
+                )
+                await response(scope, receive, send)
+                return
+
+        await self.app(scope, receive, send)
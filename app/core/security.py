@@ -1,15 +1,14 @@
-from passlib.context import CryptContext
+import uuid
 from datetime import datetime, timedelta
 from typing import Optional
 
 from jose import JWTError, jwt
 
 from app.core.config import settings
+from app.core.password_hashing import pwd_context
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-
+# Versões síncronas, para scripts; as rotas usam app.core.password_hashing
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
@@ -18,16 +17,19 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
-def create_access_token(
-    data: dict,
-    expires_delta: Optional[timedelta] = None
-) -> str:
+# Tipos de token (claim "type"): só o access autentica as rotas
+ACCESS_TOKEN = "access"
+REFRESH_TOKEN = "refresh"
+
+
+def _encode_token(data: dict, token_type: str, expires_delta: timedelta) -> str:
     to_encode = data.copy()
-    expire = datetime.utcnow() + (
-        expires_delta
-        or timedelta(minutes=settings.access_token_expire_minutes)
-    )
-    to_encode.update({"exp": expire})
+    # jti identifica o token para revogação (logout, rotação do refresh token)
+    to_encode.update({
+        "exp": datetime.utcnow() + expires_delta,
+        "jti": uuid.uuid4().hex,
+        "type": token_type,
+    })
 
     encoded_jwt = jwt.encode(
         to_encode,
@@ -37,6 +39,28 @@ def create_access_token(
     return encoded_jwt
 
 
+def create_access_token(
+    data: dict,
+    expires_delta: Optional[timedelta] = None
+) -> str:
+    return _encode_token(
+        data,
+        ACCESS_TOKEN,
+        expires_delta or timedelta(minutes=settings.access_token_expire_minutes)
+    )
+
+
+def create_refresh_token(
+    data: dict,
+    expires_delta: Optional[timedelta] = None
+) -> str:
+    return _encode_token(
+        data,
+        REFRESH_TOKEN,
+        expires_delta or timedelta(days=settings.refresh_token_expire_days)
+    )
+
+
 def verify_token(token: str) -> Optional[dict]:
     try:
         payload = jwt.decode(
@@ -0,0 +1,224 @@
+# Revogação de tokens JWT por jti: filtro de Bloom em memória sincronizado com revoked_tokens
+import asyncio
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Iterable, Optional, Set, Tuple
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.models.revoked_token import RevokedToken
+
+# Revogações gravadas por transações longas podem ter revoked_at anterior à
+# última sincronização: cada leitura incremental volta esta margem no tempo
+SYNC_OVERLAP = timedelta(seconds=60)
+
+# jti revogados já confirmados no banco mantidos em memória
+CONFIRMED_CACHE_SIZE = 10000
+
+
+class BloomFilter:
+    """
+    Filtro de Bloom: sem falsos negativos, com falsos positivos perto de
+    error_rate enquanto tiver até capacity itens. Não permite remoção.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray(math.ceil(self.size / 8))
+
+    def _positions(self, item: str):
+        # Hash duplo (Kirsch-Mitzenmacher): k posições a partir de um único digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (first + i * second) % self.size
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class _RevocationState:
+    """Filtro do processo e marcas da última sincronização com o banco."""
+
+    def __init__(self):
+        self.filter = BloomFilter(settings.token_revocation_capacity, settings.token_revocation_error_rate)
+        self.watermark: Optional[datetime] = None  # maior revoked_at já lido
+        self.synced_at: Optional[float] = None
+        self.rebuilt_at: Optional[float] = None
+        self.lock = threading.Lock()
+        self.filter_hits = 0
+        self.false_positives = 0
+
+
+_state = _RevocationState()
+# jti confirmados no banco: tokens revogados reapresentados não geram nova consulta
+_confirmed = TTLCache(CONFIRMED_CACHE_SIZE, settings.refresh_token_expire_days * 86400)
+
+
+def _rebuild(db: Session) -> None:
+    # Recria o filtro com os tokens revogados ainda não expirados (descarta os vencidos)
+    rows = db.execute(
+        select(RevokedToken.jti, RevokedToken.revoked_at)
+        .where(RevokedToken.expires_at > datetime.utcnow())
+    ).all()
+    bloom = BloomFilter(
+        max(settings.token_revocation_capacity, 2 * len(rows)),
+        settings.token_revocation_error_rate
+    )
+    for jti, _ in rows:
+        bloom.add(jti)
+    _state.filter = bloom
+    _state.watermark = max((revoked_at for _, revoked_at in rows), default=None)
+    _state.rebuilt_at = time.monotonic()
+
+
+def _sync_incremental(db: Session) -> None:
+    # Acrescenta ao filtro as revogações feitas por outros processos desde a última leitura
+    statement = select(RevokedToken.jti, RevokedToken.revoked_at)
+    if _state.watermark is not None:
+        statement = statement.where(RevokedToken.revoked_at > _state.watermark - SYNC_OVERLAP)
+    for jti, revoked_at in db.execute(statement).all():
+        _state.filter.add(jti)
+        if _state.watermark is None or revoked_at > _state.watermark:
+            _state.watermark = revoked_at
+
+
+def _sync(db: Session) -> None:
+    """
+    Sincroniza o filtro com revoked_tokens se a última leitura tiver mais de
+    token_revocation_sync_seconds. Uma consulta por intervalo, não por requisição.
+    """
+    now = time.monotonic()
+    if _state.synced_at is not None and now - _state.synced_at < settings.token_revocation_sync_seconds:
+        return
+
+    # Só uma thread sincroniza; as demais usam o filtro atual (exceto antes da primeira carga)
+    if not _state.lock.acquire(blocking=_state.synced_at is None):
+        return
+    try:
+        if _state.synced_at is not None and now - _state.synced_at < settings.token_revocation_sync_seconds:
+            return
+        if _state.rebuilt_at is None or now - _state.rebuilt_at >= settings.token_revocation_rebuild_seconds:
+            _rebuild(db)
+        else:
+            _sync_incremental(db)
+        _state.synced_at = time.monotonic()
+    finally:
+        _state.lock.release()
+
+
+def is_token_revoked(db: Session, jti: str) -> bool:
+    """
+    Indica se o token com este jti foi revogado. Consulta só o filtro em
+    memória; o banco é lido apenas quando o filtro acusa o jti (confirmação
+    exata) e na sincronização periódica do filtro.
+    """
+    if _confirmed.get(jti):
+        return True
+    _sync(db)
+    if jti not in _state.filter:
+        return False
+
+    _state.filter_hits += 1
+    revoked = db.execute(
+        select(RevokedToken.jti).where(RevokedToken.jti == jti)
+    ).first() is not None
+    if revoked:
+        _confirmed.set(jti, True)
+    else:
+        _state.false_positives += 1
+    return revoked
+
+
+async def is_token_revoked_async(db: AsyncSession, jti: str) -> bool:
+    """
+    is_token_revoked para AsyncSession. A sincronização roda na thread do event
+    loop: antes da primeira carga do filtro, espera com await em vez de bloquear
+    a thread no lock que outra requisição do mesmo loop segura.
+    """
+    if _confirmed.get(jti):
+        return True
+    while _state.synced_at is None and _state.lock.locked():
+        await asyncio.sleep(0.01)
+    return await db.run_sync(is_token_revoked, jti)
+
+
+def revoke_tokens(db: Session, tokens: Iterable[Tuple[str, int, datetime]]) -> Set[str]:
+    """
+    Revoga os tokens informados como (jti, user_id, expira em) e faz commit.
+    Retorna os jti revogados agora (os já revogados antes ficam de fora).
+    Este processo passa a recusá-los de imediato; os demais, na próxima sincronização.
+    """
+    rows = [
+        {"jti": jti, "user_id": user_id, "expires_at": expires_at}
+        for jti, user_id, expires_at in tokens
+    ]
+    if not rows:
+        return set()
+    try:
+        revoked = set(db.scalars(
+            insert(RevokedToken)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=["jti"])
+            .returning(RevokedToken.jti)
+        ).all())
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    for row in rows:
+        _state.filter.add(row["jti"])
+        _confirmed.set(row["jti"], True)
+    return revoked
+
+
+def purge_expired_revocations(db: Session, batch_size: int = 10000) -> int:
+    """
+    Remove revogações de tokens já expirados (que seriam recusados de qualquer
+    forma), em lotes com um commit por lote. Retorna o total removido.
+    """
+    removed = 0
+    while True:
+        expired = (
+            select(RevokedToken.jti)
+            .where(RevokedToken.expires_at <= datetime.utcnow())
+            .limit(batch_size)
+        )
+        result = db.execute(
+            delete(RevokedToken)
+            .where(RevokedToken.jti.in_(expired))
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        removed += result.rowcount
+        if result.rowcount < batch_size:
+            return removed
+
+
+def revocation_stats() -> dict:
+    """Itens e tamanho do filtro, acertos no filtro e falsos positivos confirmados."""
+    return {
+        "filter_items": _state.filter.count,
+        "filter_bits": _state.filter.size,
+        "filter_hashes": _state.filter.hashes,
+        "filter_hits": _state.filter_hits,
+        "false_positives": _state.false_positives,
+        "confirmed_cache": _confirmed.stats(),
+    }
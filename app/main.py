@@ -1,13 +1,21 @@
-from fastapi import FastAPI
+from fastapi import APIRouter, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.routing import APIRoute
 from app.core.config import settings
 from app.core.logger_config import logger
+from app.core.database import SessionLocal, async_engine
+from app.core.rate_limit import DEFAULT_RULES, RateLimitMiddleware
+from app.services.partition_service import ensure_order_partitions
 from app.api.routes.health import router as health_router
 from app.api.routes.users import router as users_router
 from app.api.routes.auth import router as auth_router
 from app.api.routes.clients import router as clients_router
 from app.api.routes.products import router as products_router
 from app.api.routes.orders import router as orders_router
+from app.api.routes.reports import router as reports_router
+from app.api.routes.clients_async import router as clients_async_router
+from app.api.routes.products_async import router as products_async_router
+from app.api.routes.orders_async import router as orders_async_router
 
 logger.info(f"Aplicação {settings.app_name} iniciada no ambiente {settings.environment}")
 
@@ -21,9 +29,63 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.rate_limit_enabled:
+    app.add_middleware(RateLimitMiddleware, rules=DEFAULT_RULES)
+
+
+@app.on_event("startup")
+def create_order_partitions() -> None:
+    # Garante os meses à frente a cada deploy, além do cron de manutenção
+    db = SessionLocal()
+    try:
+        ensure_order_partitions(db)
+    except Exception as exc:
+        logger.warning(f"Não foi possível criar as partições de pedidos: {exc}")
+    finally:
+        db.close()
+
+
 app.include_router(health_router)
 app.include_router(users_router)
 app.include_router(auth_router)
 app.include_router(clients_router)
 app.include_router(products_router)
-app.include_router(orders_router)
\ No newline at end of file
+app.include_router(orders_router)
+app.include_router(reports_router)
+
+
+def use_async_routes(app: FastAPI, router: APIRouter) -> None:
+    """
+    Troca as rotas síncronas pelas variantes async de router (mesmo caminho e
+    métodos), na mesma posição: a ordem de resolução não muda e, por exemplo,
+    /orders/{order_id} continua depois de /orders/export.
+    """
+    start = len(app.router.routes)
+    app.include_router(router)
+    replacements = {
+        (route.path, frozenset(route.methods)): route
+        for route in app.router.routes[start:]
+    }
+    del app.router.routes[start:]
+
+    for index, route in enumerate(app.router.routes):
+        if isinstance(route, APIRoute):
+            replacement = replacements.pop((route.path, frozenset(route.methods)), None)
+            if replacement is not None:
+                app.router.routes[index] = replacement
+
+    if replacements:
+        raise RuntimeError(f"Rotas async sem equivalente síncrona: {sorted(path for path, _ in replacements)}")
+
+
+if settings.database_stack == "async":
+    logger.info("Rotas de produtos, clientes e pedidos na pilha async (asyncpg)")
+    use_async_routes(app, products_async_router)
+    use_async_routes(app, clients_async_router)
+    use_async_routes(app, orders_async_router)
+
+
+@app.on_event("shutdown")
+async def close_async_pool() -> None:
+    # Fecha as conexões do pool asyncpg (abertas só se a pilha async foi usada)
+    await async_engine.dispose()
@@ -1,6 +1,7 @@
-from pydantic import BaseModel, EmailStr, constr
-from typing import Optional, Annotated
+from pydantic import BaseModel, EmailStr, Field, constr
+from typing import Dict, List, Optional, Annotated
 from datetime import datetime
+from enum import Enum
 
 
 class ClientBase(BaseModel):
@@ -33,4 +34,43 @@ class ClientRead(ClientBase):
 
     model_config = {
         "from_attributes": True
-    }
\ No newline at end of file
+    }
+
+
+class ClientLookupRequest(BaseModel):
+    """IDs buscados de uma vez (POST /clients/lookup)"""
+    ids: List[int] = Field(..., min_length=1, max_length=1000)
+
+
+class ClientLookupResponse(BaseModel):
+    """Clientes na ordem pedida e IDs não encontrados"""
+    items: List[ClientRead]
+    missing: List[int]
+
+
+class ClientSearchMode(str, Enum):
+    """Tipo de correspondência da busca de clientes"""
+    PREFIX = "prefix"
+    CONTAINS = "contains"
+
+
+class ClientSearchField(str, Enum):
+    """Campos pesquisáveis de cliente"""
+    NAME = "name"
+    EMAIL = "email"
+    PHONE = "phone"
+
+
+class ClientImportMode(str, Enum):
+    """Tratamento de emails já cadastrados na importação de clientes"""
+    MERGE = "merge"
+    SKIP = "skip"
+
+
+class ClientOrderSummary(BaseModel):
+    """Resumo dos pedidos de um cliente"""
+    client_id: int
+    order_count: int
+    lifetime_spend: float
+    last_order_at: Optional[datetime] = None
+    status_counts: Dict[str, int]
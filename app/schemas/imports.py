@@ -0,0 +1,27 @@
+from enum import Enum
+from typing import List
+
+from pydantic import BaseModel
+
+
+class ImportFormat(str, Enum):
+    # Formatos aceitos nas importações em massa
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+class ImportRowError(BaseModel):
+    # Linha rejeitada e o motivo
+    line: int
+    error: str
+
+
+class ImportResult(BaseModel):
+    # Resumo de uma importação em massa
+    received: int
+    inserted: int
+    updated: int
+    unchanged: int
+    duplicates: int
+    errors: int
+    error_details: List[ImportRowError]
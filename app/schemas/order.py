@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import List, Optional
-from pydantic import BaseModel, Field, field_validator, ConfigDict
+from pydantic import BaseModel, Field, field_validator, model_validator, ConfigDict
 from enum import Enum
 
 
@@ -13,6 +13,18 @@ class OrderStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
+class CountMode(str, Enum):
+    # Modos de contagem opcionais na listagem de pedidos
+    EXACT = "exact"
+    ESTIMATE = "estimate"
+
+
+class ExportFormat(str, Enum):
+    # Formatos suportados na exportação de pedidos
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
 class OrderItemBase(BaseModel):
     # Campos comuns usados em criação e retorno de itens
     product_id: int = Field(..., gt=0, description="ID do produto")
@@ -100,3 +112,72 @@ class OrderWithItems(Order):
         default_factory=list,
         description="Itens do pedido"
     )
+
+
+class OrderBatchCreate(BaseModel):
+    # Lote de pedidos criados em uma única requisição
+    orders: List[OrderCreate] = Field(
+        min_length=1,
+        max_length=1000,
+        description="Pedidos do lote (máximo de 1000)"
+    )
+
+
+class OrderBatchResult(BaseModel):
+    # Resultado individual de um pedido do lote, na mesma posição da entrada
+    index: int = Field(..., description="Posição do pedido no lote")
+    success: bool
+    order: Optional[Order] = None
+    error: Optional[str] = None
+
+
+class OrderBatchResponse(BaseModel):
+    # Resumo da criação em lote
+    created: int
+    failed: int
+    results: List[OrderBatchResult]
+
+
+class OrderStatusBatchFilter(BaseModel):
+    # Filtros que selecionam os pedidos de uma transição em lote
+    client_id: Optional[int] = Field(None, gt=0, description="ID do cliente")
+    status: Optional[OrderStatus] = Field(None, description="Status atual do pedido")
+    start_date: Optional[datetime] = Field(None, description="Data inicial")
+    end_date: Optional[datetime] = Field(None, description="Data final")
+
+
+class OrderStatusBatchUpdate(BaseModel):
+    # Transição de status aplicada a uma lista de pedidos ou a um filtro
+    status: OrderStatus = Field(..., description="Novo status")
+    order_ids: Optional[List[int]] = Field(
+        None,
+        min_length=1,
+        max_length=10000,
+        description="IDs dos pedidos"
+    )
+    filters: Optional[OrderStatusBatchFilter] = Field(
+        None,
+        description="Filtro de pedidos (alternativa a order_ids)"
+    )
+
+    @model_validator(mode="after")
+    def validate_target(self):
+        # Exige exatamente um alvo: lista de IDs ou filtro
+        if (self.order_ids is None) == (self.filters is None):
+            raise ValueError("Informe order_ids ou filters (apenas um deles)")
+        return self
+
+
+class OrderStatusBatchRejection(BaseModel):
+    # Pedido que não mudou de status e o motivo
+    order_id: int
+    current_status: Optional[OrderStatus] = None
+    reason: str
+
+
+class OrderStatusBatchResponse(BaseModel):
+    # Resultado de uma transição em lote
+    updated: List[int]
+    rejected: List[OrderStatusBatchRejection]
+    # Total de recusados; com filtros, rejected lista apenas os primeiros
+    rejected_count: int
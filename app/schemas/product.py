@@ -1,5 +1,5 @@
-from pydantic import BaseModel, constr
-from typing import Optional, Annotated
+from pydantic import BaseModel, Field, constr
+from typing import List, Optional, Annotated
 from datetime import datetime
 
 class ProductBase(BaseModel):
@@ -26,4 +26,39 @@ class ProductRead(ProductBase):
     created_at: datetime
     model_config = {
         "from_attributes": True
-    }
\ No newline at end of file
+    }
+
+class ProductSearchResult(ProductRead):
+    """Produto encontrado pela busca, com a relevância calculada"""
+    rank: float
+
+
+class StockAdjustment(BaseModel):
+    """Variação de estoque de um produto (positiva entra, negativa sai)"""
+    product_id: int = Field(..., gt=0)
+    delta: int
+
+class StockAdjustRequest(BaseModel):
+    """Lote de ajustes de estoque aplicados de uma vez"""
+    adjustments: List[StockAdjustment] = Field(..., min_length=1, max_length=10000)
+    allow_negative: bool = Field(False, description="Permite estoque final negativo")
+
+class StockLevel(BaseModel):
+    """Estoque de um produto após o ajuste"""
+    product_id: int
+    stock: int
+
+class StockAdjustResponse(BaseModel):
+    """Resultado do ajuste: novos níveis e produtos não ajustados"""
+    stock: List[StockLevel]
+    rejected: List[int] = Field(default_factory=list, description="Ficariam com estoque negativo")
+    missing: List[int] = Field(default_factory=list, description="Produtos inexistentes")
+
+class ProductLookupRequest(BaseModel):
+    """IDs buscados de uma vez (POST /products/lookup)"""
+    ids: List[int] = Field(..., min_length=1, max_length=1000)
+
+class ProductLookupResponse(BaseModel):
+    """Produtos na ordem pedida e IDs não encontrados"""
+    items: List[ProductRead]
+    missing: List[int]
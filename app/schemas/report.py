@@ -0,0 +1,26 @@
+from datetime import date
+from pydantic import BaseModel
+
+
+class DailySalesRead(BaseModel):
+    """Vendas de um dia"""
+    day: date
+    revenue: float
+    order_count: int
+    units_sold: int
+
+
+class ClientSalesRead(BaseModel):
+    """Vendas de um cliente no intervalo consultado"""
+    client_id: int
+    revenue: float
+    order_count: int
+    units_sold: int
+
+
+class ProductSalesRead(BaseModel):
+    """Vendas de um produto no intervalo consultado"""
+    product_id: int
+    revenue: float
+    order_count: int
+    units_sold: int
@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import Optional
+
+
+class TokenPair(BaseModel):
+    """Tokens devolvidos no login e na renovação"""
+    access_token: str
+    refresh_token: str
+    token_type: str = "bearer"
+
+
+class RefreshRequest(BaseModel):
+    """Renovação dos tokens a partir do refresh token"""
+    refresh_token: str
+
+
+class LogoutRequest(BaseModel):
+    """Logout: revoga o token de acesso e, se informado, o refresh token"""
+    refresh_token: Optional[str] = None
@@ -2,6 +2,10 @@
 from .client_service import (
     get_client,
     get_clients,
+    get_clients_page,
+    get_clients_many,
+    lookup_clients,
+    search_clients,
     create_client,
     update_client,
     delete_client,
@@ -11,6 +15,9 @@ from .client_service import (
 from .product_service import (
     get_product,
     get_products,
+    get_products_many,
+    lookup_products,
+    search_products,
     create_product,
     update_product,
     delete_product
@@ -0,0 +1,177 @@
+# app/services/client_import_service.py
+from itertools import islice
+from typing import BinaryIO, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.schemas.client import ClientCreate
+from app.services.import_utils import (
+    MAX_REPORTED_ERRORS,
+    copy_rows,
+    iter_records,
+    validate_records,
+)
+
+MERGE = "merge"
+SKIP = "skip"
+
+STAGING_COLUMNS = ["line", "name", "email", "phone", "address"]
+
+# Tamanho das colunas de clients
+MAX_LENGTHS = {"name": 100, "email": 100, "phone": 20, "address": 200}
+
+# Emails comparados sem diferenciar maiúsculas (índice único ix_clients_email_lower).
+# merge: a última linha de cada email no lote vence e atualiza o cliente existente,
+# desde que ele pertença ao mesmo usuário; campos ausentes mantêm o valor atual.
+MERGE_CLIENTS = """
+    WITH latest AS (
+        SELECT DISTINCT ON (lower(email)) name, email, phone, address
+        FROM client_import
+        ORDER BY lower(email), line DESC
+    )
+    INSERT INTO clients (name, email, phone, address, active, user_id)
+    SELECT name, email, phone, address, true, :user_id FROM latest
+    ON CONFLICT ((lower(email))) DO UPDATE SET
+        name = EXCLUDED.name,
+        phone = coalesce(EXCLUDED.phone, clients.phone),
+        address = coalesce(EXCLUDED.address, clients.address)
+    WHERE clients.user_id = EXCLUDED.user_id
+        AND (clients.name, clients.phone, clients.address) IS DISTINCT FROM (
+            EXCLUDED.name,
+            coalesce(EXCLUDED.phone, clients.phone),
+            coalesce(EXCLUDED.address, clients.address)
+        )
+    RETURNING id, (xmax = 0) AS inserted
+"""
+
+# skip: a primeira linha de cada email vence e emails já cadastrados são ignorados
+SKIP_CLIENTS = """
+    WITH first AS (
+        SELECT DISTINCT ON (lower(email)) name, email, phone, address
+        FROM client_import
+        ORDER BY lower(email), line
+    )
+    INSERT INTO clients (name, email, phone, address, active, user_id)
+    SELECT name, email, phone, address, true, :user_id FROM first
+    ON CONFLICT ((lower(email))) DO NOTHING
+    RETURNING id, true AS inserted
+"""
+
+
+# Emails do lote já cadastrados para outro usuário: o upsert não altera esses
+# clientes e não os retorna. Uma linha por email, a mesma que o modo usaria.
+FOREIGN_EMAILS = """
+    SELECT DISTINCT ON (lower(i.email)) i.line
+    FROM client_import AS i
+    JOIN clients AS c ON lower(c.email) = lower(i.email)
+    WHERE c.user_id IS DISTINCT FROM :user_id
+    ORDER BY lower(i.email), i.line {order}
+"""
+
+FOREIGN_EMAIL_ERROR = "email pertence a outro usuário"
+
+
+def _parse_client(record: dict) -> Tuple[str, str, Optional[str], Optional[str]]:
+    # Mesmas regras de POST /clients
+    try:
+        client = ClientCreate.model_validate(record)
+    except ValidationError as e:
+        error = e.errors()[0]
+        field = ".".join(str(part) for part in error["loc"])
+        raise ValueError(f"{field}: {error['msg']}" if field else error["msg"])
+    values = client.model_dump(include=set(MAX_LENGTHS))
+    for field, limit in MAX_LENGTHS.items():
+        if values[field] is not None and len(values[field]) > limit:
+            raise ValueError(f"{field}: deve ter no máximo {limit} caracteres")
+    return client.name, client.email, client.phone, client.address
+
+
+def _merge_chunk(db: Session, rows: List[tuple], mode: str, user_id: int) -> Tuple[int, int, int, List[int]]:
+    # Um lote: COPY para a tabela temporária, merge e commit.
+    # Retorna (distintos, inseridos, atualizados, linhas com email de outro usuário)
+    db.execute(text(
+        "CREATE TEMP TABLE IF NOT EXISTS client_import ("
+        "line integer, name varchar(100), email varchar(100), "
+        "phone varchar(20), address varchar(200)"
+        ") ON COMMIT DELETE ROWS"
+    ))
+    copy_rows(db.connection().connection, "client_import", STAGING_COLUMNS, rows)
+    distinct = db.execute(text("SELECT count(DISTINCT lower(email)) FROM client_import")).scalar()
+    merged = db.execute(
+        text(MERGE_CLIENTS if mode == MERGE else SKIP_CLIENTS),
+        {"user_id": user_id}
+    ).all()
+    # Antes do commit: ON COMMIT DELETE ROWS esvazia a tabela temporária
+    foreign = db.execute(
+        text(FOREIGN_EMAILS.format(order="DESC" if mode == MERGE else "")),
+        {"user_id": user_id}
+    ).scalars().all()
+    db.commit()
+
+    inserted = sum(1 for row in merged if row.inserted)
+    return distinct, inserted, len(merged) - inserted, list(foreign)
+
+
+def import_clients(
+    db: Session,
+    stream: BinaryIO,
+    format: str,
+    user_id: int,
+    mode: str = MERGE,
+    chunk_size: Optional[int] = None
+) -> dict:
+    """
+    Importa clientes de um arquivo CSV (cabeçalho name,email,phone,address) ou
+    NDJSON para o usuário informado, deduplicando por email.
+
+    Com mode="merge" clientes existentes do usuário são atualizados; com
+    mode="skip" emails já cadastrados são ignorados. Emails cadastrados para
+    outro usuário não são alterados e são relatados em error_details. O arquivo é lido em fluxo e
+    gravado em lotes de chunk_size linhas (COPY + INSERT ... ON CONFLICT), com um
+    commit por lote. Linhas inválidas e lotes que falham são relatados sem
+    interromper a importação.
+    """
+    chunk_size = chunk_size or settings.client_import_chunk_size
+    errors = []
+    totals = {"valid": 0, "failed": 0, "distinct": 0, "inserted": 0, "updated": 0, "foreign": 0}
+    # Entradas de errors que não são linhas inválidas (lotes que falharam e emails de outro usuário)
+    reported = 0
+
+    rows = validate_records(iter_records(stream, format), _parse_client, errors)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        try:
+            distinct, inserted, updated, foreign = _merge_chunk(db, chunk, mode, user_id)
+        except Exception as e:
+            # Lote descartado inteiro; os seguintes continuam
+            db.rollback()
+            reported += 1
+            totals["failed"] += len(chunk)
+            errors.append({
+                "line": chunk[0][0],
+                "error": f"Lote das linhas {chunk[0][0]} a {chunk[-1][0]} não importado: {e.__class__.__name__}"
+            })
+            continue
+
+        totals["valid"] += len(chunk)
+        totals["distinct"] += distinct
+        totals["inserted"] += inserted
+        totals["updated"] += updated
+        totals["foreign"] += len(foreign)
+        reported += len(foreign)
+        errors.extend({"line": line, "error": FOREIGN_EMAIL_ERROR} for line in sorted(foreign))
+
+    return {
+        "received": totals["valid"] + totals["failed"] + len(errors) - reported,
+        "inserted": totals["inserted"],
+        "updated": totals["updated"],
+        "unchanged": totals["distinct"] - totals["inserted"] - totals["updated"] - totals["foreign"],
+        "duplicates": totals["valid"] - totals["distinct"],
+        "errors": len(errors),
+        "error_details": errors[:MAX_REPORTED_ERRORS],
+    }
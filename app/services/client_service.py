@@ -1,9 +1,13 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from sqlalchemy import func, or_, select
 from sqlalchemy.exc import SQLAlchemyError
 from fastapi import HTTPException, status
 from app.core.models.client import Client
 from app.schemas.client import ClientCreate, ClientUpdate
-from typing import List, Optional
+from app.services.exceptions import BusinessRuleException
+from app.services.pagination import decode_cursor, encode_cursor
+from typing import Dict, Iterable, List, Optional, Tuple
 
 def get_client(db: Session, client_id: int) -> Optional[Client]:
     """
@@ -13,6 +17,56 @@ def get_client(db: Session, client_id: int) -> Optional[Client]:
     return db.query(Client).filter(Client.id == client_id).first()
 
 
+async def get_client_async(db: AsyncSession, client_id: int) -> Optional[Client]:
+    """get_client para AsyncSession."""
+    return await db.get(Client, client_id)
+
+
+def get_clients_many(db: Session, client_ids: Iterable[int]) -> Dict[int, Client]:
+    """
+    Busca vários clientes pelo ID em uma única consulta.
+    Retorna {id: cliente}; IDs inexistentes ficam de fora.
+    """
+    client_ids = set(client_ids)
+    if not client_ids:
+        return {}
+    return {
+        client.id: client
+        for client in db.query(Client).filter(Client.id.in_(client_ids)).all()
+    }
+
+
+async def get_clients_many_async(db: AsyncSession, client_ids: Iterable[int]) -> Dict[int, Client]:
+    """get_clients_many para AsyncSession."""
+    client_ids = set(client_ids)
+    if not client_ids:
+        return {}
+    clients = await db.scalars(select(Client).where(Client.id.in_(client_ids)))
+    return {client.id: client for client in clients.all()}
+
+
+def _in_requested_order(client_ids: List[int], found: Dict[int, Client]) -> Tuple[List[Client], List[int]]:
+    return (
+        [found[client_id] for client_id in client_ids if client_id in found],
+        [client_id for client_id in client_ids if client_id not in found]
+    )
+
+
+def lookup_clients(db: Session, client_ids: List[int]) -> Tuple[List[Client], List[int]]:
+    """
+    Busca vários clientes de uma vez, na ordem pedida (IDs repetidos aparecem uma vez).
+    Retorna (clientes encontrados, IDs não encontrados).
+    """
+    client_ids = list(dict.fromkeys(client_ids))
+    return _in_requested_order(client_ids, get_clients_many(db, client_ids))
+
+
+async def lookup_clients_async(db: AsyncSession, client_ids: List[int]) -> Tuple[List[Client], List[int]]:
+    """lookup_clients para AsyncSession."""
+    client_ids = list(dict.fromkeys(client_ids))
+    return _in_requested_order(client_ids, await get_clients_many_async(db, client_ids))
+
+
 def get_clients(db: Session, skip: int = 0, limit: int = 100) -> List[Client]:
     """
     Retorna todos os clientes ativos com paginação.
@@ -20,19 +74,140 @@ def get_clients(db: Session, skip: int = 0, limit: int = 100) -> List[Client]:
     return (
         db.query(Client)
         .filter(Client.active == True)
+        .order_by(Client.id)
         .offset(skip)
         .limit(limit)
         .all()
     )
 
 
+async def get_clients_async(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Client]:
+    """get_clients para AsyncSession."""
+    clients = await db.scalars(
+        select(Client)
+        .where(Client.active == True)
+        .order_by(Client.id)
+        .offset(skip)
+        .limit(limit)
+    )
+    return list(clients.all())
+
+
+def _after_cursor(query, cursor: Optional[str]):
+    # Cursor de paginação por id crescente (Query ou select)
+    if not cursor:
+        return query
+    try:
+        last_id = int(decode_cursor(cursor)["id"])
+    except (KeyError, TypeError, ValueError):
+        raise BusinessRuleException("Cursor de paginação inválido")
+    return query.filter(Client.id > last_id)
+
+
+def _page(clients: List[Client], limit: int) -> Tuple[List[Client], Optional[str]]:
+    next_cursor = encode_cursor({"id": clients[-1].id}) if len(clients) == limit else None
+    return clients, next_cursor
+
+
+def get_clients_page(
+    db: Session,
+    cursor: Optional[str] = None,
+    limit: int = 100
+) -> Tuple[List[Client], Optional[str]]:
+    """
+    Lista clientes ativos paginando por cursor (keyset) em id.
+    Retorna (clientes, próximo cursor ou None).
+    """
+    query = db.query(Client).filter(Client.active == True)
+    clients = _after_cursor(query, cursor).order_by(Client.id).limit(limit).all()
+    return _page(clients, limit)
+
+
+async def get_clients_page_async(
+    db: AsyncSession,
+    cursor: Optional[str] = None,
+    limit: int = 100
+) -> Tuple[List[Client], Optional[str]]:
+    """get_clients_page para AsyncSession."""
+    statement = _after_cursor(select(Client).where(Client.active == True), cursor)
+    clients = await db.scalars(statement.order_by(Client.id).limit(limit))
+    return _page(list(clients.all()), limit)
+
+
+# Campos pesquisáveis; cada expressão corresponde aos índices parciais de busca
+SEARCH_COLUMNS = {
+    "name": lambda: func.lower(Client.name),
+    "email": lambda: func.lower(Client.email),
+    "phone": lambda: Client.phone,
+}
+
+# Abaixo de 3 caracteres os trigramas não filtram nada e a busca por trecho varreria a tabela
+MIN_CONTAINS_LENGTH = 3
+
+
+def _search_condition(q: str, mode: str, fields: Optional[List[str]]):
+    # Condição da busca por prefixo ou trecho nos campos pedidos
+    term = q.strip().lower()
+    if mode == "contains" and len(term) < MIN_CONTAINS_LENGTH:
+        raise BusinessRuleException(
+            f"A busca por trecho exige ao menos {MIN_CONTAINS_LENGTH} caracteres"
+        )
+    if not term:
+        raise BusinessRuleException("Informe o texto da busca")
+
+    # %, _ e barra invertida digitados pelo usuário são literais
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    pattern = f"{escaped}%" if mode == "prefix" else f"%{escaped}%"
+
+    return or_(*[
+        SEARCH_COLUMNS[field]().like(pattern, escape="\\")
+        for field in (fields or SEARCH_COLUMNS)
+    ])
+
+
+def search_clients(
+    db: Session,
+    q: str,
+    mode: str = "contains",
+    fields: Optional[List[str]] = None,
+    cursor: Optional[str] = None,
+    limit: int = 50
+) -> Tuple[List[Client], Optional[str]]:
+    """
+    Busca clientes ativos por prefixo (mode="prefix") ou trecho (mode="contains")
+    do nome, email ou telefone, sem diferenciar maiúsculas.
+    Pagina por cursor (keyset) em id. Retorna (clientes, próximo cursor ou None).
+    """
+    matches = _search_condition(q, mode, fields)
+    query = db.query(Client).filter(Client.active == True, matches)
+    clients = _after_cursor(query, cursor).order_by(Client.id).limit(limit).all()
+    return _page(clients, limit)
+
+
+async def search_clients_async(
+    db: AsyncSession,
+    q: str,
+    mode: str = "contains",
+    fields: Optional[List[str]] = None,
+    cursor: Optional[str] = None,
+    limit: int = 50
+) -> Tuple[List[Client], Optional[str]]:
+    """search_clients para AsyncSession."""
+    matches = _search_condition(q, mode, fields)
+    statement = _after_cursor(select(Client).where(Client.active == True, matches), cursor)
+    clients = await db.scalars(statement.order_by(Client.id).limit(limit))
+    return _page(list(clients.all()), limit)
+
+
 def create_client(db: Session, client: ClientCreate, user_id: int) -> Client:
     """
     Cria um novo cliente.
     Verifica se o email já está cadastrado.
     Atribui o user_id do usuário responsável pelo cadastro.
     """
-    existing_client = db.query(Client).filter(Client.email == client.email).first()
+    existing_client = db.query(Client).filter(
+        func.lower(Client.email) == client.email.lower()
+    ).first()
     if existing_client:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -77,7 +252,7 @@ def update_client(db: Session, client_id: int, client_update: ClientUpdate) -> O
         # Valida email único
         if "email" in update_data and update_data["email"] != db_client.email:
             existing = db.query(Client).filter(
-                Client.email == update_data["email"],
+                func.lower(Client.email) == update_data["email"].lower(),
                 Client.id != client_id
             ).first()
             if existing:
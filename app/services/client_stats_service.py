@@ -0,0 +1,229 @@
+# app/services/client_stats_service.py
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import Float, Integer, column, delete, func, select, text, union_all, update, values
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.models import ArchivedOrder, Client, ClientOrderStats, Order, OrderStatus
+from app.core.models.client_order_stats import STATUS_COUNT_COLUMNS
+
+COUNTERS = ["order_count", "lifetime_spend", *STATUS_COUNT_COLUMNS.values()]
+STATS_COLUMNS = ["client_id", *COUNTERS, "last_order_at"]
+
+
+def _stats_source(criteria: list, source=Order):
+    # Contagens, gasto e último pedido por cliente dos pedidos que atendem aos
+    # critérios, nas colunas de STATS_COLUMNS; source é Order ou ArchivedOrder
+    return (
+        select(
+            source.client_id,
+            func.count().label("order_count"),
+            func.coalesce(
+                func.sum(source.total).filter(source.status != OrderStatus.CANCELLED.value), 0
+            ).label("lifetime_spend"),
+            *(
+                func.count().filter(source.status == status).label(name)
+                for status, name in STATUS_COUNT_COLUMNS.items()
+            ),
+            func.max(source.created_at).label("last_order_at")
+        )
+        .where(*criteria)
+        .group_by(source.client_id)
+        # Ordem fixa: transações concorrentes bloqueiam as linhas na mesma ordem
+        .order_by(source.client_id)
+    )
+
+
+def _counted_as_spend(status: str) -> bool:
+    return status != OrderStatus.CANCELLED.value
+
+
+def add_orders_to_client_stats(db: Session, order_ids: Iterable[int]) -> None:
+    """
+    Soma os pedidos informados ao resumo dos seus clientes.
+    Não faz commit: deve rodar na mesma transação que criou os pedidos.
+    """
+    order_ids = list(order_ids)
+    if not order_ids:
+        return
+
+    statement = insert(ClientOrderStats).from_select(
+        STATS_COLUMNS, _stats_source([Order.id.in_(order_ids)])
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=["client_id"],
+        set_={
+            **{
+                counter: getattr(ClientOrderStats, counter) + getattr(statement.excluded, counter)
+                for counter in COUNTERS
+            },
+            "last_order_at": func.greatest(ClientOrderStats.last_order_at, statement.excluded.last_order_at)
+        }
+    )
+    db.execute(statement)
+
+
+def change_orders_status_in_client_stats(
+    db: Session,
+    orders: Iterable[Tuple[int, float, str]],
+    new_status: str
+) -> None:
+    """
+    Move pedidos de status no resumo dos clientes. orders traz
+    (client_id, total, status anterior) de cada pedido alterado.
+    Não faz commit: deve rodar na mesma transação que alterou os pedidos.
+    """
+    deltas = {}
+    for client_id, total, old_status in orders:
+        if old_status == new_status:
+            continue
+        delta = deltas.setdefault(client_id, {name: 0 for name in COUNTERS})
+        delta[STATUS_COUNT_COLUMNS[old_status]] -= 1
+        delta[STATUS_COUNT_COLUMNS[new_status]] += 1
+        delta["lifetime_spend"] += (
+            (total if _counted_as_spend(new_status) else 0.0)
+            - (total if _counted_as_spend(old_status) else 0.0)
+        )
+    if not deltas:
+        return
+
+    changed = [name for name in COUNTERS if name != "order_count"]
+    source = values(
+        column("client_id", Integer),
+        *(column(name, Float if name == "lifetime_spend" else Integer) for name in changed),
+        name="delta"
+    ).data([
+        (client_id, *(delta[name] for name in changed))
+        for client_id, delta in sorted(deltas.items())
+    ])
+    db.execute(
+        update(ClientOrderStats)
+        .where(ClientOrderStats.client_id == source.c.client_id)
+        .values({
+            name: getattr(ClientOrderStats, name) + source.c[name]
+            for name in changed
+        })
+        .execution_options(synchronize_session=False)
+    )
+
+
+def remove_orders_from_client_stats(db: Session, order_ids: Iterable[int]) -> None:
+    """
+    Subtrai os pedidos informados do resumo dos clientes e recalcula a data do
+    último pedido sem eles.
+    Não faz commit: deve rodar antes da exclusão, na mesma transação.
+    """
+    order_ids = list(order_ids)
+    if not order_ids:
+        return
+
+    source = _stats_source([Order.id.in_(order_ids)]).subquery("removed")
+    # Pedidos arquivados continuam no resumo e contam para o último pedido
+    remaining = func.greatest(
+        select(func.max(Order.created_at))
+        .where(Order.client_id == ClientOrderStats.client_id, Order.id.notin_(order_ids))
+        .scalar_subquery(),
+        select(func.max(ArchivedOrder.created_at))
+        .where(ArchivedOrder.client_id == ClientOrderStats.client_id)
+        .scalar_subquery()
+    )
+    db.execute(
+        update(ClientOrderStats)
+        .where(ClientOrderStats.client_id == source.c.client_id)
+        .values({
+            **{
+                counter: getattr(ClientOrderStats, counter) - source.c[counter]
+                for counter in COUNTERS
+            },
+            "last_order_at": remaining
+        })
+        .execution_options(synchronize_session=False)
+    )
+
+
+def rebuild_client_order_stats(db: Session, client_ids: Optional[List[int]] = None) -> None:
+    """
+    Recalcula o resumo a partir de orders e archived_orders, para os clientes
+    informados ou para todos. Pedidos arquivados continuam no resumo, como no
+    arquivamento, que não altera client_order_stats.
+
+    A tabela fica bloqueada para escrita durante a reconstrução: pedidos
+    criados nesse meio tempo esperam e são somados depois, sem duplicar.
+    """
+    criteria = []
+    archived_criteria = []
+    if client_ids is not None:
+        criteria.append(Order.client_id.in_(client_ids))
+        archived_criteria.append(ArchivedOrder.client_id.in_(client_ids))
+
+    combined = union_all(
+        _stats_source(criteria).order_by(None),
+        _stats_source(archived_criteria, ArchivedOrder).order_by(None)
+    ).subquery("source")
+    source = (
+        select(
+            combined.c.client_id,
+            *(func.sum(combined.c[counter]).label(counter) for counter in COUNTERS),
+            func.max(combined.c.last_order_at).label("last_order_at")
+        )
+        # archived_orders não tem FK: clientes removidos depois do arquivamento ficam de fora
+        .where(combined.c.client_id.in_(select(Client.id)))
+        .group_by(combined.c.client_id)
+        .order_by(combined.c.client_id)
+    )
+
+    try:
+        db.execute(text("LOCK TABLE client_order_stats IN EXCLUSIVE MODE"))
+        statement = delete(ClientOrderStats)
+        if client_ids is not None:
+            statement = statement.where(ClientOrderStats.client_id.in_(client_ids))
+        db.execute(statement)
+
+        db.execute(insert(ClientOrderStats).from_select(STATS_COLUMNS, source))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+
+def _summary_statement(client_id: int, owner_id: int):
+    return (
+        select(Client.id, ClientOrderStats)
+        .outerjoin(ClientOrderStats, ClientOrderStats.client_id == Client.id)
+        .where(Client.id == client_id, Client.user_id == owner_id)
+    )
+
+
+def _summary(client_id: int, row) -> Optional[dict]:
+    if row is None:
+        return None
+
+    stats = row.ClientOrderStats
+    return {
+        "client_id": client_id,
+        "order_count": stats.order_count if stats else 0,
+        "lifetime_spend": stats.lifetime_spend if stats else 0.0,
+        "last_order_at": stats.last_order_at if stats else None,
+        "status_counts": {
+            status: getattr(stats, name) if stats else 0
+            for status, name in STATUS_COUNT_COLUMNS.items()
+        }
+    }
+
+
+def get_client_order_summary(db: Session, client_id: int, owner_id: int) -> Optional[dict]:
+    """
+    Retorna o resumo de pedidos do cliente do usuário em uma consulta, lendo
+    clients e client_order_stats pela chave primária. Cliente sem pedidos tem o
+    resumo zerado. Retorna None se o cliente não existir ou for de outro usuário.
+    """
+    row = db.execute(_summary_statement(client_id, owner_id)).first()
+    return _summary(client_id, row)
+
+
+async def get_client_order_summary_async(db: AsyncSession, client_id: int, owner_id: int) -> Optional[dict]:
+    """get_client_order_summary para AsyncSession."""
+    row = (await db.execute(_summary_statement(client_id, owner_id))).first()
+    return _summary(client_id, row)
@@ -9,4 +9,26 @@ class NotFoundException(ServiceException):
 
 class BusinessRuleException(ServiceException):
     """Violação de regra de negócio"""
-    pass
\ No newline at end of file
+    pass
+
+class InsufficientStockException(BusinessRuleException):
+    """Estoque insuficiente para um ou mais produtos"""
+
+    def __init__(self, product_ids):
+        self.product_ids = list(product_ids)
+        super().__init__(f"Estoque insuficiente para os produtos: {self.product_ids}")
+
+
+class StockContentionException(BusinessRuleException):
+    """Tempo de espera pelo bloqueio do estoque esgotado"""
+    pass
+
+
+class IdempotencyKeyReuseException(BusinessRuleException):
+    """Chave de idempotência reutilizada com outro corpo de requisição"""
+    pass
+
+
+class IdempotencyInProgressException(ServiceException):
+    """Requisição com a mesma chave de idempotência ainda em execução"""
+    pass
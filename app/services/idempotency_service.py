@@ -0,0 +1,269 @@
+# app/services/idempotency_service.py
+import hashlib
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from pydantic import BaseModel
+from sqlalchemy import delete, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.logger_config import logger
+from app.core.models import IdempotencyKey
+from app.services.exceptions import (
+    IdempotencyInProgressException,
+    IdempotencyKeyReuseException,
+)
+
+PROCESSING = "processing"
+COMPLETED = "completed"
+
+# Intervalo de consulta à tabela quando a chave está em uso por outro processo
+POLL_INTERVAL_SECONDS = 0.05
+
+# Resultados recentes: (user_id, key) -> (request_hash, status_code, corpo)
+_results = TTLCache(
+    maxsize=settings.idempotency_cache_size,
+    ttl=settings.idempotency_cache_ttl_seconds
+)
+
+# Execuções em andamento neste processo; duplicatas esperam o evento
+_inflight: Dict[Hashable, threading.Event] = {}
+_inflight_lock = threading.Lock()
+
+
+def request_fingerprint(payload: BaseModel) -> str:
+    """
+    Retorna o SHA-256 do corpo da requisição, usado para detectar a reutilização
+    de uma chave com outro conteúdo.
+    """
+    return hashlib.sha256(payload.model_dump_json().encode("utf-8")).hexdigest()
+
+
+def _check_hash(stored_hash: str, request_hash: str) -> None:
+    if stored_hash != request_hash:
+        raise IdempotencyKeyReuseException(
+            "Chave de idempotência já usada com outro conteúdo de requisição"
+        )
+
+
+def _lookup(db: Session, user_id: int, key: str, request_hash: str) -> Tuple[Optional[str], Any]:
+    # Procura o resultado no cache e depois na tabela; retorna (estado, resultado)
+    cached = _results.get((user_id, key))
+    if cached is not None:
+        _check_hash(cached[0], request_hash)
+        return COMPLETED, (cached[1], cached[2])
+
+    row = db.execute(
+        select(
+            IdempotencyKey.request_hash,
+            IdempotencyKey.status,
+            IdempotencyKey.status_code,
+            IdempotencyKey.response_body
+        ).where(
+            IdempotencyKey.user_id == user_id,
+            IdempotencyKey.key == key,
+            IdempotencyKey.expires_at > datetime.utcnow()
+        )
+    ).first()
+    db.commit()  # encerra a transação de leitura para enxergar a próxima consulta
+
+    if row is None:
+        return None, None
+    _check_hash(row.request_hash, request_hash)
+    if row.status != COMPLETED:
+        return PROCESSING, None
+
+    _results.set((user_id, key), (row.request_hash, row.status_code, row.response_body))
+    return COMPLETED, (row.status_code, row.response_body)
+
+
+def _claim(db: Session, user_id: int, key: str, request_hash: str) -> Optional[datetime]:
+    # Reserva a chave na tabela; uma chave expirada ainda não removida é reaproveitada.
+    # A reserva vale por idempotency_lease_seconds e é renovada enquanto a operação
+    # roda: se o processo morrer, outra requisição assume a chave depois disso.
+    # Retorna o created_at da reserva, que a identifica, ou None se outra a detém.
+    now = datetime.utcnow()
+    values = {
+        "user_id": user_id,
+        "key": key,
+        "request_hash": request_hash,
+        "status": PROCESSING,
+        "status_code": None,
+        "response_body": None,
+        "created_at": now,
+        "expires_at": now + timedelta(seconds=settings.idempotency_lease_seconds),
+    }
+    statement = insert(IdempotencyKey).values(**values)
+    statement = statement.on_conflict_do_update(
+        index_elements=[IdempotencyKey.user_id, IdempotencyKey.key],
+        set_={name: value for name, value in values.items() if name not in ("user_id", "key")},
+        where=IdempotencyKey.expires_at <= now
+    ).returning(IdempotencyKey.key)
+
+    claimed = db.execute(statement).first() is not None
+    db.commit()
+    return now if claimed else None
+
+
+def _own_claim(user_id: int, key: str, claimed_at: datetime) -> tuple:
+    # Critério da própria reserva: se ela expirou e outra requisição assumiu a
+    # chave, a reserva nova não é renovada, removida nem sobrescrita
+    return (
+        IdempotencyKey.user_id == user_id,
+        IdempotencyKey.key == key,
+        IdempotencyKey.created_at == claimed_at
+    )
+
+
+def _renew_lease(user_id: int, key: str, claimed_at: datetime, done: threading.Event) -> None:
+    # Estende a reserva enquanto a operação roda, para que uma requisição lenta
+    # mas viva não seja assumida por outra; usa sessão própria, pois a da
+    # operação está com a transação do pedido aberta
+    interval = settings.idempotency_lease_seconds / 3
+    while not done.wait(interval):
+        db = SessionLocal()
+        try:
+            db.execute(
+                update(IdempotencyKey)
+                .where(*_own_claim(user_id, key, claimed_at), IdempotencyKey.status == PROCESSING)
+                .values(expires_at=datetime.utcnow() + timedelta(seconds=settings.idempotency_lease_seconds))
+            )
+            db.commit()
+        except Exception as exc:
+            db.rollback()
+            logger.warning(f"Não foi possível renovar a chave de idempotência {key}: {exc}")
+        finally:
+            db.close()
+
+
+def _execute(
+    db: Session,
+    user_id: int,
+    key: str,
+    request_hash: str,
+    claimed_at: datetime,
+    operation: Callable[[], Tuple[int, Any]]
+) -> Tuple[int, Any]:
+    own_claim = _own_claim(user_id, key, claimed_at)
+    done = threading.Event()
+    heartbeat = threading.Thread(
+        target=_renew_lease,
+        args=(user_id, key, claimed_at, done),
+        daemon=True
+    )
+    heartbeat.start()
+    try:
+        try:
+            status_code, body = operation()
+
+            # A resposta é gravada na mesma transação da operação: o pedido e a
+            # chave concluída são confirmados juntos ou nenhum deles
+            completed = db.execute(
+                update(IdempotencyKey)
+                .where(*own_claim)
+                .values(
+                    status=COMPLETED,
+                    status_code=status_code,
+                    response_body=body,
+                    expires_at=datetime.utcnow() + timedelta(hours=settings.idempotency_ttl_hours)
+                )
+            )
+            if completed.rowcount == 0:
+                # A reserva foi perdida: desfaz a operação, que a outra requisição executa
+                raise IdempotencyInProgressException(
+                    "Requisição com esta chave de idempotência assumida por outra execução"
+                )
+            db.commit()
+        except Exception:
+            # Falhou: libera a chave para que uma nova tentativa execute de novo
+            db.rollback()
+            db.execute(delete(IdempotencyKey).where(*own_claim))
+            db.commit()
+            raise
+    finally:
+        done.set()
+        heartbeat.join()
+
+    _results.set((user_id, key), (request_hash, status_code, body))
+    return status_code, body
+
+
+def run_idempotent(
+    db: Session,
+    user_id: int,
+    key: str,
+    request_hash: str,
+    operation: Callable[[], Tuple[int, Any]]
+) -> Tuple[int, Any, bool]:
+    """
+    Executa operation uma única vez por (user_id, key).
+
+    operation deve retornar (status_code, corpo serializável em JSON) sem fazer
+    commit: o resultado é gravado e confirmado na mesma transação.
+    Repetições devolvem o resultado gravado; duplicatas simultâneas esperam a
+    execução em andamento em vez de repetir a operação.
+    Retorna (status_code, corpo, True se foi uma repetição).
+    """
+    deadline = time.monotonic() + settings.idempotency_wait_seconds
+
+    while True:
+        state, result = _lookup(db, user_id, key, request_hash)
+        if state == COMPLETED:
+            return result[0], result[1], True
+
+        with _inflight_lock:
+            event = _inflight.get((user_id, key))
+            owner = event is None and state is None
+            if owner:
+                event = _inflight[(user_id, key)] = threading.Event()
+
+        if owner:
+            try:
+                claimed_at = _claim(db, user_id, key, request_hash)
+                if claimed_at is not None:
+                    status_code, body = _execute(db, user_id, key, request_hash, claimed_at, operation)
+                    return status_code, body, False
+            finally:
+                with _inflight_lock:
+                    _inflight.pop((user_id, key), None)
+                event.set()
+            # Outro processo reservou a chave primeiro: espera o resultado dele
+        elif event is not None:
+            # Execução em andamento neste processo
+            event.wait(max(0.0, deadline - time.monotonic()))
+
+        if time.monotonic() >= deadline:
+            raise IdempotencyInProgressException(
+                "Requisição com esta chave de idempotência ainda em processamento"
+            )
+        if event is None or owner:
+            time.sleep(POLL_INTERVAL_SECONDS)
+
+
+def purge_expired_keys(db: Session, batch_size: int = 10000) -> int:
+    """
+    Remove chaves expiradas em lotes, com um commit por lote.
+    Retorna o total de chaves removidas.
+    """
+    removed = 0
+    while True:
+        expired = (
+            select(IdempotencyKey.user_id, IdempotencyKey.key)
+            .where(IdempotencyKey.expires_at <= datetime.utcnow())
+            .limit(batch_size)
+        )
+        result = db.execute(
+            delete(IdempotencyKey)
+            .where(tuple_(IdempotencyKey.user_id, IdempotencyKey.key).in_(expired))
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        removed += result.rowcount
+        if result.rowcount < batch_size:
+            return removed
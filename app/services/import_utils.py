@@ -0,0 +1,107 @@
+# app/services/import_utils.py
+import csv
+import io
+import json
+from typing import Any, BinaryIO, Callable, Iterable, Iterator, List, Optional, Tuple
+
+# Quantidade máxima de erros detalhados devolvidos no resultado de uma importação
+MAX_REPORTED_ERRORS = 100
+
+
+def iter_records(stream: BinaryIO, format: str) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """
+    Lê registros de um arquivo CSV (com cabeçalho) ou NDJSON sem carregá-lo inteiro.
+    Produz (linha, registro, erro): registro é None quando a linha é inválida.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+
+    if format == "csv":
+        reader = csv.DictReader(text)
+        for record in reader:
+            # Campos vazios do CSV equivalem a campos ausentes
+            yield reader.line_num, {
+                key.strip(): value for key, value in record.items()
+                if key is not None and value not in (None, "")
+            }, None
+        return
+
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield line_number, None, "JSON inválido"
+            continue
+        if not isinstance(record, dict):
+            yield line_number, None, "Cada linha deve ser um objeto JSON"
+            continue
+        yield line_number, record, None
+
+
+class CopySource:
+    """
+    Objeto de leitura para COPY ... FROM STDIN (copy_expert do psycopg2):
+    converte as linhas em CSV sob demanda, sem montar o arquivo na memória.
+    """
+
+    def __init__(self, rows: Iterable[Tuple[Any, ...]]):
+        self._rows = iter(rows)
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+        self._pending = ""
+
+    def read(self, size: int = -1) -> str:
+        while size < 0 or len(self._pending) < size:
+            row = next(self._rows, None)
+            if row is None:
+                break
+            self._writer.writerow(row)
+            self._pending += self._buffer.getvalue()
+            self._buffer.seek(0)
+            self._buffer.truncate()
+
+        if size < 0:
+            chunk, self._pending = self._pending, ""
+        else:
+            chunk, self._pending = self._pending[:size], self._pending[size:]
+        return chunk
+
+    # copy_expert também aceita readline
+    readline = read
+
+
+def copy_rows(db_connection, table: str, columns: List[str], rows: Iterable[Tuple[Any, ...]]) -> None:
+    """
+    Envia as linhas para a tabela com COPY FROM STDIN (CSV; None vira NULL).
+    db_connection é a conexão DBAPI (psycopg2) da transação corrente.
+    """
+    cursor = db_connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+            CopySource(rows)
+        )
+    finally:
+        cursor.close()
+
+
+def validate_records(
+    records: Iterable[Tuple[int, Optional[dict], Optional[str]]],
+    parse: Callable[[dict], Tuple[Any, ...]],
+    errors: List[dict]
+) -> Iterator[Tuple[Any, ...]]:
+    """
+    Aplica parse a cada registro e produz (linha, *valores) dos válidos.
+    parse lança ValueError com a mensagem do problema. Erros vão para errors
+    como {"line", "error"}; a contagem é len(errors) e o detalhe é limitado
+    a MAX_REPORTED_ERRORS pelo chamador.
+    """
+    for line, record, error in records:
+        if error is None:
+            try:
+                yield (line, *parse(record))
+                continue
+            except ValueError as e:
+                error = str(e)
+        errors.append({"line": line, "error": error})
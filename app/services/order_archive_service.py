@@ -0,0 +1,231 @@
+# app/services/order_archive_service.py
+import asyncio
+import os
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import delete, insert, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.models import ArchivedOrder, Order, OrderItem, OrderStatus
+from app.services.exceptions import ServiceException
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # dependência opcional: só o arquivo de pedidos precisa dela
+    pa = None
+    pq = None
+
+# Pedidos nesses status não mudam mais e podem sair das tabelas principais
+ARCHIVABLE_STATUSES = (OrderStatus.DELIVERED.value, OrderStatus.CANCELLED.value)
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ServiceException("Arquivo de pedidos indisponível: instale o pacote pyarrow")
+
+
+def _archive_schema():
+    # Um registro por pedido, com os itens aninhados: a leitura de um pedido
+    # arquivado lê uma única linha do arquivo
+    item = pa.struct([
+        ("id", pa.int32()),
+        ("order_id", pa.int32()),
+        ("product_id", pa.int32()),
+        ("quantity", pa.int32()),
+        ("unit_price", pa.float64()),
+        ("subtotal", pa.float64()),
+    ])
+    return pa.schema([
+        ("id", pa.int32()),
+        ("client_id", pa.int32()),
+        ("owner_id", pa.int32()),
+        ("status", pa.string()),
+        ("total", pa.float64()),
+        ("created_at", pa.timestamp("us")),
+        ("updated_at", pa.timestamp("us")),
+        ("items", pa.list_(item)),
+    ])
+
+
+def _write_archive_file(records: list, archive_dir: str) -> str:
+    # Grava em arquivo temporário e renomeia: um arquivo listado no índice está sempre completo
+    name = f"orders-{records[0]['created_at']:%Y%m}-{uuid.uuid4().hex}.parquet"
+    path = os.path.join(archive_dir, name)
+    temporary = f"{path}.tmp"
+
+    table = pa.Table.from_pylist(records, schema=_archive_schema())
+    pq.write_table(table, temporary, compression="zstd")
+    with open(temporary, "rb") as written:
+        os.fsync(written.fileno())
+    os.replace(temporary, path)
+    return path
+
+
+def _archive_reference(path: str) -> str:
+    # Valor gravado em archived_orders.file: relativo a order_archive_dir quando o
+    # arquivo está dentro dele (o diretório pode mudar de lugar), absoluto nos demais casos
+    root = os.path.abspath(settings.order_archive_dir)
+    path = os.path.abspath(path)
+    if os.path.commonpath([root, path]) == root:
+        return os.path.relpath(path, root)
+    return path
+
+
+def _product_totals(items: list) -> dict:
+    # Quantidade e subtotal por produto de um pedido, no formato de archived_orders.products
+    totals = {}
+    for item in items:
+        quantity, subtotal = totals.get(str(item["product_id"]), (0, 0.0))
+        totals[str(item["product_id"])] = (quantity + item["quantity"], subtotal + item["subtotal"])
+    return {product_id: list(values) for product_id, values in totals.items()}
+
+
+def archive_orders(
+    db: Session,
+    older_than: Optional[datetime] = None,
+    batch_size: Optional[int] = None,
+    archive_dir: Optional[str] = None
+) -> dict:
+    """
+    Move pedidos entregues ou cancelados criados antes de older_than (padrão:
+    order_archive_retention_days atrás) para arquivos Parquet em archive_dir.
+
+    Cada lote de batch_size pedidos vira um arquivo e é removido de orders e
+    order_items na mesma transação que o registra em archived_orders, com um
+    commit por lote. Os agregados de vendas e o resumo por cliente não são
+    alterados: archived_orders guarda status, total e quantidades por produto,
+    e as reconstruções desses resumos incluem os pedidos arquivados.
+    Retorna {"orders": total arquivado, "files": arquivos gravados}.
+    """
+    _require_pyarrow()
+    if older_than is None:
+        older_than = datetime.utcnow() - timedelta(days=settings.order_archive_retention_days)
+    batch_size = batch_size or settings.order_archive_batch_size
+    archive_dir = archive_dir or settings.order_archive_dir
+    os.makedirs(archive_dir, exist_ok=True)
+
+    archived = 0
+    files = []
+    while True:
+        path = None
+        try:
+            # SKIP LOCKED: pedidos em uso por outra transação ficam para a próxima execução
+            orders = db.execute(
+                select(
+                    Order.id, Order.client_id, Order.owner_id, Order.status,
+                    Order.total, Order.created_at, Order.updated_at
+                )
+                .where(
+                    Order.status.in_(ARCHIVABLE_STATUSES),
+                    Order.created_at < older_than
+                )
+                .order_by(Order.created_at, Order.id)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            ).all()
+            if not orders:
+                db.rollback()
+                break
+
+            keys = [(order.id, order.created_at) for order in orders]
+            items = {}
+            rows = db.execute(
+                select(
+                    OrderItem.id, OrderItem.order_id, OrderItem.product_id,
+                    OrderItem.quantity, OrderItem.unit_price, OrderItem.subtotal
+                )
+                .where(tuple_(OrderItem.order_id, OrderItem.order_created_at).in_(keys))
+                .order_by(OrderItem.order_id, OrderItem.id)
+            )
+            for row in rows:
+                items.setdefault(row.order_id, []).append(dict(row._mapping))
+
+            records = [
+                {**dict(order._mapping), "items": items.get(order.id, [])}
+                for order in orders
+            ]
+            path = _write_archive_file(records, archive_dir)
+            reference = _archive_reference(path)
+
+            db.execute(insert(ArchivedOrder), [
+                {
+                    "order_id": record["id"],
+                    "owner_id": record["owner_id"],
+                    "client_id": record["client_id"],
+                    "created_at": record["created_at"],
+                    "status": record["status"],
+                    "total": record["total"],
+                    "units": sum(item["quantity"] for item in record["items"]),
+                    "products": _product_totals(record["items"]),
+                    "file": reference
+                }
+                for record in records
+            ])
+            # Remoção explícita dos itens: um DELETE por lote em vez do cascade linha a linha
+            db.execute(
+                delete(OrderItem)
+                .where(tuple_(OrderItem.order_id, OrderItem.order_created_at).in_(keys))
+                .execution_options(synchronize_session=False)
+            )
+            db.execute(
+                delete(Order)
+                .where(tuple_(Order.id, Order.created_at).in_(keys))
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            # Lote não registrado: o arquivo gravado não é referenciado por nenhum pedido
+            if path is not None and os.path.exists(path):
+                os.remove(path)
+            raise
+
+        archived += len(orders)
+        files.append(reference)
+        if len(orders) < batch_size:
+            break
+
+    return {"orders": archived, "files": files}
+
+
+def _archived_file_statement(order_id: int, owner_id: int):
+    return select(ArchivedOrder.file).where(
+        ArchivedOrder.order_id == order_id,
+        ArchivedOrder.owner_id == owner_id
+    )
+
+
+def _read_archived_order(file: str, order_id: int) -> Optional[dict]:
+    _require_pyarrow()
+    # O filtro usa as estatísticas dos row groups para ler só o trecho do pedido.
+    # Caminhos absolutos (arquivos gravados fora de order_archive_dir) são usados como estão.
+    table = pq.read_table(
+        os.path.join(settings.order_archive_dir, file),
+        filters=[("id", "=", order_id)]
+    )
+    records = table.to_pylist()
+    return records[0] if records else None
+
+
+def get_archived_order(db: Session, order_id: int, owner_id: int) -> Optional[dict]:
+    """
+    Busca um pedido arquivado do usuário, com os itens, no formato de
+    OrderWithItems. Retorna None se o pedido não estiver no arquivo.
+    """
+    file = db.execute(_archived_file_statement(order_id, owner_id)).scalar()
+    if file is None:
+        return None
+    return _read_archived_order(file, order_id)
+
+
+async def get_archived_order_async(db: AsyncSession, order_id: int, owner_id: int) -> Optional[dict]:
+    """get_archived_order para AsyncSession; o Parquet é lido fora do event loop."""
+    file = await db.scalar(_archived_file_statement(order_id, owner_id))
+    if file is None:
+        return None
+    return await asyncio.to_thread(_read_archived_order, file, order_id)
@@ -0,0 +1,68 @@
+# app/services/order_export.py
+import csv
+import io
+import json
+from typing import Iterable, Iterator
+
+ORDER_FIELDS = ["id", "client_id", "status", "total", "created_at", "updated_at"]
+ITEM_FIELDS = ["item_id", "product_id", "quantity", "unit_price", "subtotal"]
+
+
+def _to_json(value):
+    # Serializa tipos que o json não conhece (datetime, Decimal)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def ndjson_chunks(records: Iterable[dict], chunk_size: int = 500) -> Iterator[str]:
+    """
+    Converte pedidos em NDJSON (um objeto por linha), agrupando as linhas
+    em blocos para reduzir o número de escritas na resposta.
+    """
+    lines = []
+    for record in records:
+        lines.append(json.dumps(record, default=_to_json, ensure_ascii=False))
+        if len(lines) >= chunk_size:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def csv_chunks(records: Iterable[dict], include_items: bool = False, chunk_size: int = 500) -> Iterator[str]:
+    """
+    Converte pedidos em CSV com cabeçalho. Com include_items há uma linha
+    por item, repetindo as colunas do pedido.
+    """
+    header = ORDER_FIELDS + (ITEM_FIELDS if include_items else [])
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    rows = 1
+
+    for record in records:
+        order_values = [record[field] for field in ORDER_FIELDS]
+        if not include_items:
+            writer.writerow(order_values)
+            rows += 1
+        else:
+            # Pedido sem itens ainda gera uma linha, com as colunas de item vazias
+            for item in record["items"] or [{}]:
+                writer.writerow(order_values + [
+                    item.get("id"),
+                    item.get("product_id"),
+                    item.get("quantity"),
+                    item.get("unit_price"),
+                    item.get("subtotal")
+                ])
+                rows += 1
+
+        if rows >= chunk_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+            rows = 0
+
+    if buffer.tell():
+        yield buffer.getvalue()
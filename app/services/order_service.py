@@ -1,11 +1,63 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from typing import List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import desc, func, insert, or_, select, tuple_, update
+from typing import Iterator, List, Optional, Tuple, Type, Union
 from datetime import datetime
+from pydantic import BaseModel
 
 from app.core.models import Order, OrderItem, OrderStatus, Product, Client
-from app.schemas.order import OrderCreate, OrderUpdate
+from app.schemas.order import OrderCreate, OrderUpdate, OrderWithItems
 from app.services.exceptions import NotFoundException, BusinessRuleException
+from app.services.pagination import encode_cursor, decode_cursor
+from app.services.order_archive_service import get_archived_order, get_archived_order_async
+from app.services.product_service import get_products_many
+from app.services.client_stats_service import (
+    add_orders_to_client_stats,
+    change_orders_status_in_client_stats,
+    remove_orders_from_client_stats,
+)
+from app.services.sales_report_service import (
+    add_orders_to_rollups,
+    remove_orders_from_rollups,
+)
+from app.services.stock_service import (
+    order_quantities,
+    release_stock,
+    reserve_order_stock,
+    reserve_stock,
+)
+
+
+# Transições válidas do fluxo do pedido
+ORDER_STATUS_TRANSITIONS = {
+    OrderStatus.PENDING.value: (
+        OrderStatus.CONFIRMED.value,
+        OrderStatus.CANCELLED.value
+    ),
+    OrderStatus.CONFIRMED.value: (
+        OrderStatus.PROCESSING.value,
+        OrderStatus.CANCELLED.value
+    ),
+    OrderStatus.PROCESSING.value: (
+        OrderStatus.SHIPPED.value,
+        OrderStatus.CANCELLED.value
+    ),
+    OrderStatus.SHIPPED.value: (OrderStatus.DELIVERED.value,),
+    OrderStatus.DELIVERED.value: (),
+    OrderStatus.CANCELLED.value: ()
+}
+
+# Para cada status de destino, os status de origem que podem levar a ele
+ORDER_STATUS_PREDECESSORS = {
+    target: tuple(
+        source for source, targets in ORDER_STATUS_TRANSITIONS.items()
+        if target in targets
+    )
+    for target in ORDER_STATUS_TRANSITIONS
+}
+
+# Máximo de pedidos recusados listados em uma transição em lote por filtro
+MAX_BATCH_REJECTED = 100
 
 
 class OrderService:
@@ -40,7 +92,45 @@ class OrderService:
             return 0
 
     @staticmethod
-    def create_order(db: Session, order_data: OrderCreate, current_user_id: int) -> Order:
+    def _on_orders_created(db: Session, order_ids: List[int]) -> None:
+        # Atualiza os agregados derivados na mesma transação que criou os pedidos
+        add_orders_to_rollups(db, order_ids)
+        add_orders_to_client_stats(db, order_ids)
+
+    @staticmethod
+    def _on_orders_voided(db: Session, order_ids: List[int]) -> None:
+        # Retira dos agregados pedidos cancelados ou excluídos (antes da exclusão)
+        remove_orders_from_rollups(db, order_ids)
+
+    @staticmethod
+    def _on_orders_status_changed(db: Session, orders: List[Tuple[int, float, str]], new_status: str) -> None:
+        # Move os pedidos (client_id, total, status anterior) para o novo status no resumo por cliente
+        change_orders_status_in_client_stats(db, orders, new_status)
+
+    @staticmethod
+    def _on_orders_deleted(db: Session, order_ids: List[int]) -> None:
+        # Retira do resumo por cliente pedidos excluídos (antes da exclusão)
+        remove_orders_from_client_stats(db, order_ids)
+
+    @staticmethod
+    def _sum_quantities(orders_data) -> dict:
+        # Soma as quantidades por produto de vários pedidos
+        quantities = {}
+        for order_data in orders_data:
+            for item in order_data.items:
+                quantities[item.product_id] = quantities.get(item.product_id, 0) + item.quantity
+        return quantities
+
+    @staticmethod
+    def create_order(
+        db: Session,
+        order_data: OrderCreate,
+        current_user_id: int,
+        commit: bool = True
+    ) -> Order:
+        # Com commit=False o pedido fica na transação aberta e quem chama confirma
+        # (run_idempotent grava a resposta no mesmo commit)
+
         # Valida se o cliente pertence ao usuário autenticado
         client = db.query(Client).filter(
             Client.id == order_data.client_id,
@@ -52,47 +142,27 @@ class OrderService:
 
         product_ids = [item.product_id for item in order_data.items]
 
-        # Carrega apenas dados necessários para cálculo do pedido
-        products = db.query(Product.id, Product.name, Product.price).filter(
-            Product.id.in_(product_ids)
-        ).all()
+        # Preços do cache do catálogo; o banco só é consultado para produtos ausentes
+        products = get_products_many(db, product_ids)
 
         # Garante que todos os produtos informados existem
         if len(products) != len(product_ids):
-            found_ids = []
-            for p in products:
-                pid = p[0] if isinstance(p, tuple) else OrderService._get_product_id(p)
-                found_ids.append(pid)
-
-            missing_ids = [pid for pid in product_ids if pid not in found_ids]
+            missing_ids = [pid for pid in product_ids if pid not in products]
             raise NotFoundException(f"Produtos não encontrados: {missing_ids}")
 
         order = Order(
             client_id=order_data.client_id,
+            owner_id=current_user_id,
             status=OrderStatus.PENDING.value
         )
         db.add(order)
         db.flush()
 
         # Mapa auxiliar para acesso rápido aos dados do produto
-        product_map = {}
-        for p in products:
-            if isinstance(p, tuple):
-                pid, pname, pprice = p
-                product_map[pid] = {
-                    "id": pid,
-                    "name": pname,
-                    "price": pprice,
-                    "stock": 0
-                }
-            else:
-                pid = OrderService._get_product_id(p)
-                product_map[pid] = {
-                    "id": pid,
-                    "name": p.name if hasattr(p, "name") else "",
-                    "price": p.price if hasattr(p, "price") else 0.0,
-                    "stock": p.stock if hasattr(p, "stock") else 0
-                }
+        product_map = {
+            pid: {"id": pid, "name": product.name, "price": product.price}
+            for pid, product in products.items()
+        }
 
         total = 0.0
 
@@ -101,18 +171,12 @@ class OrderService:
             if not product_info:
                 raise NotFoundException(f"Produto ID {item_data.product_id} não encontrado")
 
-            # Regra de estoque aplicada apenas quando disponível no modelo
-            if product_info["stock"] < item_data.quantity:
-                raise BusinessRuleException(
-                    f"Estoque insuficiente para produto '{product_info['name']}'. "
-                    f"Disponível: {product_info['stock']}, Solicitado: {item_data.quantity}"
-                )
-
             unit_price = product_info["price"]
             subtotal = unit_price * item_data.quantity
 
             order_item = OrderItem(
                 order_id=order.id,
+                order_created_at=order.created_at,
                 product_id=item_data.product_id,
                 quantity=item_data.quantity,
                 unit_price=unit_price,
@@ -122,50 +186,486 @@ class OrderService:
             total += subtotal
 
         order.total = total
-        db.commit()
-        db.refresh(order)
+
+        # O estoque é debitado por último, logo antes do commit, para que os
+        # bloqueios das linhas de produto durem o menor tempo possível
+        try:
+            db.flush()
+            OrderService._on_orders_created(db, [order.id])
+            reserve_order_stock(
+                db,
+                {item.product_id: item.quantity for item in order_data.items}
+            )
+            if commit:
+                db.commit()
+            db.refresh(order)
+        except Exception:
+            db.rollback()
+            raise
 
         return order
 
     @staticmethod
-    def get_orders(
+    def create_orders_batch(
+        db: Session,
+        orders_data: List[OrderCreate],
+        current_user_id: int
+    ) -> List[dict]:
+        """
+        Cria vários pedidos em uma única transação.
+
+        Clientes e produtos de todo o lote são validados com uma consulta cada,
+        e pedidos e itens são gravados com INSERT de múltiplas linhas.
+        Retorna um resultado por pedido, na mesma ordem da entrada.
+        """
+        client_ids = {order_data.client_id for order_data in orders_data}
+        product_ids = {
+            item.product_id
+            for order_data in orders_data
+            for item in order_data.items
+        }
+
+        # Clientes do lote que pertencem ao usuário autenticado
+        valid_client_ids = set(db.scalars(
+            select(Client.id).where(
+                Client.id.in_(client_ids),
+                Client.user_id == current_user_id
+            )
+        ).all())
+
+        # Preço e estoque atuais de todos os produtos citados no lote
+        prices = {}
+        available = {}
+        for pid, price, stock in db.execute(
+            select(Product.id, Product.price, Product.stock).where(Product.id.in_(product_ids))
+        ).all():
+            prices[pid] = price
+            available[pid] = stock or 0
+
+        results: List[Optional[dict]] = [None] * len(orders_data)
+        accepted = []
+
+        for index, order_data in enumerate(orders_data):
+            if order_data.client_id not in valid_client_ids:
+                results[index] = {
+                    "index": index,
+                    "success": False,
+                    "error": "Cliente não encontrado ou não pertence ao usuário"
+                }
+                continue
+
+            missing_ids = [
+                item.product_id for item in order_data.items
+                if item.product_id not in prices
+            ]
+            if missing_ids:
+                results[index] = {
+                    "index": index,
+                    "success": False,
+                    "error": f"Produtos não encontrados: {missing_ids}"
+                }
+                continue
+
+            # Aloca o estoque lido acima na ordem do lote; quem não couber é rejeitado
+            short_ids = [
+                item.product_id for item in order_data.items
+                if available[item.product_id] < item.quantity
+            ]
+            if short_ids:
+                results[index] = {
+                    "index": index,
+                    "success": False,
+                    "error": f"Estoque insuficiente para os produtos: {short_ids}"
+                }
+                continue
+            for item in order_data.items:
+                available[item.product_id] -= item.quantity
+
+            total = sum(
+                prices[item.product_id] * item.quantity
+                for item in order_data.items
+            )
+            accepted.append((index, order_data, total))
+
+        if not accepted:
+            return results
+
+        try:
+            # Débito de estoque de todo o lote em um único UPDATE. Se outra transação
+            # consumiu o estoque desde a leitura, os pedidos com os produtos que
+            # faltaram são rejeitados e o que foi debitado para eles é devolvido.
+            quantities = OrderService._sum_quantities(order_data for _, order_data, _ in accepted)
+            reserved = reserve_stock(db, quantities)
+            short_ids = set(quantities) - set(reserved)
+            if short_ids:
+                rejected = [
+                    entry for entry in accepted
+                    if any(item.product_id in short_ids for item in entry[1].items)
+                ]
+                for index, order_data, _ in rejected:
+                    failed_ids = sorted(
+                        item.product_id for item in order_data.items
+                        if item.product_id in short_ids
+                    )
+                    results[index] = {
+                        "index": index,
+                        "success": False,
+                        "error": f"Estoque insuficiente para os produtos: {failed_ids}"
+                    }
+                accepted = [entry for entry in accepted if entry not in rejected]
+                surplus = OrderService._sum_quantities(order_data for _, order_data, _ in rejected)
+                release_stock(db, {
+                    pid: quantity for pid, quantity in surplus.items()
+                    if pid not in short_ids
+                })
+
+            if not accepted:
+                db.commit()
+                return results
+
+            # Um único INSERT ... RETURNING para todos os pedidos válidos,
+            # com as linhas retornadas na ordem dos parâmetros
+            created_rows = db.execute(
+                insert(Order).returning(
+                    Order.id,
+                    Order.client_id,
+                    Order.status,
+                    Order.total,
+                    Order.created_at,
+                    Order.updated_at,
+                    sort_by_parameter_order=True
+                ),
+                [
+                    {
+                        "client_id": order_data.client_id,
+                        "owner_id": current_user_id,
+                        "status": OrderStatus.PENDING.value,
+                        "total": total
+                    }
+                    for _, order_data, total in accepted
+                ]
+            ).all()
+
+            item_rows = []
+            for (_, order_data, _), row in zip(accepted, created_rows):
+                for item in order_data.items:
+                    unit_price = prices[item.product_id]
+                    item_rows.append({
+                        "order_id": row.id,
+                        "order_created_at": row.created_at,
+                        "product_id": item.product_id,
+                        "quantity": item.quantity,
+                        "unit_price": unit_price,
+                        "subtotal": unit_price * item.quantity
+                    })
+
+            db.execute(insert(OrderItem), item_rows)
+            OrderService._on_orders_created(db, [row.id for row in created_rows])
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        for (index, _, _), row in zip(accepted, created_rows):
+            results[index] = {
+                "index": index,
+                "success": True,
+                "order": dict(row._mapping)
+            }
+
+        return results
+
+    @staticmethod
+    def _orders_query(
         db: Session,
         current_user_id: int,
         client_id: Optional[int] = None,
         status: Optional[str] = None,
         start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None,
-        skip: int = 0,
-        limit: int = 100
-    ) -> Tuple[List[Order], int]:
-        query = db.query(Order).join(Order.client).filter(Client.user_id == current_user_id)
+        end_date: Optional[datetime] = None
+    ):
+        # Consulta base de pedidos do usuário com os filtros opcionais aplicados
+        return db.query(Order).filter(*OrderService._orders_criteria(
+            current_user_id, client_id, status, start_date, end_date
+        ))
+
+    @staticmethod
+    def _orders_criteria(
+        current_user_id: int,
+        client_id: Optional[int] = None,
+        status: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> list:
+        # owner_id é desnormalizado de clients.user_id: o filtro de dono não precisa
+        # de JOIN e usa o índice (owner_id, created_at DESC, id DESC).
+        criteria = [Order.owner_id == current_user_id]
 
         if client_id:
-            query = query.filter(Order.client_id == client_id)
+            criteria.append(Order.client_id == client_id)
 
         if status:
-            query = query.filter(Order.status == status)
+            criteria.append(Order.status == status)
 
         if start_date:
-            query = query.filter(Order.created_at >= start_date)
+            criteria.append(Order.created_at >= start_date)
 
         if end_date:
-            query = query.filter(Order.created_at <= end_date)
+            criteria.append(Order.created_at <= end_date)
+
+        return criteria
+
+    @staticmethod
+    def _load_options(schema: Optional[Type[BaseModel]] = None, many: bool = False) -> list:
+        # Escolhe o carregamento dos relacionamentos conforme o schema de resposta,
+        # evitando um lazy load de Order.items por pedido durante a serialização.
+        if schema is None or not issubclass(schema, OrderWithItems):
+            return []
+        # Um pedido: JOIN único. Vários pedidos: um SELECT ... IN extra para todos os itens
+        if many:
+            return [selectinload(Order.items)]
+        return [joinedload(Order.items)]
+
+    @staticmethod
+    def _explain_sql(statement, dialect) -> str:
+        # EXPLAIN com os parâmetros embutidos, executado direto no driver
+        compiled = statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+        return f"EXPLAIN (FORMAT JSON) {compiled}"
+
+    @staticmethod
+    def _plan_rows(plan) -> int:
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    @staticmethod
+    def _estimate_count(db: Session, query) -> int:
+        # Usa a estimativa de linhas do planejador (EXPLAIN) em vez de percorrer a tabela
+        sql = OrderService._explain_sql(query.order_by(None).statement, db.get_bind().dialect)
+        return OrderService._plan_rows(db.connection().exec_driver_sql(sql).scalar())
+
+    @staticmethod
+    def _cursor_criteria(cursor: str) -> list:
+        position = decode_cursor(cursor)
+        try:
+            last_created_at = datetime.fromisoformat(position["created_at"])
+            last_id = int(position["id"])
+        except (KeyError, TypeError, ValueError):
+            raise BusinessRuleException("Cursor de paginação inválido")
+
+        # O limite simples em created_at permite ao planejador descartar as
+        # partições mensais posteriores ao cursor; a comparação de tupla sozinha não
+        return [
+            Order.created_at <= last_created_at,
+            tuple_(Order.created_at, Order.id) < tuple_(last_created_at, last_id)
+        ]
+
+    @staticmethod
+    def _next_cursor(orders: List[Order], limit: int) -> Optional[str]:
+        if len(orders) < limit:
+            return None
+        last = orders[-1]
+        return encode_cursor({
+            "created_at": last.created_at.isoformat(),
+            "id": last.id
+        })
+
+    @staticmethod
+    def get_orders(
+        db: Session,
+        current_user_id: int,
+        client_id: Optional[int] = None,
+        status: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        skip: int = 0,
+        limit: int = 100
+    ) -> Tuple[List[Order], int]:
+        query = OrderService._orders_query(
+            db, current_user_id, client_id, status, start_date, end_date
+        )
 
         total = query.count()
 
-        orders = query.order_by(desc(Order.created_at)).offset(skip).limit(limit).all()
+        orders = query.order_by(desc(Order.created_at), desc(Order.id)).offset(skip).limit(limit).all()
 
         return orders, total
 
     @staticmethod
-    def get_order_by_id(db: Session, order_id: int, current_user_id: int) -> Order:
-        order = db.query(Order).join(Order.client).filter(
+    def get_orders_page(
+        db: Session,
+        current_user_id: int,
+        client_id: Optional[int] = None,
+        status: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100,
+        count_mode: Optional[str] = None,
+        schema: Optional[Type[BaseModel]] = None
+    ) -> Tuple[List[Order], Optional[str], Optional[int]]:
+        """
+        Lista pedidos paginando por cursor (keyset) em (created_at, id).
+
+        O custo de cada página independe da profundidade. O offset (skip) só é
+        usado quando nenhum cursor é informado, por compatibilidade.
+        A contagem é opcional: "exact" executa COUNT e "estimate" usa o planejador.
+        Com schema=OrderWithItems os itens de todos os pedidos vêm em uma consulta extra.
+        Retorna (pedidos, próximo cursor ou None, total ou None).
+        """
+        query = OrderService._orders_query(
+            db, current_user_id, client_id, status, start_date, end_date
+        )
+
+        total = None
+        if count_mode == "exact":
+            total = query.count()
+        elif count_mode == "estimate":
+            total = OrderService._estimate_count(db, query)
+
+        query = query.order_by(desc(Order.created_at), desc(Order.id))
+
+        if cursor:
+            query = query.filter(*OrderService._cursor_criteria(cursor))
+        elif skip:
+            query = query.offset(skip)
+
+        orders = query.options(
+            *OrderService._load_options(schema, many=True)
+        ).limit(limit).all()
+
+        return orders, OrderService._next_cursor(orders, limit), total
+
+    @staticmethod
+    async def get_orders_page_async(
+        db: AsyncSession,
+        current_user_id: int,
+        client_id: Optional[int] = None,
+        status: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100,
+        count_mode: Optional[str] = None,
+        schema: Optional[Type[BaseModel]] = None
+    ) -> Tuple[List[Order], Optional[str], Optional[int]]:
+        """get_orders_page para AsyncSession (mesmas consultas, pelo asyncpg)."""
+        criteria = OrderService._orders_criteria(
+            current_user_id, client_id, status, start_date, end_date
+        )
+
+        total = None
+        if count_mode == "exact":
+            total = await db.scalar(select(func.count(Order.id)).where(*criteria))
+        elif count_mode == "estimate":
+            sql = OrderService._explain_sql(select(Order).where(*criteria), db.get_bind().dialect)
+            connection = await db.connection()
+            total = OrderService._plan_rows((await connection.exec_driver_sql(sql)).scalar())
+
+        statement = select(Order).where(*criteria).order_by(desc(Order.created_at), desc(Order.id))
+
+        if cursor:
+            statement = statement.where(*OrderService._cursor_criteria(cursor))
+        elif skip:
+            statement = statement.offset(skip)
+
+        orders = list((await db.scalars(
+            statement.options(*OrderService._load_options(schema, many=True)).limit(limit)
+        )).all())
+
+        return orders, OrderService._next_cursor(orders, limit), total
+
+    @staticmethod
+    def iter_orders_export(
+        db: Session,
+        current_user_id: int,
+        client_id: Optional[int] = None,
+        status: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        include_items: bool = False,
+        batch_size: int = 1000
+    ) -> Iterator[dict]:
+        """
+        Percorre os pedidos filtrados com um cursor no servidor (yield_per),
+        produzindo um dicionário por pedido sem carregar o resultado inteiro.
+        Com include_items cada pedido traz a lista "items".
+        """
+        query = OrderService._orders_query(
+            db, current_user_id, client_id, status, start_date, end_date
+        )
+        order_columns = (
+            Order.id, Order.client_id, Order.status,
+            Order.total, Order.created_at, Order.updated_at
+        )
+
+        if not include_items:
+            rows = query.with_entities(*order_columns).order_by(
+                desc(Order.created_at), desc(Order.id)
+            ).yield_per(batch_size)
+            for row in rows:
+                yield dict(row._mapping)
+            return
+
+        # Pedidos e itens em uma só consulta; os itens de cada pedido chegam em sequência
+        rows = query.outerjoin(Order.items).with_entities(
+            *order_columns,
+            OrderItem.id.label("item_id"),
+            OrderItem.product_id,
+            OrderItem.quantity,
+            OrderItem.unit_price,
+            OrderItem.subtotal
+        ).order_by(
+            desc(Order.created_at), desc(Order.id), OrderItem.id
+        ).yield_per(batch_size)
+
+        current = None
+        for row in rows:
+            if current is None or current["id"] != row.id:
+                if current is not None:
+                    yield current
+                current = {column.key: getattr(row, column.key) for column in order_columns}
+                current["items"] = []
+            if row.item_id is not None:
+                current["items"].append({
+                    "id": row.item_id,
+                    "product_id": row.product_id,
+                    "quantity": row.quantity,
+                    "unit_price": row.unit_price,
+                    "subtotal": row.subtotal
+                })
+        if current is not None:
+            yield current
+
+    @staticmethod
+    def get_order_by_id(
+        db: Session,
+        order_id: int,
+        current_user_id: int,
+        schema: Optional[Type[BaseModel]] = None,
+        for_update: bool = False,
+        include_archived: bool = False
+    ) -> Union[Order, dict]:
+        # Com include_archived, um pedido ausente é procurado no arquivo Parquet
+        # e retornado como dicionário (somente leitura)
+        query = db.query(Order).options(
+            *OrderService._load_options(schema)
+        ).filter(
             Order.id == order_id,
-            Client.user_id == current_user_id
-        ).first()
+            Order.owner_id == current_user_id
+        )
+
+        # Bloqueia o pedido quando ele vai mudar, serializando transições concorrentes
+        if for_update:
+            query = query.with_for_update(of=Order)
+
+        order = query.first()
 
         if not order:
+            if include_archived:
+                archived = get_archived_order(db, order_id, current_user_id)
+                if archived is not None:
+                    return archived
             raise NotFoundException("Pedido não encontrado")
 
         # Garante que atributos principais estejam carregados antes do retorno
@@ -175,6 +675,35 @@ class OrderService:
 
         return order
 
+    @staticmethod
+    async def get_order_by_id_async(
+        db: AsyncSession,
+        order_id: int,
+        current_user_id: int,
+        schema: Optional[Type[BaseModel]] = None,
+        include_archived: bool = False
+    ) -> Union[Order, dict]:
+        """get_order_by_id para AsyncSession (leitura, sem bloqueio da linha)."""
+        result = await db.execute(
+            select(Order).options(
+                *OrderService._load_options(schema)
+            ).where(
+                Order.id == order_id,
+                Order.owner_id == current_user_id
+            )
+        )
+        # unique(): o joinedload dos itens repete o pedido em cada linha
+        order = result.unique().scalar_one_or_none()
+
+        if not order:
+            if include_archived:
+                archived = await get_archived_order_async(db, order_id, current_user_id)
+                if archived is not None:
+                    return archived
+            raise NotFoundException("Pedido não encontrado")
+
+        return order
+
     @staticmethod
     def update_order_status(
         db: Session,
@@ -182,39 +711,20 @@ class OrderService:
         status_update: OrderUpdate,
         current_user_id: int
     ) -> Order:
-        order = OrderService.get_order_by_id(db, order_id, current_user_id)
+        order = OrderService.get_order_by_id(db, order_id, current_user_id, for_update=True)
 
         if not status_update.status:
             return order
 
         new_status = status_update.status.value
 
-        # Define transições válidas do fluxo do pedido
-        valid_transitions = {
-            OrderStatus.PENDING.value: [
-                OrderStatus.CONFIRMED.value,
-                OrderStatus.CANCELLED.value
-            ],
-            OrderStatus.CONFIRMED.value: [
-                OrderStatus.PROCESSING.value,
-                OrderStatus.CANCELLED.value
-            ],
-            OrderStatus.PROCESSING.value: [
-                OrderStatus.SHIPPED.value,
-                OrderStatus.CANCELLED.value
-            ],
-            OrderStatus.SHIPPED.value: [OrderStatus.DELIVERED.value],
-            OrderStatus.DELIVERED.value: [],
-            OrderStatus.CANCELLED.value: []
-        }
-
         current_status = (
             str(order.status)
             if order.status is not None
             else OrderStatus.PENDING.value
         )
 
-        allowed_next = valid_transitions.get(current_status, [])
+        allowed_next = list(ORDER_STATUS_TRANSITIONS.get(current_status, ()))
 
         if new_status not in allowed_next:
             raise BusinessRuleException(
@@ -223,14 +733,153 @@ class OrderService:
             )
 
         setattr(order, "status", new_status)
-        db.commit()
+
+        try:
+            # Pedido cancelado devolve ao estoque o que havia reservado
+            if new_status == OrderStatus.CANCELLED.value:
+                release_stock(db, order_quantities(db, [order.id]))
+                OrderService._on_orders_voided(db, [order.id])
+            OrderService._on_orders_status_changed(
+                db, [(order.client_id, order.total, current_status)], new_status
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
         db.refresh(order)
 
         return order
 
+    @staticmethod
+    def update_orders_status_batch(
+        db: Session,
+        new_status: str,
+        current_user_id: int,
+        order_ids: Optional[List[int]] = None,
+        client_id: Optional[int] = None,
+        status: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> dict:
+        """
+        Aplica uma transição de status a vários pedidos com um único UPDATE.
+
+        Os pedidos são escolhidos por order_ids ou pelos filtros; só mudam os que
+        estão em um status de origem permitido para new_status.
+        Retorna {"updated": [ids], "rejected": [{"order_id", "current_status", "reason"}],
+        "rejected_count": n}; com filtros, rejected traz só os primeiros
+        MAX_BATCH_REJECTED pedidos recusados.
+        """
+        if order_ids is None and not any((client_id, status, start_date, end_date)):
+            raise BusinessRuleException("Informe os IDs dos pedidos ou ao menos um filtro")
+
+        predecessors = ORDER_STATUS_PREDECESSORS.get(new_status, ())
+
+        # Pedidos do usuário autenticado que correspondem ao alvo da transição
+        criteria = [Order.owner_id == current_user_id]
+        if order_ids is not None:
+            criteria.append(Order.id.in_(order_ids))
+        if client_id:
+            criteria.append(Order.client_id == client_id)
+        if status:
+            criteria.append(Order.status == status)
+        if start_date:
+            criteria.append(Order.created_at >= start_date)
+        if end_date:
+            criteria.append(Order.created_at <= end_date)
+
+        # Todos os pedidos do alvo, bloqueados: o status lido aqui decide quem muda
+        # e quem é recusado, sem interferência de outras transações
+        targets = (
+            select(Order.id, Order.created_at, Order.status)
+            .where(*criteria)
+            .order_by(Order.id)
+            .with_for_update()
+            .cte("targets")
+        )
+        changed = (
+            update(Order)
+            .where(
+                Order.id == targets.c.id,
+                Order.created_at == targets.c.created_at,
+                targets.c.status.in_(predecessors)
+            )
+            .values(status=new_status, updated_at=func.now())
+            .returning(Order.id, Order.client_id, Order.total)
+            .cte("changed")
+        )
+
+        # Alterados e recusados no mesmo comando; com filtros, a lista de recusados
+        # é limitada e o total vem da contagem
+        rejected_flag = changed.c.id.is_(None)
+        outcome = (
+            select(
+                targets.c.id,
+                targets.c.status,
+                changed.c.client_id,
+                changed.c.total,
+                rejected_flag.label("rejected"),
+                func.count().filter(rejected_flag).over().label("rejected_count"),
+                func.row_number().over(partition_by=rejected_flag, order_by=targets.c.id).label("position")
+            )
+            .select_from(targets.outerjoin(changed, changed.c.id == targets.c.id))
+            .subquery()
+        )
+        statement = select(outcome).order_by(outcome.c.id)
+        if order_ids is None:
+            statement = statement.where(
+                or_(outcome.c.rejected.is_(False), outcome.c.position <= MAX_BATCH_REJECTED)
+            )
+
+        try:
+            rows = db.execute(statement).all()
+            updated_rows = [row for row in rows if not row.rejected]
+            updated_ids = [row.id for row in updated_rows]
+
+            # Pedidos cancelados devolvem ao estoque o que haviam reservado
+            if new_status == OrderStatus.CANCELLED.value and updated_ids:
+                release_stock(db, order_quantities(db, updated_ids))
+                OrderService._on_orders_voided(db, updated_ids)
+            OrderService._on_orders_status_changed(
+                db,
+                [(row.client_id, row.total, row.status) for row in updated_rows],
+                new_status
+            )
+
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        rejected = [
+            {
+                "order_id": row.id,
+                "current_status": row.status,
+                "reason": (
+                    f"Transição inválida de '{row.status}' para '{new_status}'. "
+                    f"Transições permitidas: {list(ORDER_STATUS_TRANSITIONS.get(row.status, ()))}"
+                )
+            }
+            for row in rows if row.rejected
+        ]
+        rejected_count = rows[0].rejected_count if rows else 0
+
+        # IDs informados que não existem ou pertencem a outro usuário
+        if order_ids is not None:
+            found = {row.id for row in rows}
+            missing = sorted(set(order_ids) - found)
+            rejected.extend(
+                {"order_id": oid, "current_status": None, "reason": "Pedido não encontrado"}
+                for oid in missing
+            )
+            rejected_count += len(missing)
+
+        return {"updated": sorted(updated_ids), "rejected": rejected, "rejected_count": rejected_count}
+
     @staticmethod
     def delete_order(db: Session, order_id: int, current_user_id: int) -> bool:
-        order = OrderService.get_order_by_id(db, order_id, current_user_id)
+        order = OrderService.get_order_by_id(db, order_id, current_user_id, for_update=True)
 
         order_status = (
             str(order.status)
@@ -245,7 +894,67 @@ class OrderService:
                 "Apenas pedidos pendentes podem ser excluídos."
             )
 
-        db.delete(order)
-        db.commit()
+        try:
+            # Devolve ao estoque a reserva do pedido antes de removê-lo
+            release_stock(db, order_quantities(db, [order.id]))
+            OrderService._on_orders_voided(db, [order.id])
+            OrderService._on_orders_deleted(db, [order.id])
+            db.delete(order)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
 
         return True
+
+    # Escritas na AsyncSession: run_sync executa a mesma transação dos métodos
+    # síncronos na sessão interna da AsyncSession. Cada consulta aguarda o asyncpg
+    # sem ocupar uma thread nem bloquear o event loop; as regras de estoque,
+    # status e resumos ficam em um único lugar.
+
+    @staticmethod
+    async def create_order_async(db: AsyncSession, order_data: OrderCreate, current_user_id: int) -> Order:
+        return await db.run_sync(OrderService.create_order, order_data, current_user_id)
+
+    @staticmethod
+    async def create_orders_batch_async(
+        db: AsyncSession,
+        orders_data: List[OrderCreate],
+        current_user_id: int
+    ) -> List[dict]:
+        return await db.run_sync(OrderService.create_orders_batch, orders_data, current_user_id)
+
+    @staticmethod
+    async def update_order_status_async(
+        db: AsyncSession,
+        order_id: int,
+        status_update: OrderUpdate,
+        current_user_id: int
+    ) -> Order:
+        return await db.run_sync(OrderService.update_order_status, order_id, status_update, current_user_id)
+
+    @staticmethod
+    async def update_orders_status_batch_async(
+        db: AsyncSession,
+        new_status: str,
+        current_user_id: int,
+        order_ids: Optional[List[int]] = None,
+        client_id: Optional[int] = None,
+        status: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> dict:
+        return await db.run_sync(
+            OrderService.update_orders_status_batch,
+            new_status,
+            current_user_id,
+            order_ids=order_ids,
+            client_id=client_id,
+            status=status,
+            start_date=start_date,
+            end_date=end_date
+        )
+
+    @staticmethod
+    async def delete_order_async(db: AsyncSession, order_id: int, current_user_id: int) -> bool:
+        return await db.run_sync(OrderService.delete_order, order_id, current_user_id)
@@ -0,0 +1,30 @@
+# app/services/pagination.py
+import base64
+import json
+from typing import Any, Dict
+
+from app.services.exceptions import BusinessRuleException
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    """
+    Codifica a posição da última linha de uma página em um cursor opaco.
+    """
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """
+    Decodifica um cursor gerado por encode_cursor.
+    Lança BusinessRuleException se o cursor estiver malformado.
+    """
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(cursor + padding))
+    except (ValueError, TypeError):
+        raise BusinessRuleException("Cursor de paginação inválido")
+
+    if not isinstance(values, dict):
+        raise BusinessRuleException("Cursor de paginação inválido")
+    return values
@@ -0,0 +1,135 @@
+# app/services/partition_service.py
+from datetime import date
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+# Cria as partições mensais de orders e order_items que faltam entre duas datas.
+# A mesma definição é instalada pela migration de particionamento.
+ENSURE_PARTITIONS_FUNCTION = """
+CREATE OR REPLACE FUNCTION ensure_order_partitions(from_date date, to_date date)
+RETURNS integer AS $$
+DECLARE
+    month_start date := date_trunc('month', from_date)::date;
+    month_end date;
+    suffix text;
+    created integer := 0;
+BEGIN
+    WHILE month_start <= to_date LOOP
+        month_end := (month_start + interval '1 month')::date;
+        suffix := to_char(month_start, 'YYYYMM');
+        IF to_regclass('orders_' || suffix) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF orders FOR VALUES FROM (%L) TO (%L)',
+                'orders_' || suffix, month_start, month_end
+            );
+            created := created + 1;
+        END IF;
+        IF to_regclass('order_items_' || suffix) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF order_items FOR VALUES FROM (%L) TO (%L)',
+                'order_items_' || suffix, month_start, month_end
+            );
+        END IF;
+        month_start := month_end;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def _month_suffix(month: date) -> str:
+    return month.strftime("%Y%m")
+
+
+def ensure_order_partitions(db: Session, months_ahead: Optional[int] = None) -> int:
+    """
+    Garante partições de orders e order_items do mês atual até months_ahead
+    meses à frente. Retorna quantos meses foram criados.
+    """
+    if months_ahead is None:
+        months_ahead = settings.order_partitions_months_ahead
+    created = db.execute(
+        text(
+            "SELECT ensure_order_partitions(current_date, "
+            "(current_date + make_interval(months => :months))::date)"
+        ),
+        {"months": months_ahead}
+    ).scalar()
+    db.commit()
+    return created
+
+
+def list_order_partitions(db: Session) -> List[date]:
+    """
+    Retorna o mês (primeiro dia) de cada partição mensal de orders, em ordem.
+    """
+    names = db.execute(text(
+        "SELECT c.relname FROM pg_inherits AS i "
+        "JOIN pg_class AS c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = 'orders'::regclass"
+    )).scalars().all()
+
+    months = []
+    for name in names:
+        suffix = name[len("orders_"):]
+        if suffix.isdigit() and len(suffix) == 6:
+            months.append(date(int(suffix[:4]), int(suffix[4:]), 1))
+    return sorted(months)
+
+
+def detach_order_partitions(
+    db: Session,
+    before: date,
+    drop: bool = False,
+    lock_timeout_ms: int = 5000
+) -> List[str]:
+    """
+    Desanexa as partições de meses anteriores a before (orders e order_items).
+
+    Desanexar só altera o catálogo: os dados saem das consultas sem DELETE
+    em massa e continuam nas tabelas desanexadas, que podem ser arquivadas ou
+    removidas (drop=True). Os agregados de vendas não são alterados.
+    Retorna os nomes das tabelas desanexadas.
+    """
+    detached = []
+    try:
+        # DETACH bloqueia a tabela-mãe: desiste rápido em vez de enfileirar consultas
+        db.execute(
+            text("SELECT set_config('lock_timeout', :timeout, true)"),
+            {"timeout": f"{lock_timeout_ms}ms"}
+        )
+        for month in list_order_partitions(db):
+            if month >= before.replace(day=1):
+                continue
+            suffix = _month_suffix(month)
+            items_table = f"order_items_{suffix}"
+            orders_table = f"orders_{suffix}"
+
+            db.execute(text(f"ALTER TABLE order_items DETACH PARTITION {items_table}"))
+            # A FK herdada continua na tabela desanexada e impediria desanexar o mês de orders
+            constraints = db.execute(
+                text(
+                    "SELECT conname FROM pg_constraint "
+                    "WHERE conrelid = CAST(:table AS regclass) AND contype = 'f' "
+                    "AND confrelid = 'orders'::regclass"
+                ),
+                {"table": items_table}
+            ).scalars().all()
+            for name in constraints:
+                db.execute(text(f'ALTER TABLE {items_table} DROP CONSTRAINT "{name}"'))
+            db.execute(text(f"ALTER TABLE orders DETACH PARTITION {orders_table}"))
+
+            if drop:
+                db.execute(text(f"DROP TABLE {items_table}, {orders_table}"))
+            detached += [orders_table, items_table]
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return detached
@@ -0,0 +1,141 @@
+# app/services/product_import_service.py
+import math
+from typing import BinaryIO, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.services.import_utils import (
+    MAX_REPORTED_ERRORS,
+    copy_rows,
+    iter_records,
+    validate_records,
+)
+from app.services.product_service import invalidate_product_pages, invalidate_products
+
+STAGING_COLUMNS = ["line", "name", "description", "price", "stock"]
+
+# products.price é numeric(10, 2) nos bancos criados pelas migrations
+MAX_PRICE = 100_000_000
+
+# Última ocorrência de cada nome vence. Campos ausentes (NULL) mantêm o valor atual;
+# produtos sem alteração real não são regravados (nem geram versão nova da linha).
+MERGE_PRODUCTS = """
+    WITH latest AS (
+        SELECT DISTINCT ON (name) name, description, price, stock
+        FROM product_import
+        ORDER BY name, line DESC
+    )
+    INSERT INTO products (name, description, price, stock)
+    SELECT name, description, price, stock FROM latest
+    ON CONFLICT (name) DO UPDATE SET
+        description = coalesce(EXCLUDED.description, products.description),
+        price = EXCLUDED.price,
+        stock = coalesce(EXCLUDED.stock, products.stock)
+    WHERE (products.description, products.price, products.stock)
+        IS DISTINCT FROM (
+            coalesce(EXCLUDED.description, products.description),
+            EXCLUDED.price,
+            coalesce(EXCLUDED.stock, products.stock)
+        )
+    RETURNING id, (xmax = 0) AS inserted
+"""
+
+
+def _parse_product(record: dict) -> Tuple[str, Optional[str], float, Optional[int]]:
+    name = str(record.get("name") or "").strip()
+    if not name:
+        raise ValueError("name é obrigatório")
+    if len(name) > 100:
+        raise ValueError("name deve ter no máximo 100 caracteres")
+
+    description = record.get("description")
+    if description is not None:
+        description = str(description)
+        if len(description) > 255:
+            raise ValueError("description deve ter no máximo 255 caracteres")
+
+    if record.get("price") is None:
+        raise ValueError("price é obrigatório")
+    try:
+        price = float(record["price"])
+    except (TypeError, ValueError):
+        raise ValueError("price inválido")
+    if not math.isfinite(price) or price < 0:
+        raise ValueError("price deve ser um número não negativo")
+    if price >= MAX_PRICE:
+        raise ValueError("price acima do limite")
+
+    stock = record.get("stock")
+    if stock is not None:
+        try:
+            stock = int(stock)
+        except (TypeError, ValueError):
+            raise ValueError("stock inválido")
+        if stock < 0:
+            raise ValueError("stock não pode ser negativo")
+
+    return name, description, price, stock
+
+
+def import_products(db: Session, stream: BinaryIO, format: str) -> dict:
+    """
+    Importa produtos de um arquivo CSV (cabeçalho name,description,price,stock)
+    ou NDJSON, inserindo os novos e atualizando os existentes pelo nome.
+
+    As linhas válidas vão por COPY para uma tabela temporária e entram em
+    products com um único INSERT ... ON CONFLICT (name) DO UPDATE, tudo em uma
+    transação. Linhas inválidas são ignoradas e relatadas.
+    Retorna contagens de inseridos, atualizados, inalterados e erros.
+    """
+    errors = []
+    valid = 0
+
+    def counted(rows):
+        nonlocal valid
+        for row in rows:
+            valid += 1
+            yield row
+
+    try:
+        db.execute(text(
+            "CREATE TEMP TABLE product_import ("
+            "line integer, name varchar(100), description varchar(255), "
+            "price double precision, stock integer"
+            ") ON COMMIT DROP"
+        ))
+        copy_rows(
+            db.connection().connection,
+            "product_import",
+            STAGING_COLUMNS,
+            counted(validate_records(iter_records(stream, format), _parse_product, errors))
+        )
+        distinct = db.execute(text("SELECT count(DISTINCT name) FROM product_import")).scalar()
+        merged = db.execute(text(MERGE_PRODUCTS)).all()
+
+        inserted = [row.id for row in merged if row.inserted]
+        updated = [row.id for row in merged if not row.inserted]
+        # Estoque ausente: mantido nas atualizações, zero nos produtos novos
+        if inserted:
+            db.execute(
+                text("UPDATE products SET stock = 0 WHERE id = ANY(:ids) AND stock IS NULL"),
+                {"ids": inserted}
+            )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    invalidate_products(updated)
+    if inserted:
+        invalidate_product_pages()
+
+    return {
+        "received": valid + len(errors),
+        "inserted": len(inserted),
+        "updated": len(updated),
+        "unchanged": distinct - len(inserted) - len(updated),
+        "duplicates": valid - distinct,
+        "errors": len(errors),
+        "error_details": errors[:MAX_REPORTED_ERRORS],
+    }
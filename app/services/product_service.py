@@ -1,27 +1,297 @@
+import itertools
+import threading
+
+from sqlalchemy import and_, cast, event, func, literal, or_, select
+from sqlalchemy.dialects.postgresql import DOUBLE_PRECISION
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from fastapi import HTTPException,status
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.core.models.product import Product
-from app.schemas.product import ProductCreate, ProductUpdate
-from typing import List, Optional
+from app.schemas.product import ProductCreate, ProductUpdate, ProductRead
+from app.services.exceptions import BusinessRuleException
+from app.services.pagination import decode_cursor, encode_cursor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Cache do catálogo: produto por id (cópia ProductRead, nunca o objeto da sessão).
+# Mudanças de cadastro descartam a entrada; mudanças de estoque só atualizam o estoque
+_products = TTLCache(
+    maxsize=settings.product_cache_size,
+    ttl=settings.product_cache_ttl_seconds
+)
+# Ids de cada página de GET /products: (skip, limit) -> [ids]. Os dados vêm de _products,
+# então só criação e exclusão (que mudam a ordem por id) invalidam as páginas.
+_pages = TTLCache(
+    maxsize=settings.product_cache_pages,
+    ttl=settings.product_cache_ttl_seconds
+)
+
+_PENDING_INVALIDATIONS = "product_cache_invalidations"
+_PENDING_STOCK = "product_cache_stock"
+_STOCK_LISTENERS = "product_cache_stock_listeners"
+
+# Ordem das alterações de estoque neste processo, tomada com as linhas dos produtos
+# bloqueadas: um commit anterior não sobrescreve no cache o estoque de um posterior
+_stock_sequence = itertools.count()
+_stock_versions = TTLCache(
+    maxsize=settings.product_cache_size,
+    ttl=settings.product_cache_ttl_seconds
+)
+_stock_lock = threading.Lock()
+
+
+def _cache_product(product: Product) -> ProductRead:
+    snapshot = ProductRead.model_validate(product)
+    _products.set(product.id, snapshot)
+    return snapshot
+
+
+def _pop_pending(session: Session) -> None:
+    for product_id in session.info.pop(_PENDING_INVALIDATIONS, ()):
+        _products.pop(product_id)
+
+
+def invalidate_products(product_ids: Iterable[int], db: Optional[Session] = None) -> None:
+    """
+    Remove produtos do cache. Com db, repete a remoção após o commit da sessão,
+    descartando valores relidos por outras requisições antes dele.
+    """
+    product_ids = list(product_ids)
+    for product_id in product_ids:
+        _products.pop(product_id)
+
+    if db is not None and product_ids:
+        pending = db.info.setdefault(_PENDING_INVALIDATIONS, set())
+        if not pending:
+            event.listen(db, "after_commit", _pop_pending, once=True)
+        pending.update(product_ids)
+
+
+def _apply_pending_stock(session: Session) -> None:
+    pending = session.info.pop(_PENDING_STOCK, {})
+    with _stock_lock:
+        for product_id, (sequence, stock) in pending.items():
+            if _stock_versions.get(product_id, -1) > sequence:
+                continue
+            _stock_versions.set(product_id, sequence)
+            _products.update(product_id, lambda product: product.model_copy(update={"stock": stock}))
+
+
+def _drop_pending_stock(session: Session) -> None:
+    session.info.pop(_PENDING_STOCK, None)
+
 
-def get_product(db: Session, product_id: int) -> Optional[Product]:
+def update_cached_stock(stock: Dict[int, int], db: Session) -> None:
     """
-    Busca um produto pelo ID. Retorna None se não encontrar.
+    Grava no cache {product_id: novo estoque} após o commit de db, mantendo o
+    restante do produto: reservas e devoluções não descartam o preço usado na
+    precificação dos pedidos. Deve ser chamada com as linhas dos produtos
+    bloqueadas (logo após o UPDATE). Produtos fora do cache não são carregados.
     """
-    return db.query(Product).filter(Product.id==product_id).first()
+    if not stock:
+        return
 
-def get_products(db: Session, skip: int = 0, limit:int =100) -> List[Product]:
+    sequence = next(_stock_sequence)
+    pending = db.info.setdefault(_PENDING_STOCK, {})
+    for product_id, value in stock.items():
+        pending[product_id] = (sequence, value)
+
+    if not db.info.get(_STOCK_LISTENERS):
+        db.info[_STOCK_LISTENERS] = True
+        event.listen(db, "after_commit", _apply_pending_stock)
+        event.listen(db, "after_rollback", _drop_pending_stock)
+
+
+def invalidate_product_pages() -> None:
+    """Descarta as páginas de GET /products em cache (produtos criados ou removidos)."""
+    _pages.clear()
+
+
+def product_cache_stats() -> dict:
+    """Tamanho, acertos e falhas dos caches de produtos."""
+    return {"products": _products.stats(), "pages": _pages.stats()}
+
+
+def get_products_many(db: Session, product_ids: Iterable[int]) -> Dict[int, ProductRead]:
     """
-    Lista produto com paginação.
+    Busca vários produtos pelo ID, consultando o banco só para os ausentes do cache.
+    Retorna {id: produto}; ids inexistentes ficam de fora.
     """
+    product_ids = set(product_ids)
+    found = _products.get_many(product_ids)
+
+    missing = [product_id for product_id in product_ids if product_id not in found]
+    if missing:
+        for product in db.query(Product).filter(Product.id.in_(missing)).all():
+            found[product.id] = _cache_product(product)
+    return found
+
+
+async def get_products_many_async(db: AsyncSession, product_ids: Iterable[int]) -> Dict[int, ProductRead]:
+    """get_products_many para AsyncSession (mesmo cache)."""
+    product_ids = set(product_ids)
+    found = _products.get_many(product_ids)
+
+    missing = [product_id for product_id in product_ids if product_id not in found]
+    if missing:
+        for product in (await db.scalars(select(Product).where(Product.id.in_(missing)))).all():
+            found[product.id] = _cache_product(product)
+    return found
+
+
+def _in_requested_order(
+    product_ids: List[int],
+    found: Dict[int, ProductRead]
+) -> Tuple[List[ProductRead], List[int]]:
     return (
+        [found[product_id] for product_id in product_ids if product_id in found],
+        [product_id for product_id in product_ids if product_id not in found]
+    )
+
+
+def lookup_products(db: Session, product_ids: List[int]) -> Tuple[List[ProductRead], List[int]]:
+    """
+    Busca vários produtos de uma vez, na ordem pedida (IDs repetidos aparecem uma vez).
+    Retorna (produtos encontrados, IDs não encontrados).
+    """
+    product_ids = list(dict.fromkeys(product_ids))
+    return _in_requested_order(product_ids, get_products_many(db, product_ids))
+
+
+async def lookup_products_async(db: AsyncSession, product_ids: List[int]) -> Tuple[List[ProductRead], List[int]]:
+    """lookup_products para AsyncSession."""
+    product_ids = list(dict.fromkeys(product_ids))
+    return _in_requested_order(product_ids, await get_products_many_async(db, product_ids))
+
+
+def get_product(db: Session, product_id: int) -> Optional[ProductRead]:
+    """
+    Busca um produto pelo ID (com cache). Retorna None se não encontrar.
+    """
+    return get_products_many(db, [product_id]).get(product_id)
+
+
+async def get_product_async(db: AsyncSession, product_id: int) -> Optional[ProductRead]:
+    """get_product para AsyncSession."""
+    return (await get_products_many_async(db, [product_id])).get(product_id)
+
+
+def _cache_page(skip: int, limit: int, products: Iterable[Product]) -> List[ProductRead]:
+    snapshots = [_cache_product(product) for product in products]
+    _pages.set((skip, limit), [product.id for product in snapshots])
+    return snapshots
+
+
+def get_products(db: Session, skip: int = 0, limit:int =100) -> List[ProductRead]:
+    """
+    Lista produto com paginação (com cache).
+    """
+    product_ids = _pages.get((skip, limit))
+    if product_ids is not None:
+        found = get_products_many(db, product_ids)
+        return [found[product_id] for product_id in product_ids if product_id in found]
+
+    return _cache_page(
+        skip,
+        limit,
         db.query(Product)
+        .order_by(Product.id)
         .offset(skip)
         .limit(limit)
         .all()
     )
 
+
+async def get_products_async(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[ProductRead]:
+    """get_products para AsyncSession (mesmo cache)."""
+    product_ids = _pages.get((skip, limit))
+    if product_ids is not None:
+        found = await get_products_many_async(db, product_ids)
+        return [found[product_id] for product_id in product_ids if product_id in found]
+
+    products = await db.scalars(
+        select(Product).order_by(Product.id).offset(skip).limit(limit)
+    )
+    return _cache_page(skip, limit, products.all())
+
+
+def _search_statement(q: str, limit: int, cursor: Optional[str]):
+    # Consulta da busca textual, já posicionada após o cursor
+    query = func.websearch_to_tsquery("portuguese", q)
+    # Correspondência textual OU nome parecido: cada condição usa o seu índice GIN
+    # (search_vector e trigramas de name) e o planejador combina os dois (BitmapOr)
+    matches = or_(
+        Product.search_vector.op("@@")(query),
+        Product.name.op("%>")(q)
+    )
+    # double precision: o valor volta igual no cursor e a comparação é exata
+    rank = cast(
+        func.ts_rank_cd(Product.search_vector, query)
+        + func.word_similarity(literal(q), Product.name),
+        DOUBLE_PRECISION
+    )
+
+    ranked = (
+        select(
+            Product.id, Product.name, Product.description, Product.price,
+            Product.stock, Product.created_at, rank.label("rank")
+        )
+        .where(matches)
+        .subquery()
+    )
+    statement = select(ranked).order_by(ranked.c.rank.desc(), ranked.c.id).limit(limit)
+
+    if cursor:
+        position = decode_cursor(cursor)
+        try:
+            last_rank = float(position["rank"])
+            last_id = int(position["id"])
+        except (KeyError, TypeError, ValueError):
+            raise BusinessRuleException("Cursor de paginação inválido")
+        statement = statement.where(or_(
+            ranked.c.rank < last_rank,
+            and_(ranked.c.rank == last_rank, ranked.c.id > last_id)
+        ))
+    return statement
+
+
+def _search_page(rows, limit: int) -> Tuple[List[dict], Optional[str]]:
+    products = [dict(row._mapping) for row in rows]
+
+    next_cursor = None
+    if len(products) == limit:
+        last = products[-1]
+        next_cursor = encode_cursor({"rank": last["rank"], "id": last["id"]})
+    return products, next_cursor
+
+
+def search_products(
+    db: Session,
+    q: str,
+    limit: int = 20,
+    cursor: Optional[str] = None
+) -> Tuple[List[dict], Optional[str]]:
+    """
+    Busca produtos por texto (nome e descrição) e por similaridade do nome,
+    tolerando erros de digitação. Ordena por relevância e pagina por cursor
+    (keyset) em (rank, id). Retorna (produtos com "rank", próximo cursor ou None).
+    """
+    rows = db.execute(_search_statement(q, limit, cursor)).all()
+    return _search_page(rows, limit)
+
+
+async def search_products_async(
+    db: AsyncSession,
+    q: str,
+    limit: int = 20,
+    cursor: Optional[str] = None
+) -> Tuple[List[dict], Optional[str]]:
+    """search_products para AsyncSession."""
+    rows = (await db.execute(_search_statement(q, limit, cursor))).all()
+    return _search_page(rows, limit)
+
 def create_product(db:Session, product: ProductCreate) -> Product:
     """
     Cria novo produto no banco
@@ -45,6 +315,7 @@ def create_product(db:Session, product: ProductCreate) -> Product:
         db.add(db_product)
         db.commit()
         db.refresh(db_product)
+        invalidate_product_pages()
         return db_product
     except SQLAlchemyError as e:
         db.rollback()
@@ -58,7 +329,7 @@ def update_product(db: Session, product_id: int, product_update: ProductUpdate)
     Atualiza dados de um produto existente
     Retorna o produto atualizado ou None se não encontrado.
     """
-    db_product = get_product(db, product_id)
+    db_product = db.get(Product, product_id)
     if not db_product:
         return None
     
@@ -80,6 +351,7 @@ def update_product(db: Session, product_id: int, product_update: ProductUpdate)
             setattr(db_product, field, value)
         
         db.commit()
+        invalidate_products([product_id])
         db.refresh(db_product)
         return db_product
     except SQLAlchemyError as e:
@@ -94,13 +366,15 @@ def delete_product(db: Session, product_id: int) -> bool:
     Remove um produto do banco (deleção física).
     Retorna True se deletado, False se não encontrado.
     """
-    db_product = get_product(db, product_id)
+    db_product = db.get(Product, product_id)
     if not db_product:
         return False
     
     try:
         db.delete(db_product)
         db.commit()
+        invalidate_products([product_id])
+        invalidate_product_pages()
         return True
     except SQLAlchemyError as e:
         db.rollback()
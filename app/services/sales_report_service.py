@@ -0,0 +1,314 @@
+# app/services/sales_report_service.py
+from datetime import date
+from typing import Iterable, List, Optional
+
+from sqlalchemy import Date, Float, Integer, cast, delete, func, select, text, true
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.models import (
+    ArchivedOrder,
+    DailyClientSales,
+    DailyProductSales,
+    DailySales,
+    Order,
+    OrderItem,
+    OrderStatus,
+)
+from app.core.models.sales_rollup import ROLLUP_BUCKETS
+
+METRICS = ["revenue", "order_count", "units_sold"]
+
+
+def _order_day():
+    return cast(Order.created_at, Date)
+
+
+def _order_bucket():
+    return Order.id % ROLLUP_BUCKETS
+
+
+def _daily_source(criteria: list, sign: int, by_client: bool = False):
+    # Receita, pedidos e unidades por dono e dia (e cliente) dos pedidos que atendem aos critérios
+    units = (
+        select(OrderItem.order_id, func.sum(OrderItem.quantity).label("units"))
+        .join(OrderItem.order)
+        .where(*criteria)
+        .group_by(OrderItem.order_id)
+        .subquery()
+    )
+    keys = [Order.owner_id, _order_day().label("day")]
+    if by_client:
+        keys.append(Order.client_id)
+    keys.append(_order_bucket().label("bucket"))
+
+    return (
+        select(
+            *keys,
+            (func.sum(Order.total) * sign).label("revenue"),
+            (func.count(Order.id) * sign).label("order_count"),
+            (func.coalesce(func.sum(units.c.units), 0) * sign).label("units_sold")
+        )
+        .select_from(Order)
+        .outerjoin(units, units.c.order_id == Order.id)
+        .where(*criteria)
+        .group_by(*keys)
+        # Ordem fixa das chaves: transações concorrentes bloqueiam as linhas na mesma ordem
+        .order_by(*keys)
+    )
+
+
+def _product_source(criteria: list, sign: int):
+    # Receita, pedidos e unidades por dono, dia e produto
+    keys = [
+        Order.owner_id,
+        _order_day().label("day"),
+        OrderItem.product_id,
+        _order_bucket().label("bucket")
+    ]
+    return (
+        select(
+            *keys,
+            (func.sum(OrderItem.subtotal) * sign).label("revenue"),
+            (func.count(func.distinct(OrderItem.order_id)) * sign).label("order_count"),
+            (func.sum(OrderItem.quantity) * sign).label("units_sold")
+        )
+        .select_from(OrderItem)
+        .join(OrderItem.order)
+        .where(*criteria)
+        .group_by(*keys)
+        .order_by(*keys)
+    )
+
+
+def _archived_day():
+    return cast(ArchivedOrder.created_at, Date)
+
+
+def _archived_daily_source(criteria: list, by_client: bool = False):
+    # _daily_source para archived_orders, que guarda total e unidades de cada pedido
+    keys = [ArchivedOrder.owner_id, _archived_day().label("day")]
+    if by_client:
+        keys.append(ArchivedOrder.client_id)
+    keys.append((ArchivedOrder.order_id % ROLLUP_BUCKETS).label("bucket"))
+
+    return (
+        select(
+            *keys,
+            func.sum(ArchivedOrder.total).label("revenue"),
+            func.count(ArchivedOrder.order_id).label("order_count"),
+            func.sum(ArchivedOrder.units).label("units_sold")
+        )
+        .where(*criteria)
+        .group_by(*keys)
+        .order_by(*keys)
+    )
+
+
+def _archived_product_source(criteria: list):
+    # _product_source para archived_orders: um elemento de products por produto do pedido
+    products = func.jsonb_each(ArchivedOrder.products).table_valued("key", "value")
+    product_id = cast(products.c.key, Integer)
+    keys = [
+        ArchivedOrder.owner_id,
+        _archived_day().label("day"),
+        product_id.label("product_id"),
+        (ArchivedOrder.order_id % ROLLUP_BUCKETS).label("bucket")
+    ]
+    return (
+        select(
+            *keys,
+            func.sum(cast(products.c.value.op("->>")(1), Float)).label("revenue"),
+            func.count(ArchivedOrder.order_id).label("order_count"),
+            func.sum(cast(products.c.value.op("->>")(0), Integer)).label("units_sold")
+        )
+        .select_from(ArchivedOrder)
+        .join(products, true())
+        .where(*criteria)
+        .group_by(*keys)
+        .order_by(*keys)
+    )
+
+
+def _upsert(db: Session, model, keys: List[str], source) -> None:
+    # INSERT ... SELECT ... ON CONFLICT: soma o delta às linhas existentes
+    statement = insert(model).from_select(keys + METRICS, source)
+    statement = statement.on_conflict_do_update(
+        index_elements=keys,
+        set_={
+            metric: getattr(model, metric) + getattr(statement.excluded, metric)
+            for metric in METRICS
+        }
+    )
+    db.execute(statement)
+
+
+def _apply(db: Session, criteria: list, sign: int) -> None:
+    # Pedidos sem dono não aparecem para nenhum usuário e ficam fora dos agregados
+    criteria = [*criteria, Order.owner_id.isnot(None)]
+    _upsert(db, DailySales, ["owner_id", "day", "bucket"], _daily_source(criteria, sign))
+    _upsert(
+        db, DailyClientSales, ["owner_id", "day", "client_id", "bucket"],
+        _daily_source(criteria, sign, by_client=True)
+    )
+    _upsert(db, DailyProductSales, ["owner_id", "day", "product_id", "bucket"], _product_source(criteria, sign))
+
+
+def _apply_archived(db: Session, criteria: list) -> None:
+    # Soma aos agregados os pedidos arquivados que atendem aos critérios
+    criteria = [*criteria, ArchivedOrder.owner_id.isnot(None)]
+    _upsert(db, DailySales, ["owner_id", "day", "bucket"], _archived_daily_source(criteria))
+    _upsert(
+        db, DailyClientSales, ["owner_id", "day", "client_id", "bucket"],
+        _archived_daily_source(criteria, by_client=True)
+    )
+    _upsert(
+        db, DailyProductSales, ["owner_id", "day", "product_id", "bucket"],
+        _archived_product_source(criteria)
+    )
+
+
+def add_orders_to_rollups(db: Session, order_ids: Iterable[int]) -> None:
+    """
+    Soma os pedidos informados aos agregados diários.
+    Não faz commit: deve rodar na mesma transação que criou os pedidos.
+    """
+    order_ids = list(order_ids)
+    if order_ids:
+        _apply(db, [Order.id.in_(order_ids)], 1)
+
+
+def remove_orders_from_rollups(db: Session, order_ids: Iterable[int]) -> None:
+    """
+    Subtrai os pedidos informados dos agregados diários (cancelamento ou exclusão).
+    Não faz commit: deve rodar antes da exclusão, na mesma transação.
+    """
+    order_ids = list(order_ids)
+    if order_ids:
+        _apply(db, [Order.id.in_(order_ids)], -1)
+
+
+def rebuild_sales_rollups(
+    db: Session,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+) -> None:
+    """
+    Recalcula os agregados a partir de orders e order_items no intervalo informado
+    (todo o histórico se omitido). Pedidos arquivados entram pelos dados guardados
+    em archived_orders, como no arquivamento, que mantém os agregados.
+
+    As tabelas ficam bloqueadas para escrita durante a reconstrução: pedidos
+    criados nesse meio tempo esperam e são somados depois, sem duplicar.
+    """
+    criteria = [Order.status != OrderStatus.CANCELLED.value]
+    archived_criteria = [ArchivedOrder.status != OrderStatus.CANCELLED.value]
+    if start_date:
+        criteria.append(_order_day() >= start_date)
+        archived_criteria.append(_archived_day() >= start_date)
+    if end_date:
+        criteria.append(_order_day() <= end_date)
+        archived_criteria.append(_archived_day() <= end_date)
+
+    try:
+        db.execute(text(
+            "LOCK TABLE daily_sales, daily_client_sales, daily_product_sales "
+            "IN EXCLUSIVE MODE"
+        ))
+        for model in (DailySales, DailyClientSales, DailyProductSales):
+            statement = delete(model)
+            if start_date:
+                statement = statement.where(model.day >= start_date)
+            if end_date:
+                statement = statement.where(model.day <= end_date)
+            db.execute(statement)
+
+        _apply(db, criteria, 1)
+        _apply_archived(db, archived_criteria)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+
+def get_daily_sales(db: Session, owner_id: int, start_date: date, end_date: date) -> List[dict]:
+    """
+    Retorna receita, pedidos e unidades vendidas por dia no intervalo,
+    dos pedidos do usuário.
+    """
+    rows = db.execute(
+        select(
+            DailySales.day,
+            func.sum(DailySales.revenue).label("revenue"),
+            func.sum(DailySales.order_count).label("order_count"),
+            func.sum(DailySales.units_sold).label("units_sold")
+        )
+        .where(DailySales.owner_id == owner_id, DailySales.day.between(start_date, end_date))
+        .group_by(DailySales.day)
+        .order_by(DailySales.day)
+    ).all()
+    return [dict(row._mapping) for row in rows]
+
+
+def get_client_sales(
+    db: Session,
+    owner_id: int,
+    start_date: date,
+    end_date: date,
+    client_id: Optional[int] = None,
+    limit: int = 100
+) -> List[dict]:
+    """
+    Retorna os totais por cliente do usuário no intervalo, do maior para o
+    menor faturamento.
+    """
+    statement = (
+        select(
+            DailyClientSales.client_id,
+            func.sum(DailyClientSales.revenue).label("revenue"),
+            func.sum(DailyClientSales.order_count).label("order_count"),
+            func.sum(DailyClientSales.units_sold).label("units_sold")
+        )
+        .where(
+            DailyClientSales.owner_id == owner_id,
+            DailyClientSales.day.between(start_date, end_date)
+        )
+        .group_by(DailyClientSales.client_id)
+        .order_by(func.sum(DailyClientSales.revenue).desc(), DailyClientSales.client_id)
+        .limit(limit)
+    )
+    if client_id:
+        statement = statement.where(DailyClientSales.client_id == client_id)
+    return [dict(row._mapping) for row in db.execute(statement).all()]
+
+
+def get_product_sales(
+    db: Session,
+    owner_id: int,
+    start_date: date,
+    end_date: date,
+    product_id: Optional[int] = None,
+    limit: int = 100
+) -> List[dict]:
+    """
+    Retorna os totais por produto nos pedidos do usuário no intervalo, do
+    maior para o menor faturamento.
+    """
+    statement = (
+        select(
+            DailyProductSales.product_id,
+            func.sum(DailyProductSales.revenue).label("revenue"),
+            func.sum(DailyProductSales.order_count).label("order_count"),
+            func.sum(DailyProductSales.units_sold).label("units_sold")
+        )
+        .where(
+            DailyProductSales.owner_id == owner_id,
+            DailyProductSales.day.between(start_date, end_date)
+        )
+        .group_by(DailyProductSales.product_id)
+        .order_by(func.sum(DailyProductSales.revenue).desc(), DailyProductSales.product_id)
+        .limit(limit)
+    )
+    if product_id:
+        statement = statement.where(DailyProductSales.product_id == product_id)
+    return [dict(row._mapping) for row in db.execute(statement).all()]
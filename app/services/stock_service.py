@@ -0,0 +1,215 @@
+# app/services/stock_service.py
+from typing import Dict, Iterable, Tuple
+
+from sqlalchemy import Integer, column, func, select, update, values
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.models import OrderItem, Product
+from app.services.exceptions import InsufficientStockException, StockContentionException
+from app.services.product_service import update_cached_stock
+
+# SQLSTATE do PostgreSQL para lock_timeout esgotado (lock_not_available)
+LOCK_NOT_AVAILABLE = "55P03"
+
+
+def _requested(quantities: Dict[int, int]):
+    # Tabela VALUES (product_id, quantity) usada no UPDATE ... FROM
+    return values(
+        column("product_id", Integer),
+        column("quantity", Integer),
+        name="requested"
+    ).data(sorted(quantities.items()))
+
+
+def _locked_products(product_ids: Iterable[int]):
+    # Bloqueia as linhas sempre em ordem crescente de id: pedidos concorrentes que
+    # disputam os mesmos produtos esperam na mesma ordem e nunca entram em deadlock.
+    return (
+        select(Product.id)
+        .where(Product.id.in_(list(product_ids)))
+        .order_by(Product.id)
+        .with_for_update()
+        .cte("locked")
+    )
+
+
+def _set_lock_timeout(db: Session) -> None:
+    # Sob concorrência alta em um produto, falha rápido em vez de enfileirar pedidos
+    db.execute(select(func.set_config(
+        "lock_timeout", f"{settings.stock_lock_timeout_ms}ms", True
+    )))
+
+
+def _execute_locked(db: Session, statement):
+    try:
+        return db.execute(statement).all()
+    except OperationalError as e:
+        if getattr(e.orig, "pgcode", None) == LOCK_NOT_AVAILABLE:
+            raise StockContentionException(
+                "Produto com alta concorrência no momento, tente novamente"
+            )
+        raise
+
+
+def reserve_stock(db: Session, quantities: Dict[int, int]) -> Dict[int, int]:
+    """
+    Debita o estoque de vários produtos em um único UPDATE condicional.
+    Retorna {product_id: novo estoque} apenas para os produtos debitados;
+    produtos sem estoque suficiente não são alterados.
+    Não faz commit: os bloqueios duram até o fim da transação do chamador.
+    """
+    if not quantities:
+        return {}
+
+    requested = _requested(quantities)
+    locked = _locked_products(quantities)
+
+    _set_lock_timeout(db)
+    rows = _execute_locked(
+        db,
+        update(Product)
+        .where(
+            Product.id == locked.c.id,
+            Product.id == requested.c.product_id,
+            Product.stock >= requested.c.quantity
+        )
+        .values(stock=Product.stock - requested.c.quantity)
+        .returning(Product.id, Product.stock)
+        .execution_options(synchronize_session=False)
+    )
+    reserved = {pid: stock for pid, stock in rows}
+    update_cached_stock(reserved, db)
+    return reserved
+
+
+def reserve_order_stock(db: Session, quantities: Dict[int, int]) -> Dict[int, int]:
+    """
+    Reserva o estoque de um pedido inteiro (tudo ou nada).
+    Lança InsufficientStockException se algum produto não tiver estoque;
+    o chamador deve fazer rollback para desfazer os débitos já aplicados.
+    """
+    reserved = reserve_stock(db, quantities)
+    missing = sorted(set(quantities) - set(reserved))
+    if missing:
+        raise InsufficientStockException(missing)
+    return reserved
+
+
+def release_stock(db: Session, quantities: Dict[int, int]) -> Dict[int, int]:
+    """
+    Devolve ao estoque as quantidades informadas (pedido cancelado ou excluído).
+    Retorna {product_id: novo estoque}.
+    """
+    if not quantities:
+        return {}
+
+    requested = _requested(quantities)
+    locked = _locked_products(quantities)
+
+    _set_lock_timeout(db)
+    rows = _execute_locked(
+        db,
+        update(Product)
+        .where(
+            Product.id == locked.c.id,
+            Product.id == requested.c.product_id
+        )
+        .values(stock=func.coalesce(Product.stock, 0) + requested.c.quantity)
+        .returning(Product.id, Product.stock)
+        .execution_options(synchronize_session=False)
+    )
+    released = {pid: stock for pid, stock in rows}
+    update_cached_stock(released, db)
+    return released
+
+
+def adjust_stock(
+    db: Session,
+    deltas: Dict[int, int],
+    allow_negative: bool = False
+) -> Dict[int, int]:
+    """
+    Soma um delta (positivo ou negativo) ao estoque de vários produtos em um
+    único UPDATE ... FROM (VALUES ...), com os bloqueios em ordem de id.
+    Sem allow_negative, produtos que ficariam com estoque negativo não são alterados.
+    Retorna {product_id: novo estoque} apenas para os produtos ajustados.
+    Não faz commit.
+    """
+    if not deltas:
+        return {}
+
+    requested = _requested(deltas)
+    locked = _locked_products(deltas)
+    new_stock = func.coalesce(Product.stock, 0) + requested.c.quantity
+
+    criteria = [
+        Product.id == locked.c.id,
+        Product.id == requested.c.product_id
+    ]
+    if not allow_negative:
+        criteria.append(new_stock >= 0)
+
+    _set_lock_timeout(db)
+    rows = _execute_locked(
+        db,
+        update(Product)
+        .where(*criteria)
+        .values(stock=new_stock)
+        .returning(Product.id, Product.stock)
+        .execution_options(synchronize_session=False)
+    )
+    adjusted = {pid: stock for pid, stock in rows}
+    update_cached_stock(adjusted, db)
+    return adjusted
+
+
+def apply_stock_adjustments(
+    db: Session,
+    adjustments: Iterable[Tuple[int, int]],
+    allow_negative: bool = False
+) -> dict:
+    """
+    Aplica ajustes (product_id, delta) e faz commit. Deltas repetidos do mesmo
+    produto são somados. Retorna {"stock": {id: novo estoque}, "rejected": ids
+    que ficariam negativos, "missing": ids inexistentes}.
+    """
+    deltas: Dict[int, int] = {}
+    for product_id, delta in adjustments:
+        deltas[product_id] = deltas.get(product_id, 0) + delta
+
+    try:
+        adjusted = adjust_stock(db, deltas, allow_negative)
+        not_adjusted = set(deltas) - set(adjusted)
+        existing = set()
+        if not_adjusted:
+            existing = set(db.scalars(
+                select(Product.id).where(Product.id.in_(not_adjusted))
+            ).all())
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return {
+        "stock": adjusted,
+        "rejected": sorted(existing),
+        "missing": sorted(not_adjusted - existing),
+    }
+
+
+def order_quantities(db: Session, order_ids: Iterable[int]) -> Dict[int, int]:
+    """
+    Soma as quantidades por produto dos itens dos pedidos informados.
+    """
+    order_ids = list(order_ids)
+    if not order_ids:
+        return {}
+
+    rows = db.execute(
+        select(OrderItem.product_id, func.sum(OrderItem.quantity))
+        .where(OrderItem.order_id.in_(order_ids))
+        .group_by(OrderItem.product_id)
+    ).all()
+    return {pid: int(quantity) for pid, quantity in rows}
@@ -0,0 +1,36 @@
+"""
+Arquiva pedidos entregues e cancelados antigos em arquivos Parquet.
+
+Uso: python -m scripts.archive_orders [--before AAAA-MM-DD] [--batch-size 5000] [--dir caminho]
+Sem --before, arquiva os pedidos mais antigos que order_archive_retention_days.
+Requer o pacote pyarrow. Deve rodar periodicamente (cron diário ou semanal).
+"""
+import argparse
+from datetime import datetime
+
+from app.core.database import SessionLocal
+from app.services.order_archive_service import archive_orders
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Arquiva pedidos antigos em Parquet")
+    parser.add_argument("--before", type=datetime.fromisoformat, default=None, help="Arquiva pedidos criados antes desta data")
+    parser.add_argument("--batch-size", type=int, default=None, help="Pedidos por arquivo e por transação")
+    parser.add_argument("--dir", default=None, help="Diretório dos arquivos (padrão: order_archive_dir)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        result = archive_orders(
+            db,
+            older_than=args.before,
+            batch_size=args.batch_size,
+            archive_dir=args.dir
+        )
+        print(f"{result['orders']} pedido(s) arquivado(s) em {len(result['files'])} arquivo(s)")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
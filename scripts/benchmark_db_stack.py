@@ -0,0 +1,168 @@
+"""
+Benchmark das pilhas de acesso ao banco: síncrona (psycopg2) x async (asyncpg).
+
+Simula muitas conexões HTTP simultâneas chamando as mesmas leituras dos
+serviços pelas duas pilhas, como as rotas fazem:
+
+- sync: cada requisição ocupa uma thread de um pool limitado (o threadpool do
+  FastAPI para rotas def, 40 threads por padrão) e abre uma Session
+- async: cada requisição é uma corrotina no event loop com uma AsyncSession
+
+Mede vazão, latência (p50/p99, incluindo a espera por thread ou conexão) e
+erros (por exemplo, timeout do pool). Só lê: nada é gravado no banco.
+
+Uso: python -m scripts.benchmark_db_stack --concurrency 500 --requests 20 --scenario orders
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from anyio import CapacityLimiter, to_thread
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, SessionLocal, async_engine, engine
+from app.core.models import Client, Order
+from app.services import client_service, product_service
+from app.services.order_service import OrderService
+
+SCENARIOS = ("orders", "order", "clients", "products")
+# Termos da busca de produtos, variados para não medir só o cache do PostgreSQL
+PRODUCT_TERMS = ("cafe", "arroz", "feijao", "leite", "acucar", "oleo", "sabao", "papel")
+
+
+def load_targets(owners: int) -> dict:
+    # Donos com mais pedidos, alguns pedidos deles e prefixos de nomes de clientes
+    db = SessionLocal()
+    try:
+        owner_ids = db.scalars(
+            select(Order.owner_id)
+            .group_by(Order.owner_id)
+            .order_by(func.count().desc())
+            .limit(owners)
+        ).all()
+        orders = db.execute(
+            select(Order.id, Order.owner_id)
+            .where(Order.owner_id.in_(owner_ids))
+            .limit(1000)
+        ).all()
+        prefixes = db.scalars(
+            select(func.lower(func.left(Client.name, 3))).distinct().limit(100)
+        ).all()
+    finally:
+        db.close()
+
+    if not owner_ids:
+        raise SystemExit("Nenhum pedido no banco para o benchmark")
+    return {
+        "owners": list(owner_ids),
+        "orders": [tuple(row) for row in orders],
+        "prefixes": [prefix for prefix in prefixes if prefix] or ["a"],
+    }
+
+
+def sync_request(scenario: str, targets: dict) -> None:
+    # Uma requisição na pilha síncrona: Session própria, como get_db
+    db = SessionLocal()
+    try:
+        if scenario == "orders":
+            OrderService.get_orders_page(db, random.choice(targets["owners"]), limit=50)
+        elif scenario == "order":
+            order_id, owner_id = random.choice(targets["orders"])
+            OrderService.get_order_by_id(db, order_id, owner_id)
+        elif scenario == "clients":
+            client_service.search_clients(db, random.choice(targets["prefixes"]), mode="prefix")
+        else:
+            product_service.search_products(db, random.choice(PRODUCT_TERMS))
+    finally:
+        db.close()
+
+
+async def async_request(scenario: str, targets: dict) -> None:
+    # A mesma requisição na pilha async: AsyncSession própria, como get_async_db
+    async with AsyncSessionLocal() as db:
+        if scenario == "orders":
+            await OrderService.get_orders_page_async(db, random.choice(targets["owners"]), limit=50)
+        elif scenario == "order":
+            order_id, owner_id = random.choice(targets["orders"])
+            await OrderService.get_order_by_id_async(db, order_id, owner_id)
+        elif scenario == "clients":
+            await client_service.search_clients_async(db, random.choice(targets["prefixes"]), mode="prefix")
+        else:
+            await product_service.search_products_async(db, random.choice(PRODUCT_TERMS))
+
+
+async def run(stack: str, scenario: str, targets: dict, concurrency: int, requests: int, threads: int) -> dict:
+    stats = {"latencies": [], "errors": {}}
+    limiter = CapacityLimiter(threads)
+
+    async def client() -> None:
+        for _ in range(requests):
+            started = time.perf_counter()
+            try:
+                if stack == "sync":
+                    await to_thread.run_sync(sync_request, scenario, targets, limiter=limiter)
+                else:
+                    await async_request(scenario, targets)
+            except Exception as e:
+                name = type(e).__name__
+                stats["errors"][name] = stats["errors"].get(name, 0) + 1
+                continue
+            stats["latencies"].append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    stats["elapsed"] = time.perf_counter() - started
+    return stats
+
+
+def report(stack: str, stats: dict) -> None:
+    latencies = sorted(stats["latencies"])
+    total = len(latencies)
+    elapsed = stats["elapsed"]
+    p99 = latencies[min(total - 1, int(total * 0.99))] if total else 0.0
+
+    print(f"[{stack}] Requisições: {total} em {elapsed:.2f}s ({total / elapsed:.0f}/s)")
+    if total:
+        print(f"[{stack}] Latência p50: {statistics.median(latencies) * 1000:.1f}ms  "
+              f"p99: {p99 * 1000:.1f}ms  máx: {latencies[-1] * 1000:.1f}ms")
+    if stats["errors"]:
+        print(f"[{stack}] Erros: {stats['errors']}")
+
+
+async def benchmark(args) -> None:
+    targets = load_targets(args.owners)
+    stacks = ["sync", "async"] if args.stack == "both" else [args.stack]
+
+    print(f"Cenário: {args.scenario}  Conexões simultâneas: {args.concurrency}  "
+          f"Requisições por conexão: {args.requests}")
+    print(f"Pool sync: {engine.pool.status()}  threads: {args.threads}")
+    print(f"Pool async: {settings.database_async_pool_size} + {settings.database_async_max_overflow} overflow")
+
+    for stack in stacks:
+        # Aquecimento: abre as conexões do pool antes da medição
+        await run(stack, args.scenario, targets, min(args.concurrency, 50), 1, args.threads)
+        report(stack, await run(
+            stack, args.scenario, targets, args.concurrency, args.requests, args.threads
+        ))
+
+    await async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark das pilhas sync (psycopg2) e async (asyncpg)")
+    parser.add_argument("--stack", choices=["sync", "async", "both"], default="both", help="Pilha medida")
+    parser.add_argument("--scenario", choices=SCENARIOS, default="orders", help="Leitura executada")
+    parser.add_argument("--concurrency", type=int, default=500, help="Conexões HTTP simultâneas simuladas")
+    parser.add_argument("--requests", type=int, default=20, help="Requisições por conexão")
+    parser.add_argument("--threads", type=int, default=40, help="Threads da pilha sync (threadpool do FastAPI)")
+    parser.add_argument("--owners", type=int, default=50, help="Usuários cujos pedidos são lidos")
+    args = parser.parse_args()
+
+    asyncio.run(benchmark(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Benchmark de contenção da reserva de estoque.
+
+Vários workers reservam ao mesmo tempo um produto "quente" mais alguns
+produtos aleatórios, em ordens diferentes, como em uma venda relâmpago.
+Mede vazão, latência (p50/p99), conflitos de bloqueio e deadlocks, e confere
+no fim que o estoque debitado bate com o número de reservas confirmadas.
+
+Uso: python -m scripts.benchmark_stock_contention --workers 32 --orders 200
+"""
+import argparse
+import random
+import statistics
+import threading
+import time
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import OperationalError
+
+from app.core.database import SessionLocal
+from app.core.models import Product
+from app.services.exceptions import InsufficientStockException, StockContentionException
+from app.services.stock_service import reserve_order_stock
+
+# SQLSTATE do PostgreSQL para deadlock detectado
+DEADLOCK_DETECTED = "40P01"
+
+
+def create_products(count: int, stock: int) -> list:
+    # Cria produtos temporários para o benchmark
+    db = SessionLocal()
+    try:
+        ids = db.scalars(
+            insert(Product).returning(Product.id),
+            [
+                {"name": f"bench-stock-{time.time_ns()}-{i}", "price": 1.0, "stock": stock}
+                for i in range(count)
+            ]
+        ).all()
+        db.commit()
+        return list(ids)
+    finally:
+        db.close()
+
+
+def drop_products(product_ids: list) -> None:
+    db = SessionLocal()
+    try:
+        db.execute(delete(Product).where(Product.id.in_(product_ids)))
+        db.commit()
+    finally:
+        db.close()
+
+
+def worker(product_ids: list, orders: int, items: int, stats: dict, lock: threading.Lock) -> None:
+    hot_id, cold_ids = product_ids[0], product_ids[1:]
+    db = SessionLocal()
+    try:
+        for _ in range(orders):
+            chosen = [hot_id] + random.sample(cold_ids, min(items - 1, len(cold_ids)))
+            random.shuffle(chosen)  # ordem de entrada arbitrária, como em pedidos reais
+            quantities = {pid: 1 for pid in chosen}
+
+            started = time.perf_counter()
+            outcome = "ok"
+            try:
+                reserve_order_stock(db, quantities)
+                db.commit()
+            except InsufficientStockException:
+                db.rollback()
+                outcome = "insufficient"
+            except StockContentionException:
+                db.rollback()
+                outcome = "contention"
+            except OperationalError as e:
+                db.rollback()
+                if getattr(e.orig, "pgcode", None) != DEADLOCK_DETECTED:
+                    raise
+                outcome = "deadlock"
+            elapsed = time.perf_counter() - started
+
+            with lock:
+                stats[outcome] += 1
+                stats["latencies"].append(elapsed)
+    finally:
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de contenção da reserva de estoque")
+    parser.add_argument("--workers", type=int, default=32, help="Threads concorrentes")
+    parser.add_argument("--orders", type=int, default=200, help="Pedidos por thread")
+    parser.add_argument("--items", type=int, default=3, help="Produtos por pedido (inclui o quente)")
+    parser.add_argument("--products", type=int, default=50, help="Produtos criados para o teste")
+    parser.add_argument("--stock", type=int, default=1_000_000, help="Estoque inicial de cada produto")
+    args = parser.parse_args()
+
+    product_ids = create_products(args.products, args.stock)
+    stats = {"ok": 0, "insufficient": 0, "contention": 0, "deadlock": 0, "latencies": []}
+    lock = threading.Lock()
+
+    try:
+        threads = [
+            threading.Thread(
+                target=worker,
+                args=(product_ids, args.orders, args.items, stats, lock)
+            )
+            for _ in range(args.workers)
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        db = SessionLocal()
+        try:
+            hot_stock = db.scalar(select(Product.stock).where(Product.id == product_ids[0]))
+        finally:
+            db.close()
+    finally:
+        drop_products(product_ids)
+
+    latencies = sorted(stats["latencies"])
+    total = len(latencies)
+    p99 = latencies[min(total - 1, int(total * 0.99))] if total else 0.0
+
+    print(f"Reservas: {total} em {elapsed:.2f}s ({total / elapsed:.0f}/s)")
+    print(f"Confirmadas: {stats['ok']}  Sem estoque: {stats['insufficient']}  "
+          f"Timeout de bloqueio: {stats['contention']}  Deadlocks: {stats['deadlock']}")
+    if total:
+        print(f"Latência p50: {statistics.median(latencies) * 1000:.1f}ms  p99: {p99 * 1000:.1f}ms")
+
+    # Toda reserva confirmada debita exatamente 1 unidade do produto quente
+    expected = args.stock - stats["ok"]
+    status = "OK" if hot_stock == expected else "DIVERGENTE"
+    print(f"Estoque do produto quente: {hot_stock} (esperado {expected}) -> {status}")
+
+
+if __name__ == "__main__":
+    main()
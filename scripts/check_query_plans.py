@@ -0,0 +1,198 @@
+"""
+Verificação de planos de execução das consultas dos serviços.
+
+Executa as funções de leitura de order_service, product_service e
+client_service, captura o SQL que elas geram e roda EXPLAIN em cada
+consulta. Falha (código de saída 1) se aparecer um Seq Scan em uma tabela
+grande, o que indica índice faltando ou consulta que deixou de usá-lo.
+
+Com --seed, o banco recebe dados sintéticos antes da verificação. Tudo roda
+em uma única transação desfeita no final: nada fica gravado.
+
+Uso: python -m scripts.check_query_plans --seed [--min-rows 10000]
+"""
+import argparse
+import json
+import sys
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.core.database import engine
+from app.schemas.order import OrderWithItems
+from app.services import client_service, client_stats_service, product_service
+from app.services.order_service import OrderService
+from app.services.stock_service import order_quantities
+
+SEED_USER_EMAIL = "explain-seed@example.com"
+SEED_STATUSES = "ARRAY['pending','confirmed','processing','shipped','delivered','cancelled']"
+
+
+def seed(db: Session, clients: int, products: int, orders: int) -> int:
+    # Popula tabelas com volume suficiente para o planejador preferir índices
+    user_id = db.execute(text(
+        "INSERT INTO users (email, username, full_name, password_hash) "
+        "VALUES (:email, 'explain-seed', 'Explain Seed', 'x') RETURNING id"
+    ), {"email": SEED_USER_EMAIL}).scalar()
+
+    first_client = db.execute(text(
+        "INSERT INTO clients (name, email, active, user_id) "
+        "SELECT 'Cliente ' || g, 'seed' || g || '@example.com', g % 10 <> 0, :user_id "
+        "FROM generate_series(1, :n) AS g RETURNING id"
+    ), {"user_id": user_id, "n": clients}).scalars().all()[0]
+
+    first_product = db.execute(text(
+        "INSERT INTO products (name, price, stock) "
+        "SELECT 'Produto seed ' || g, (g % 500) + 1, 1000 "
+        "FROM generate_series(1, :n) AS g RETURNING id"
+    ), {"n": products}).scalars().all()[0]
+
+    # orders e order_items são particionadas por mês: cria os meses cobertos pelos dados
+    db.execute(text(
+        "SELECT ensure_order_partitions((now() - make_interval(mins => :n))::date, current_date)"
+    ), {"n": orders})
+
+    db.execute(text(
+        "INSERT INTO orders (client_id, owner_id, status, total, created_at, updated_at) "
+        "SELECT :first_client + (g % :clients), :user_id, "
+        f"({SEED_STATUSES})[1 + g % 6], 100, "
+        "now() - make_interval(mins => g), now() - make_interval(mins => g) "
+        "FROM generate_series(1, :n) AS g"
+    ), {"first_client": first_client, "clients": clients, "user_id": user_id, "n": orders})
+
+    db.execute(text(
+        "INSERT INTO order_items (order_id, order_created_at, product_id, quantity, unit_price, subtotal) "
+        "SELECT o.id, o.created_at, :first_product + ((o.id * 7 + k) % :products), k + 1, 10, 10 * (k + 1) "
+        "FROM orders AS o CROSS JOIN generate_series(0, 1) AS k "
+        "WHERE o.owner_id = :user_id"
+    ), {"first_product": first_product, "products": products, "user_id": user_id})
+
+    db.execute(text("ANALYZE users, clients, products, orders, order_items"))
+    return user_id
+
+
+def scenarios(db: Session, user_id: int):
+    # Consultas de leitura dos serviços, na forma em que as rotas as chamam
+    orders, next_cursor, _ = OrderService.get_orders_page(db, user_id, limit=50)
+    order_id = orders[0].id if orders else 1
+    client_id = orders[0].client_id if orders else 1
+
+    yield "get_orders_page", lambda: OrderService.get_orders_page(db, user_id, limit=50)
+    yield "get_orders_page (cursor)", lambda: OrderService.get_orders_page(
+        db, user_id, cursor=next_cursor, limit=50
+    )
+    yield "get_orders_page (client_id)", lambda: OrderService.get_orders_page(
+        db, user_id, client_id=client_id, limit=50
+    )
+    yield "get_orders_page (status)", lambda: OrderService.get_orders_page(
+        db, user_id, status="shipped", limit=50
+    )
+    yield "get_orders_page (intervalo de datas)", lambda: OrderService.get_orders_page(
+        db, user_id, start_date=datetime.utcnow() - timedelta(days=7), limit=50
+    )
+    yield "get_orders_page (itens)", lambda: OrderService.get_orders_page(
+        db, user_id, limit=50, schema=OrderWithItems
+    )
+    yield "get_order_by_id (itens)", lambda: OrderService.get_order_by_id(
+        db, order_id, user_id, schema=OrderWithItems
+    )
+    yield "order_quantities", lambda: order_quantities(db, [order_id])
+    yield "get_product", lambda: product_service.get_product(db, 1)
+    yield "get_products", lambda: product_service.get_products(db, limit=100)
+    yield "search_products", lambda: product_service.search_products(db, "produto sed 42", limit=20)
+    yield "get_client", lambda: client_service.get_client(db, client_id)
+    yield "get_client_order_summary", lambda: client_stats_service.get_client_order_summary(
+        db, client_id, user_id
+    )
+    yield "get_clients", lambda: client_service.get_clients(db, skip=1000, limit=100)
+    yield "get_clients_page", lambda: client_service.get_clients_page(db, limit=100)
+    yield "search_clients (prefix)", lambda: client_service.search_clients(db, "cliente 42", mode="prefix")
+    yield "search_clients (contains)", lambda: client_service.search_clients(db, "seed42", mode="contains")
+
+
+def relations(plan: dict):
+    # Todas as tabelas (ou partições) lidas pelo plano
+    if "Relation Name" in plan:
+        yield plan["Relation Name"]
+    for child in plan.get("Plans", []):
+        yield from relations(child)
+
+
+def seq_scans(plan: dict):
+    # Percorre a árvore do plano e devolve as tabelas lidas com Seq Scan
+    if plan.get("Node Type") == "Seq Scan":
+        yield plan["Relation Name"]
+    for child in plan.get("Plans", []):
+        yield from seq_scans(child)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Falha se consultas dos serviços fizerem Seq Scan em tabelas grandes")
+    parser.add_argument("--seed", action="store_true", help="Insere dados sintéticos (desfeitos no final)")
+    parser.add_argument("--clients", type=int, default=50_000)
+    parser.add_argument("--products", type=int, default=20_000)
+    parser.add_argument("--orders", type=int, default=200_000)
+    parser.add_argument("--min-rows", type=int, default=10_000, help="Tamanho a partir do qual uma tabela é grande")
+    args = parser.parse_args()
+
+    connection = engine.connect()
+    transaction = connection.begin()
+    db = Session(bind=connection, join_transaction_mode="create_savepoint")
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    failures = []
+    try:
+        if args.seed:
+            user_id = seed(db, args.clients, args.products, args.orders)
+        else:
+            user_id = db.execute(text("SELECT min(id) FROM users")).scalar() or 1
+
+        table_rows = dict(db.execute(text(
+            "SELECT relname, reltuples::bigint FROM pg_class WHERE relkind IN ('r', 'p')"
+        )).all())
+
+        raw = connection.connection.cursor()
+        for name, run in scenarios(db, user_id):
+            captured.clear()
+            event.listen(connection, "before_cursor_execute", capture)
+            try:
+                run()
+            finally:
+                event.remove(connection, "before_cursor_execute", capture)
+
+            for statement, parameters in captured:
+                raw.execute(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+                plan = raw.fetchone()[0]
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                large = [
+                    table for table in seq_scans(plan[0]["Plan"])
+                    if table_rows.get(table, 0) >= args.min_rows
+                ]
+                status = "SEQ SCAN" if large else "ok"
+                # Mostra as partições mensais lidas: intervalos de datas devem podar as demais
+                partitions = sorted({
+                    table for table in relations(plan[0]["Plan"])
+                    if table.startswith(("orders_", "order_items_"))
+                })
+                print(f"[{status}] {name}" + (f" ({len(partitions)} partições)" if partitions else ""))
+                if large:
+                    failures.append((name, large, statement))
+    finally:
+        db.close()
+        transaction.rollback()
+        connection.close()
+
+    for name, tables, statement in failures:
+        print(f"\n{name}: Seq Scan em {', '.join(sorted(set(tables)))}\n{statement}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
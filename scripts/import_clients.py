@@ -0,0 +1,37 @@
+"""
+Importa clientes em massa de um arquivo CSV ou NDJSON para um usuário,
+deduplicando pelo email (sem diferenciar maiúsculas).
+
+Uso: python -m scripts.import_clients caminho/arquivo.csv --user-id 1
+     [--format csv|ndjson] [--mode merge|skip] [--chunk-size 5000]
+O formato é deduzido da extensão quando --format não é informado.
+"""
+import argparse
+import json
+
+from app.core.database import SessionLocal
+from app.services.client_import_service import MERGE, SKIP, import_clients
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Importa clientes de CSV ou NDJSON")
+    parser.add_argument("path", help="Arquivo de entrada")
+    parser.add_argument("--user-id", type=int, required=True, help="Usuário dono dos clientes")
+    parser.add_argument("--format", choices=["csv", "ndjson"], default=None)
+    parser.add_argument("--mode", choices=[MERGE, SKIP], default=MERGE)
+    parser.add_argument("--chunk-size", type=int, default=None, help="Linhas por transação")
+    args = parser.parse_args()
+
+    format = args.format or ("ndjson" if args.path.endswith((".ndjson", ".jsonl")) else "csv")
+
+    db = SessionLocal()
+    try:
+        with open(args.path, "rb") as stream:
+            result = import_clients(db, stream, format, args.user_id, args.mode, args.chunk_size)
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
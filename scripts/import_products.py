@@ -0,0 +1,32 @@
+"""
+Importa produtos em massa de um arquivo CSV ou NDJSON (insere ou atualiza pelo nome).
+
+Uso: python -m scripts.import_products caminho/arquivo.csv [--format csv|ndjson]
+O formato é deduzido da extensão quando --format não é informado.
+"""
+import argparse
+import json
+
+from app.core.database import SessionLocal
+from app.services.product_import_service import import_products
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Importa produtos de CSV ou NDJSON")
+    parser.add_argument("path", help="Arquivo de entrada")
+    parser.add_argument("--format", choices=["csv", "ndjson"], default=None)
+    args = parser.parse_args()
+
+    format = args.format or ("ndjson" if args.path.endswith((".ndjson", ".jsonl")) else "csv")
+
+    db = SessionLocal()
+    try:
+        with open(args.path, "rb") as stream:
+            result = import_products(db, stream, format)
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
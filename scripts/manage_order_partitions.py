@@ -0,0 +1,54 @@
+"""
+Manutenção das partições mensais de orders e order_items.
+
+Uso:
+  python -m scripts.manage_order_partitions ensure [--months 3]
+  python -m scripts.manage_order_partitions detach --before AAAA-MM-DD [--drop]
+  python -m scripts.manage_order_partitions list
+
+ensure deve rodar periodicamente (cron diário) para criar os meses à frente.
+detach retira meses antigos das consultas sem DELETE; com --drop remove as tabelas.
+"""
+import argparse
+from datetime import date
+
+from app.core.database import SessionLocal
+from app.services.partition_service import (
+    detach_order_partitions,
+    ensure_order_partitions,
+    list_order_partitions,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Gerencia as partições mensais de pedidos")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ensure = commands.add_parser("ensure", help="Cria as partições dos próximos meses")
+    ensure.add_argument("--months", type=int, default=None, help="Meses à frente do atual")
+
+    detach = commands.add_parser("detach", help="Desanexa os meses anteriores a uma data")
+    detach.add_argument("--before", type=date.fromisoformat, required=True, help="Primeiro mês mantido")
+    detach.add_argument("--drop", action="store_true", help="Remove as tabelas desanexadas")
+
+    commands.add_parser("list", help="Lista os meses particionados")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.command == "ensure":
+            created = ensure_order_partitions(db, months_ahead=args.months)
+            print(f"{created} partição(ões) mensal(is) criada(s)")
+        elif args.command == "detach":
+            tables = detach_order_partitions(db, before=args.before, drop=args.drop)
+            action = "removida(s)" if args.drop else "desanexada(s)"
+            print(f"{len(tables)} tabela(s) {action}: {', '.join(tables) or '-'}")
+        else:
+            for month in list_order_partitions(db):
+                print(month.strftime("%Y-%m"))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,25 @@
+from sqlalchemy import text
 from app.core.database import Base, engine
 # Importa todos os modelos para registrar tabelas no metadata
 from app.core.models.user import User
 from app.core.models.client import Client
 from app.core.models.product import Product
 from app.core.models.order import Order
+from app.services.partition_service import ENSURE_PARTITIONS_FUNCTION
+
+# Índices de similaridade de products usam a extensão pg_trgm
+with engine.begin() as connection:
+    connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
 
 #  Cria todas as tabelas definidas nos modelos
 Base.metadata.create_all(bind=engine)
-print("Tabelas criadas com sucesso!")
\ No newline at end of file
+
+# orders e order_items são particionadas: cria a partição padrão e os meses à frente
+with engine.begin() as connection:
+    connection.execute(text(ENSURE_PARTITIONS_FUNCTION))
+    connection.execute(text("CREATE TABLE IF NOT EXISTS orders_default PARTITION OF orders DEFAULT"))
+    connection.execute(text("CREATE TABLE IF NOT EXISTS order_items_default PARTITION OF order_items DEFAULT"))
+    connection.execute(text(
+        "SELECT ensure_order_partitions(current_date, (current_date + interval '3 months')::date)"
+    ))
+print("Tabelas criadas com sucesso!")
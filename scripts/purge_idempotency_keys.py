@@ -0,0 +1,27 @@
+"""
+Remove as chaves de idempotência expiradas.
+
+Uso: python -m scripts.purge_idempotency_keys [--batch-size 10000]
+Pode ser agendado (cron) para rodar periodicamente.
+"""
+import argparse
+
+from app.core.database import SessionLocal
+from app.services.idempotency_service import purge_expired_keys
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Remove chaves de idempotência expiradas")
+    parser.add_argument("--batch-size", type=int, default=10000, help="Chaves removidas por transação")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        removed = purge_expired_keys(db, batch_size=args.batch_size)
+        print(f"{removed} chaves de idempotência removidas")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
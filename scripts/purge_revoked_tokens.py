@@ -0,0 +1,27 @@
+"""
+Remove as revogações de tokens que já expiraram.
+
+Uso: python -m scripts.purge_revoked_tokens [--batch-size 10000]
+Pode ser agendado (cron) para rodar periodicamente.
+"""
+import argparse
+
+from app.core.database import SessionLocal
+from app.core.token_revocation import purge_expired_revocations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Remove revogações de tokens expirados")
+    parser.add_argument("--batch-size", type=int, default=10000, help="Revogações removidas por transação")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        removed = purge_expired_revocations(db, batch_size=args.batch_size)
+        print(f"{removed} revogações de tokens removidas")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
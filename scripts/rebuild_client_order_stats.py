@@ -0,0 +1,28 @@
+"""
+Reconstrói o resumo de pedidos por cliente (client_order_stats) a partir de
+orders e archived_orders (pedidos arquivados).
+
+Uso: python -m scripts.rebuild_client_order_stats [--client-id ID ...]
+Sem --client-id, recalcula todos os clientes.
+"""
+import argparse
+
+from app.core.database import SessionLocal
+from app.services.client_stats_service import rebuild_client_order_stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Reconstrói o resumo de pedidos por cliente")
+    parser.add_argument("--client-id", type=int, action="append", default=None, help="Cliente a recalcular (pode repetir)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        rebuild_client_order_stats(db, client_ids=args.client_id)
+        print("Resumo de pedidos por cliente reconstruído com sucesso!")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""
+Reconstrói os agregados diários de vendas a partir de orders, order_items e
+archived_orders (pedidos arquivados).
+
+Uso: python -m scripts.rebuild_sales_rollups [--start AAAA-MM-DD] [--end AAAA-MM-DD]
+Sem datas, recalcula todo o histórico (útil como carga inicial).
+"""
+import argparse
+from datetime import date
+
+from app.core.database import SessionLocal
+from app.services.sales_report_service import rebuild_sales_rollups
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Reconstrói os agregados diários de vendas")
+    parser.add_argument("--start", type=date.fromisoformat, default=None, help="Data inicial (inclusive)")
+    parser.add_argument("--end", type=date.fromisoformat, default=None, help="Data final (inclusive)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        rebuild_sales_rollups(db, start_date=args.start, end_date=args.end)
+        print("Agregados de vendas reconstruídos com sucesso!")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()